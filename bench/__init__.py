@@ -0,0 +1,4 @@
+"""Alchemy 오프라인 벤치마크 — 외부 서비스 없이 daily/weekend 파이프라인 전체 측정
+
+python -m bench.run --help
+"""
@@ -0,0 +1,291 @@
+"""벤치마크 코퍼스 — 녹화한 피드 fixture 를 틀로 삼아 원하는 규모의 피드/뉴스/DB 데이터 생성
+
+모든 데이터는 (규모, seed) 로 결정되므로 stand-in 서버 프로세스와 벤치마크 프로세스가
+따로 만들어도 같은 결과가 나온다. 본문 어휘는 config/axes.yml 키워드와 일반 영어 단어를
+섞어 BM25 사전 선별, MinHash 중복 제거, 추출 압축이 실제와 비슷하게 동작하도록 한다.
+"""
+
+import copy
+import hashlib
+import json
+import os
+import random
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from typing import Dict, List
+
+import yaml
+
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+CONFIG_DIR = os.path.join(os.path.dirname(__file__), "..", "config")
+
+NS = {
+    "content": "http://purl.org/rss/1.0/modules/content/",
+    "dc": "http://purl.org/dc/elements/1.1/",
+    "atom": "http://www.w3.org/2005/Atom",
+    "media": "http://search.yahoo.com/mrss/",
+}
+for _prefix, _uri in NS.items():
+    ET.register_namespace(_prefix, _uri)
+
+_FILLER = (
+    "the people who study this question often argue that our habits shape what we notice and what we "
+    "ignore so the evidence from recent experiments suggests a different story about how work changes "
+    "when tools become invisible and routines replace judgement yet many readers will recognise the "
+    "pattern from their own lives because every generation rediscovers the cost of distraction while "
+    "institutions struggle to adapt schools companies and governments all face the same tension between "
+    "speed and depth which is why some researchers propose slower methods of learning reflection writing "
+    "and conversation that reward patience over volume"
+).split()
+
+_TITLE_FORMS = [
+    "The case for {kw}",
+    "What {kw} reveals about modern work",
+    "Rethinking {kw} in the age of machines",
+    "Why {kw} matters more than ever",
+    "Inside the new science of {kw}",
+    "{kw}: a field guide",
+    "How {kw} is quietly reshaping {kw2}",
+    "Against the cult of {kw}",
+]
+
+PRESETS = {
+    # 실제 config/sources.yml 과 같은 규모
+    "realistic": {"feeds": 11, "entries": 25, "news_per_query": 40, "db_rows": 400},
+    # 확장 규모: 피드 500개, 후보 1만 건
+    "scaled": {"feeds": 500, "entries": 20, "news_per_query": 100, "db_rows": 20000},
+}
+
+
+def _load_keywords() -> List[List[str]]:
+    with open(os.path.join(CONFIG_DIR, "axes.yml"), "r") as f:
+        axes = yaml.safe_load(f).get("axes", [])
+    return [axis.get("keywords", []) for axis in axes]
+
+
+def load_news_keywords() -> List[str]:
+    with open(os.path.join(CONFIG_DIR, "sources.yml"), "r") as f:
+        return yaml.safe_load(f).get("news_keywords", [])
+
+
+class Corpus:
+    """규모별 결정적 데이터 생성기"""
+
+    def __init__(self, feeds: int, entries: int, news_per_query: int, db_rows: int, seed: int = 7, now: float = None):
+        self.n_feeds = feeds
+        self.entries = entries
+        self.news_per_query = news_per_query
+        self.db_rows = db_rows
+        self.seed = seed
+        self.now = datetime.fromtimestamp(now, timezone.utc) if now else datetime.now(timezone.utc)
+        self.axis_keywords = _load_keywords()
+
+        with open(os.path.join(FIXTURES, "longread.rss.xml"), "rb") as f:
+            self._rss_template = f.read()
+        with open(os.path.join(FIXTURES, "magazine.atom.xml"), "rb") as f:
+            self._atom_template = f.read()
+        with open(os.path.join(FIXTURES, "google_news.rss.xml"), "rb") as f:
+            self._google_template = f.read()
+        with open(os.path.join(FIXTURES, "newsapi_everything.json"), "r") as f:
+            self._newsapi_template = json.load(f)
+
+    @classmethod
+    def preset(cls, name: str, **overrides) -> "Corpus":
+        params = dict(PRESETS[name])
+        params.update({k: v for k, v in overrides.items() if v is not None})
+        return cls(**params)
+
+    def params(self) -> Dict:
+        return {
+            "feeds": self.n_feeds, "entries": self.entries, "news_per_query": self.news_per_query,
+            "db_rows": self.db_rows, "seed": self.seed, "now": self.now.timestamp(),
+        }
+
+    def _rng(self, *key) -> random.Random:
+        digest = hashlib.sha1(repr((self.seed,) + key).encode()).digest()
+        return random.Random(int.from_bytes(digest[:8], "big"))
+
+    # ── 텍스트 ──────────────────────────────────
+
+    def _keyword(self, rng: random.Random, axis: int) -> str:
+        return rng.choice(self.axis_keywords[axis % len(self.axis_keywords)])
+
+    def _sentence(self, rng: random.Random, axis: int) -> str:
+        words = rng.choices(_FILLER, k=rng.randint(10, 24))
+        if rng.random() < 0.4:
+            words.insert(rng.randint(0, len(words)), self._keyword(rng, axis))
+        return " ".join(words).capitalize() + "."
+
+    def _body_html(self, rng: random.Random, axis: int) -> str:
+        paragraphs = []
+        for _ in range(rng.randint(6, 18)):
+            paragraphs.append("<p>" + " ".join(self._sentence(rng, axis) for _ in range(rng.randint(3, 6))) + "</p>")
+        return "\n".join(paragraphs)
+
+    def _title(self, rng: random.Random, axis: int) -> str:
+        form = rng.choice(_TITLE_FORMS)
+        return form.format(kw=self._keyword(rng, axis), kw2=self._keyword(rng, axis + 1)).capitalize()
+
+    # ── 피드 ────────────────────────────────────
+
+    def sources(self, base_url: str) -> List[Dict]:
+        """sources.yml 의 deep_read_sources (실제 설정처럼 일부는 stream: true)"""
+        return [
+            {
+                "name": f"Bench Source {i}",
+                "url": f"{base_url}/rss/{i}.xml",
+                "tier": i % 3 + 1,
+                **({"stream": True} if i % 2 == 0 else {}),
+            }
+            for i in range(self.n_feeds)
+        ]
+
+    def article_url(self, feed: int, entry: int) -> str:
+        return f"https://source{feed}.example.org/essays/{feed}-{entry}/?utm_source=rss"
+
+    def _published(self, rng: random.Random, entry: int) -> datetime:
+        # 최신순, 일부는 48시간 수집 창 밖
+        hours = entry * (72.0 / max(self.entries, 1)) + rng.random()
+        return self.now - timedelta(hours=hours)
+
+    def feed(self, index: int) -> bytes:
+        """index 번째 피드 본문 (짝수는 RSS 2.0, 홀수는 Atom)"""
+        if index % 2 == 0:
+            return self._rss_feed(index)
+        return self._atom_feed(index)
+
+    def _rss_feed(self, index: int) -> bytes:
+        root = ET.fromstring(self._rss_template)
+        channel = root.find("channel")
+        template = channel.findall("item")[0]
+        for item in channel.findall("item"):
+            channel.remove(item)
+        channel.find("title").text = f"Bench Source {index}"
+
+        for entry in range(self.entries):
+            rng = self._rng("feed", index, entry)
+            axis = rng.randrange(len(self.axis_keywords))
+            item = copy.deepcopy(template)
+            item.find("title").text = self._title(rng, axis)
+            item.find("link").text = self.article_url(index, entry)
+            item.find("guid").text = f"https://source{index}.example.org/?p={entry}"
+            item.find("pubDate").text = format_datetime(self._published(rng, entry))
+            body = self._body_html(rng, axis)
+            item.find("description").text = body[:300]
+            item.find(f"{{{NS['content']}}}encoded").text = body
+            channel.append(item)
+        return ET.tostring(root, encoding="utf-8", xml_declaration=True)
+
+    def _atom_feed(self, index: int) -> bytes:
+        atom = NS["atom"]
+        root = ET.fromstring(self._atom_template)
+        template = root.findall(f"{{{atom}}}entry")[0]
+        for entry_el in root.findall(f"{{{atom}}}entry"):
+            root.remove(entry_el)
+        root.find(f"{{{atom}}}title").text = f"Bench Source {index}"
+
+        for entry in range(self.entries):
+            rng = self._rng("feed", index, entry)
+            axis = rng.randrange(len(self.axis_keywords))
+            el = copy.deepcopy(template)
+            published = self._published(rng, entry).strftime("%Y-%m-%dT%H:%M:%SZ")
+            el.find(f"{{{atom}}}title").text = self._title(rng, axis)
+            el.find(f"{{{atom}}}link").set("href", self.article_url(index, entry))
+            el.find(f"{{{atom}}}id").text = f"tag:source{index}.example.org,2025:/{entry}"
+            el.find(f"{{{atom}}}published").text = published
+            el.find(f"{{{atom}}}updated").text = published
+            body = self._body_html(rng, axis)
+            el.find(f"{{{atom}}}summary").text = body[:300]
+            el.find(f"{{{atom}}}content").text = body
+            root.append(el)
+        return ET.tostring(root, encoding="utf-8", xml_declaration=True)
+
+    # ── 뉴스 ────────────────────────────────────
+
+    def _story(self, rng: random.Random, n: int) -> Dict:
+        """뉴스 기사 하나 — 약 20%는 같은 기사를 다른 매체가 전재(제목/설명 거의 동일)"""
+        story = n if rng.random() > 0.2 else max(0, n - rng.randint(1, 5))
+        srng = self._rng("story", story)
+        axis = srng.randrange(len(self.axis_keywords))
+        return {
+            "title": self._title(srng, axis),
+            "description": " ".join(self._sentence(srng, axis) for _ in range(2)),
+            "outlet": f"Outlet {rng.randrange(40)}",
+            "url": f"https://outlet{rng.randrange(40)}.example.com/news/{story}-{n}",
+            "published": self.now - timedelta(hours=rng.random() * 24),
+        }
+
+    def newsapi(self, query: str, page_size: int) -> Dict:
+        """/v2/everything 응답"""
+        template = self._newsapi_template["articles"][0]
+        articles = []
+        for n in range(min(page_size, self.news_per_query)):
+            story = self._story(self._rng("newsapi", query, n), n)
+            article = dict(template)
+            article.update({
+                "source": {"id": None, "name": story["outlet"]},
+                "title": story["title"],
+                "description": story["description"],
+                "url": story["url"],
+                "publishedAt": story["published"].strftime("%Y-%m-%dT%H:%M:%SZ"),
+            })
+            articles.append(article)
+        return {"status": "ok", "totalResults": len(articles), "articles": articles}
+
+    def google_news(self, query: str, count: int = 50) -> bytes:
+        """Google News RSS 검색 결과"""
+        root = ET.fromstring(self._google_template)
+        channel = root.find("channel")
+        template = channel.findall("item")[0]
+        channel.remove(template)
+        for n in range(min(count, self.news_per_query)):
+            story = self._story(self._rng("google", query, n), n)
+            item = copy.deepcopy(template)
+            item.find("title").text = f"{story['title']} - {story['outlet']}"
+            item.find("link").text = story["url"]
+            item.find("guid").text = story["url"]
+            item.find("pubDate").text = format_datetime(story["published"])
+            item.find("description").text = story["description"]
+            item.find("source").text = story["outlet"]
+            channel.append(item)
+        return ET.tostring(root, encoding="utf-8", xml_declaration=True)
+
+    # ── DB ──────────────────────────────────────
+
+    def seed_rows(self) -> Dict[str, List[Dict]]:
+        """Supabase stand-in 초기 데이터 — 최근 30일 추천 이력과 피드백
+
+        일부 URL 은 이번 피드 후보와 겹쳐 중복 제거 경로도 실제처럼 동작한다.
+        """
+        rng = self._rng("db")
+        statuses = ["sent"] * 6 + ["starred", "archived", "skipped"]
+        articles, news, feedback = [], [], []
+        for n in range(self.db_rows):
+            created = (self.now - timedelta(days=rng.random() * 30)).isoformat()
+            axis = rng.randrange(len(self.axis_keywords))
+            if rng.random() < 0.05:
+                url = self.article_url(rng.randrange(self.n_feeds), rng.randrange(self.entries))
+            else:
+                url = f"https://archive.example.org/{n}"
+            key = url.split("?")[0].rstrip("/")   # canonical_url 과 같은 결과
+            status = rng.choice(statuses)
+            articles.append({
+                "id": n + 1, "title": self._title(rng, axis), "url": url, "url_key": key,
+                "source": f"Bench Source {rng.randrange(self.n_feeds)}", "axis_id": axis + 1,
+                "axis_name": f"Axis {axis + 1}", "new_concept_name": f"Concept {n}",
+                "briefing_type": "daily", "status": status, "created_at": created,
+            })
+            news.append({
+                "id": n + 1, "title": f"News {n}", "url": f"https://outlet{n % 40}.example.com/news/old-{n}",
+                "url_key": f"https://outlet{n % 40}.example.com/news/old-{n}",
+                "source": f"Outlet {n % 40}", "status": "sent", "created_at": created,
+            })
+            if status != "sent":
+                reaction = {"starred": "star", "archived": "bookmark", "skipped": "thumbsdown"}[status]
+                feedback.append({
+                    "id": len(feedback) + 1, "article_url": key, "reaction": reaction,
+                    "memo": "", "created_at": created,
+                })
+        return {"articles": articles, "news": news, "feedback": feedback}
@@ -0,0 +1,234 @@
+"""Postgres 쿼리 플랜 검사 — 스키마와 migrations/ 적용, 1년치 합성 데이터 적재, 조회 경로 EXPLAIN 확인
+
+    pip install -r bench/requirements.txt
+    python -m bench.pg_plans --dsn postgresql://postgres@localhost:5432/postgres
+    python -m bench.pg_plans --per-day 1000 --keep      # 더 큰 데이터, 끝나도 스키마 유지
+
+로컬 Postgres(12 이상 — generated column, INCLUDE 인덱스)에 alchemy_bench 스키마를 새로 만들어
+supabase_schema.sql 과 migrations/*.sql 을 번호 순서대로 적용한다 (마이그레이션이 새 DB 에서도
+다시 실행해도 안전한지 함께 확인된다). 002 의 GRANT 를 위해 Supabase 역할(anon, authenticated,
+service_role)이 없으면 NOLOGIN 으로 만든다.
+
+앱의 Supabase 조회를 SQL 로 옮긴 쿼리마다 EXPLAIN (ANALYZE, BUFFERS) 을 실행해 기대한 인덱스를
+기대한 방식(가능하면 Heap Fetches 0 인 Index Only Scan)으로 타는지 확인하고, 하나라도 어긋나면
+종료 코드 1 로 끝난다. psycopg 는 이 스크립트에만 필요하다.
+
+기대 플랜(인덱스 이름, Index Only Scan 여부)은 Postgres 16 기본 설정에서 --per-day 300, 1000 으로
+모두 통과한다. FAIL 이 나오면 인덱스와 기대값을 함께 점검한다.
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+from typing import Dict, Iterator, List, Tuple
+
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+SCHEMA = "alchemy_bench"
+INDEX_ONLY = ("Index Only Scan",)
+INDEX_ANY = ("Index Scan", "Index Only Scan", "Bitmap Index Scan")
+
+SUPABASE_ROLES = """
+DO $$
+DECLARE r TEXT;
+BEGIN
+    FOREACH r IN ARRAY ARRAY['anon', 'authenticated', 'service_role'] LOOP
+        IF NOT EXISTS (SELECT 1 FROM pg_roles WHERE rolname = r) THEN
+            EXECUTE format('CREATE ROLE %I NOLOGIN', r);
+        END IF;
+    END LOOP;
+END $$;
+"""
+
+# 하루 per_day 건씩 1년치 ({n} = 전체 행 수). 본문 컬럼은 실제 카드 길이(한국어 2문장 안팎)로 채운다.
+SEED = (
+    """
+INSERT INTO articles (title, url, url_key, source, axis_id, axis_name, why_new, new_concept_name, new_concept_desc,
+                      why_read, read_time, briefing_type, briefing_date, status, created_at)
+SELECT 'Article ' || i,
+       'https://source' || (i % 500) || '.example.org/essays/' || i || '/?utm_source=rss',
+       'https://source' || (i % 500) || '.example.org/essays/' || i,
+       'Source ' || (i % 500),
+       1 + i % 5, 'Axis ' || (1 + i % 5),
+       repeat('왜 새로운가 구체적 근거 ', 12),
+       'Concept ' || (i % 997),
+       repeat('개념 설명 ', 10),
+       repeat('왜 읽어야 하는가 연결 ', 12),
+       (5 + i % 20) || ' min',
+       CASE WHEN i % 7 = 0 THEN 'weekend' ELSE 'daily' END,
+       (ts AT TIME ZONE 'Asia/Seoul')::date,
+       (ARRAY['sent', 'sent', 'sent', 'sent', 'sent', 'sent', 'starred', 'archived', 'skipped'])[1 + i % 9],
+       ts
+FROM generate_series(1, {n}) AS i,
+     LATERAL (SELECT NOW() - (i * INTERVAL '1 day' * 365 / {n})) AS t(ts)
+""",
+    """
+INSERT INTO news (title, url, url_key, source, hashtag, summary_line_1, summary_line_2, summary_line_3,
+                  briefing_type, briefing_date, status, created_at)
+SELECT 'News ' || i,
+       'https://outlet' || (i % 40) || '.example.com/news/' || i,
+       'https://outlet' || (i % 40) || '.example.com/news/' || i,
+       'Outlet ' || (i % 40),
+       '#키워드',
+       repeat('무슨 일이 일어났는가 ', 6), repeat('왜 중요한가 ', 8), repeat('시사하는 점 ', 8),
+       'daily', (ts AT TIME ZONE 'Asia/Seoul')::date, 'sent', ts
+FROM generate_series(1, {n}) AS i,
+     LATERAL (SELECT NOW() - (i * INTERVAL '1 day' * 365 / {n})) AS t(ts)
+""",
+    """
+INSERT INTO feedback (article_url, reaction, memo, created_at)
+SELECT a.url_key,
+       CASE a.status WHEN 'starred' THEN 'star' WHEN 'archived' THEN 'bookmark' ELSE 'thumbsdown' END,
+       '',
+       a.created_at + INTERVAL '3 hours'
+FROM articles a
+WHERE a.status <> 'sent'
+""",
+)
+
+
+class Check:
+    """앱 쿼리 하나와 그 쿼리가 타야 하는 인덱스"""
+
+    def __init__(self, name: str, sql: str, index: str, node_types: Tuple[str, ...], params: Dict = None,
+                 analyze: bool = True):
+        self.name = name
+        self.sql = sql
+        self.index = index
+        self.node_types = node_types
+        self.params = params or {}
+        self.analyze = analyze
+
+
+def build_checks(sample: Dict) -> List[Check]:
+    hashes = [sample["article_hash"], sample["article_hash_2"]]
+    return [
+        Check("seen sync: articles",
+              "SELECT url, created_at FROM articles WHERE created_at >= NOW() - INTERVAL '1 day' "
+              "ORDER BY created_at LIMIT 1000 OFFSET 0",
+              "idx_articles_created_at_url", INDEX_ONLY),
+        Check("seen sync: news",
+              "SELECT url, created_at FROM news WHERE created_at >= NOW() - INTERVAL '1 day' "
+              "ORDER BY created_at LIMIT 1000 OFFSET 0",
+              "idx_news_created_at_url", INDEX_ONLY),
+        Check("excluded: recent 👎",
+              "SELECT article_url FROM feedback WHERE reaction = 'thumbsdown' "
+              "AND created_at >= NOW() - INTERVAL '90 days' ORDER BY created_at DESC LIMIT 500",
+              "idx_feedback_reaction_created_at", INDEX_ONLY),
+        Check("excluded: articles by hash",
+              "SELECT url, axis_name, source FROM articles WHERE url_hash = ANY(%(hashes)s)",
+              "idx_articles_url_hash", INDEX_ANY, {"hashes": hashes}),
+        Check("notion: article by hash",
+              "SELECT * FROM articles WHERE url_hash = ANY(%(hashes)s)",
+              "idx_articles_url_hash", INDEX_ANY, {"hashes": hashes}),
+        Check("notion: news by hash",
+              "SELECT * FROM news WHERE url_hash = ANY(%(hashes)s)",
+              "idx_news_url_hash", INDEX_ANY, {"hashes": [sample["news_hash"]]}),
+        Check("feedback: status update",
+              "UPDATE articles SET status = 'starred' WHERE url_hash = ANY(%(hashes)s)",
+              "idx_articles_url_hash", INDEX_ANY, {"hashes": hashes}, analyze=False),
+        Check("feedback: by article url",
+              "SELECT 1 FROM feedback WHERE article_url = %(url)s",
+              "idx_feedback_article_url", INDEX_ONLY, {"url": sample["feedback_url"]}),
+        Check("weekly: starred this week",
+              "SELECT count(*) FROM articles WHERE status = 'starred' AND created_at >= NOW() - INTERVAL '7 days'",
+              "idx_articles_status_created_at", INDEX_ONLY),
+        Check("news: by url_key",
+              "SELECT id FROM news WHERE url_key = %(url)s",
+              "uq_news_url_key", INDEX_ANY, {"url": sample["news_url"]}),
+    ]
+
+
+def _nodes(plan: Dict) -> Iterator[Dict]:
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _nodes(child)
+
+
+def explain(conn, check: Check) -> Tuple[bool, str, float]:
+    """(통과 여부, 설명, 실행 시간 ms)"""
+    options = "ANALYZE, BUFFERS, FORMAT JSON" if check.analyze else "FORMAT JSON"
+    row = conn.execute(f"EXPLAIN ({options}) {check.sql}", check.params).fetchone()
+    result = row[0][0]
+    nodes = [n for n in _nodes(result["Plan"]) if n.get("Index Name") == check.index]
+    elapsed = result.get("Execution Time", 0.0)
+    if not nodes:
+        used = sorted({n["Node Type"] + (f" ({n['Index Name']})" if n.get("Index Name") else "")
+                       for n in _nodes(result["Plan"])})
+        return False, f"{check.index} not used — {', '.join(used)}", elapsed
+    node = nodes[0]
+    if node["Node Type"] not in check.node_types:
+        return False, f"{node['Node Type']} on {check.index} (expected {' / '.join(check.node_types)})", elapsed
+    if node["Node Type"] == "Index Only Scan" and check.analyze and node.get("Heap Fetches", 0):
+        return False, f"Index Only Scan with {node['Heap Fetches']} heap fetches", elapsed
+    return True, f"{node['Node Type']} on {check.index}", elapsed
+
+
+def setup(conn, per_day: int) -> None:
+    """스키마 + 마이그레이션 적용, 합성 데이터 적재, VACUUM ANALYZE"""
+    conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+    conn.execute(f"CREATE SCHEMA {SCHEMA}")
+    conn.execute(f"SET search_path TO {SCHEMA}, public")
+    conn.execute(SUPABASE_ROLES)
+
+    files = [os.path.join(ROOT, "supabase_schema.sql")] + sorted(glob.glob(os.path.join(ROOT, "migrations", "*.sql")))
+    for path in files:
+        with open(path, "r", encoding="utf-8") as f:
+            conn.execute(f.read())
+        print(f"  applied {os.path.relpath(path, ROOT)}")
+
+    started = time.perf_counter()
+    for statement in SEED:
+        conn.execute(statement.format(n=int(per_day) * 365))
+    counts = {t: conn.execute(f"SELECT count(*) FROM {t}").fetchone()[0] for t in ("articles", "news", "feedback")}
+    print(f"  seeded {counts} in {time.perf_counter() - started:.1f}s")
+    for table in counts:
+        conn.execute(f"VACUUM (ANALYZE) {table}")  # Index Only Scan 에 필요한 visibility map
+
+
+def main_cli(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Alchemy Postgres query-plan checks")
+    parser.add_argument("--dsn", default=os.environ.get("ALCHEMY_BENCH_PG_DSN", "postgresql://postgres@localhost:5432/postgres"))
+    parser.add_argument("--per-day", type=int, default=300, help="테이블별 하루 행 수 (365일치 적재)")
+    parser.add_argument("--keep", action="store_true", help=f"끝나도 {SCHEMA} 스키마를 지우지 않음")
+    args = parser.parse_args(argv)
+
+    try:
+        import psycopg
+    except ImportError:
+        print("psycopg is required: pip install -r bench/requirements.txt")
+        return 2
+
+    with psycopg.connect(args.dsn, autocommit=True) as conn:
+        print(f"Postgres {conn.info.server_version} — schema {SCHEMA}")
+        setup(conn, args.per_day)
+        sample = {
+            "article_hash": conn.execute("SELECT url_hash FROM articles ORDER BY id LIMIT 1").fetchone()[0],
+            "article_hash_2": conn.execute("SELECT md5('https://missing.example.org/x')").fetchone()[0],
+            "news_hash": conn.execute("SELECT url_hash FROM news ORDER BY id DESC LIMIT 1").fetchone()[0],
+            "news_url": conn.execute("SELECT url_key FROM news ORDER BY id LIMIT 1").fetchone()[0],
+            "feedback_url": conn.execute("SELECT article_url FROM feedback ORDER BY id LIMIT 1").fetchone()[0],
+        }
+
+        failures = 0
+        print(f"\n  {'query':<28} {'ms':>8}  plan")
+        for check in build_checks(sample):
+            ok, detail, elapsed = explain(conn, check)
+            failures += not ok
+            print(f"  {check.name:<28} {elapsed:8.2f}  {'ok  ' if ok else 'FAIL'} {detail}")
+
+        started = time.perf_counter()
+        conn.execute("SELECT weekly_stats(NOW() - INTERVAL '7 days')").fetchone()
+        print(f"  {'weekly_stats() rpc':<28} {(time.perf_counter() - started) * 1000:8.2f}  (timing only)")
+
+        if not args.keep:
+            conn.execute(f"DROP SCHEMA {SCHEMA} CASCADE")
+
+    print(f"\n{'all plans use their indexes' if not failures else f'{failures} plan check(s) failed'}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
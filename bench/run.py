@@ -0,0 +1,260 @@
+"""벤치마크 실행기 — stand-in 서버를 띄우고 daily/weekend 작업을 그대로 실행하며 측정
+
+    python -m bench.run --job daily --scale realistic
+    python -m bench.run --job both --scale scaled --runs 2 --latency groq=300,rss=80 --error-rate rss=0.02
+    python -m bench.run --job daily --serial          # 단계 순차 실행 기준선
+
+환경 변수로 모든 외부 endpoint(NEWSAPI_URL, GOOGLE_NEWS_RSS_URL, GROQ_BASE_URL, SUPABASE_URL,
+SLACK_API_URL)와 설정/상태 디렉터리를 stand-in 과 임시 디렉터리로 돌린 뒤 main 을 import 한다.
+같은 상태 디렉터리로 --runs 만큼 반복하므로 두 번째 실행부터는 피드/LLM/digest 캐시가 데워진 상태다.
+
+측정 항목
+- 단계별 wall time, 단계 스레드 CPU 시간, 단계 실행 중 프로세스 peak RSS
+- 실행 전체 wall / CPU / peak RSS
+- 서비스별 외부 호출 수·오류 수·응답 바이트 (stand-in 집계), LLM 텔레메트리
+
+Notion 은 daily/weekend 작업이 쓰지 않으므로(Slack 리액션 봇 전용) 측정 대상이 아니다.
+결과는 화면에 출력하고 bench_output.txt 에 덧붙인다.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import resource
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from datetime import datetime
+from typing import Dict
+
+import yaml
+
+from bench.corpus import Corpus, PRESETS, load_news_keywords
+from bench.standins import SERVICES, start_server
+
+
+SAMPLE_INTERVAL = 0.01
+OUTPUT_FILE = os.path.join(os.path.dirname(__file__), "..", "bench_output.txt")
+
+
+def _parse_pairs(value: str) -> Dict[str, float]:
+    """'groq=300,rss=50' → {'groq': 300.0, 'rss': 50.0}"""
+    pairs = {}
+    for part in filter(None, (value or "").split(",")):
+        name, _, number = part.partition("=")
+        if name not in SERVICES:
+            raise argparse.ArgumentTypeError(f"unknown service '{name}' (choose from {', '.join(SERVICES)})")
+        pairs[name] = float(number)
+    return pairs
+
+
+def _rss_bytes() -> int:
+    """현재 프로세스 RSS (리눅스 /proc, 그 외에는 ru_maxrss 로 대신)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class Probe:
+    """pipeline listener — 단계별 wall/CPU 시간과 실행 중 peak RSS 기록"""
+
+    def __init__(self):
+        self.stages: Dict[str, Dict] = {}
+        self.peak_rss = 0
+        self._open: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._sample, daemon=True)
+
+    def __enter__(self):
+        self._sampler.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._sampler.join()
+
+    def _sample(self) -> None:
+        while not self._stop.wait(SAMPLE_INTERVAL):
+            rss = _rss_bytes()
+            with self._lock:
+                self.peak_rss = max(self.peak_rss, rss)
+                for entry in self._open.values():
+                    entry["peak_rss"] = max(entry["peak_rss"], rss)
+
+    def __call__(self, name: str, event: str) -> None:
+        # listener 는 단계를 실행하는 워커 스레드에서 불리므로 thread_time 이 곧 그 단계의 CPU 시간
+        now, cpu, rss = time.perf_counter(), time.thread_time(), _rss_bytes()
+        with self._lock:
+            if event == "start":
+                self._open[name] = {"start": now, "cpu": cpu, "peak_rss": rss}
+                return
+            entry = self._open.pop(name, None)
+            if entry is None:
+                return
+            self.stages[name] = {
+                "start": entry["start"], "wall": now - entry["start"], "cpu": cpu - entry["cpu"],
+                "peak_rss": max(entry["peak_rss"], rss),
+            }
+
+
+def _get_json(url: str) -> Dict:
+    with urllib.request.urlopen(url, timeout=10) as response:
+        return json.loads(response.read())
+
+
+def _configure(base_url: str, corpus: Corpus, workdir: str, serial: bool) -> None:
+    """endpoint / 설정 / 상태 디렉터리를 stand-in 과 임시 디렉터리로 — main import 전에 불러야 한다"""
+    config_dir = os.path.join(workdir, "config")
+    os.makedirs(config_dir, exist_ok=True)
+    with open(os.path.join(config_dir, "sources.yml"), "w") as f:
+        yaml.safe_dump({
+            "news_keywords": load_news_keywords(),
+            "deep_read_sources": corpus.sources(base_url),
+        }, f, allow_unicode=True, sort_keys=False)
+
+    os.environ.update({
+        "ALCHEMY_CONFIG_DIR": config_dir,
+        "ALCHEMY_STATE_DIR": os.path.join(workdir, "state"),
+        "NEWSAPI_URL": f"{base_url}/newsapi/v2/everything",
+        "NEWS_API_KEY": "bench",
+        "NEWS_API_DAILY_LIMIT": "100000",
+        "GOOGLE_NEWS_RSS_URL": f"{base_url}/google/rss/search",
+        "GROQ_BASE_URL": f"{base_url}/groq",
+        "GROQ_API_KEY": "bench",
+        "SUPABASE_URL": f"{base_url}/supabase",
+        "SUPABASE_KEY": "bench.bench.bench",
+        "SLACK_API_URL": f"{base_url}/slack/api/",
+        "SLACK_BOT_TOKEN": "xoxb-bench",
+    })
+    if serial:
+        os.environ["ALCHEMY_STAGE_WORKERS"] = "1"
+
+
+def run_once(job: str, base_url: str, stream: bool, log) -> Dict:
+    """작업 한 번 실행 + 측정"""
+    import main
+    from src import pipeline
+    from src.curator.routing import get_telemetry
+
+    _get_json(f"{base_url}/_reset")
+    telemetry_before = {(row["agent"], row["model"]): row for row in get_telemetry().summary()}
+    probe = Probe()
+    pipeline.add_listener(probe)
+    started, cpu_started = time.perf_counter(), time.process_time()
+    try:
+        with probe, contextlib.redirect_stdout(log):
+            if job == "daily":
+                main.run_daily_briefing(stream=stream)
+            else:
+                main.run_weekend_deep_dive()
+    finally:
+        pipeline.remove_listener(probe)
+    wall, cpu = time.perf_counter() - started, time.process_time() - cpu_started
+
+    stats = _get_json(f"{base_url}/_stats")
+    llm = {}
+    for row in get_telemetry().summary():
+        before = telemetry_before.get((row["agent"], row["model"]), {})
+        llm[f"{row['agent']}/{row['model']}"] = {
+            key: row[key] - before.get(key, 0)
+            for key in ("calls", "prompt_tokens", "cached_tokens", "completion_tokens")
+        }
+    return {
+        "job": job, "wall": wall, "cpu": cpu, "peak_rss": probe.peak_rss,
+        "stages": probe.stages, "stats": stats, "llm": llm, "ok": stats["error_notifications"] == 0,
+    }
+
+
+def _mb(value: int) -> str:
+    return f"{value / 2**20:7.1f}MB"
+
+
+def format_report(result: Dict, label: str) -> str:
+    lines = [
+        f"── {label} — {result['job']} {'ok' if result['ok'] else 'FAILED (error notification sent)'}",
+        f"  wall {result['wall']:.2f}s  cpu {result['cpu']:.2f}s  peak RSS {_mb(result['peak_rss']).strip()}",
+        f"  {'stage':<20} {'start':>7} {'wall':>8} {'cpu':>8} {'peak RSS':>10}",
+    ]
+    stages = sorted(result["stages"].items(), key=lambda kv: kv[1]["start"])
+    origin = stages[0][1]["start"] if stages else 0
+    for name, s in stages:
+        lines.append(
+            f"  {name:<20} {s['start'] - origin:6.2f}s {s['wall']:7.2f}s {s['cpu']:7.2f}s {_mb(s['peak_rss']):>10}"
+        )
+
+    stats = result["stats"]
+    lines.append(f"  {'service':<20} {'calls':>7} {'errors':>8} {'bytes':>12}")
+    for service in SERVICES:
+        calls = stats["calls"].get(service, 0)
+        if calls:
+            lines.append(
+                f"  {service:<20} {calls:>7} {stats['errors'].get(service, 0):>8} {stats['bytes_out'].get(service, 0):>12,}"
+            )
+    if any(row.get("calls") for row in result["llm"].values()):
+        lines.append(f"  {'llm agent/model':<44} {'calls':>7} {'prompt':>8} {'cached':>8} {'compl.':>8}")
+        for name, row in sorted(result["llm"].items()):
+            if row["calls"]:
+                lines.append(
+                    f"  {name:<44} {row['calls']:>7} {row['prompt_tokens']:>8} {row['cached_tokens']:>8} {row['completion_tokens']:>8}"
+                )
+    return "\n".join(lines)
+
+
+def main_cli(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Alchemy offline benchmark")
+    parser.add_argument("--job", choices=["daily", "weekend", "both"], default="daily")
+    parser.add_argument("--scale", choices=sorted(PRESETS), default="realistic")
+    parser.add_argument("--feeds", type=int, help="피드 수 (프리셋 덮어쓰기)")
+    parser.add_argument("--entries", type=int, help="피드당 entry 수 (프리셋 덮어쓰기)")
+    parser.add_argument("--runs", type=int, default=1, help="같은 상태 디렉터리로 반복 (2회차부터 warm)")
+    parser.add_argument("--latency", type=_parse_pairs, default={}, help="서비스별 지연 ms, 예: groq=300,rss=50")
+    parser.add_argument("--error-rate", type=_parse_pairs, default={}, help="서비스별 오류율, 예: rss=0.02")
+    parser.add_argument("--time-scale", type=float, default=1.0, help="stand-in 의 모든 대기 시간 배율")
+    parser.add_argument("--stream", action="store_true", help="daily 를 --stream 모드로")
+    parser.add_argument("--serial", action="store_true", help="단계를 하나씩 실행 (ALCHEMY_STAGE_WORKERS=1)")
+    parser.add_argument("--output", default=OUTPUT_FILE)
+    parser.add_argument("--verbose", action="store_true", help="파이프라인 출력도 화면에 표시")
+    args = parser.parse_args(argv)
+
+    corpus = Corpus.preset(args.scale, feeds=args.feeds, entries=args.entries)
+    latency = {"rss": 40, "google": 120, "newsapi": 250, "groq": 250, "supabase": 30, "slack": 60, **args.latency}
+    process, base_url = start_server(corpus, latency, args.error_rate, args.time_scale)
+    jobs = ["daily", "weekend"] if args.job == "both" else [args.job]
+
+    header = (
+        f"Alchemy bench {datetime.now().isoformat(timespec='seconds')} — scale={args.scale} "
+        f"({corpus.n_feeds} feeds × {corpus.entries} entries, {corpus.db_rows} seeded rows) "
+        f"latency={latency} errors={args.error_rate or '{}'} time_scale={args.time_scale}"
+        f"{' serial' if args.serial else ''}{' stream' if args.stream else ''}"
+    )
+    reports = [header]
+    print(header)
+    try:
+        with tempfile.TemporaryDirectory(prefix="alchemy-bench-") as workdir:
+            _configure(base_url, corpus, workdir, args.serial)
+            log = sys.stdout if args.verbose else io.StringIO()
+            for run in range(args.runs):
+                for job in jobs:
+                    label = f"run {run + 1}/{args.runs} ({'cold' if run == 0 else 'warm'})"
+                    report = format_report(run_once(job, base_url, args.stream, log), label)
+                    print(report)
+                    reports.append(report)
+    finally:
+        process.terminate()
+        process.join()
+
+    with open(args.output, "a") as f:
+        f.write("\n".join(reports) + "\n\n")
+    print(f"\nappended to {os.path.normpath(args.output)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,604 @@
+"""로컬 서비스 stand-in — RSS / Google News / NewsAPI / Groq / Supabase(PostgREST) / Slack
+
+하나의 HTTP 서버가 경로 prefix 로 서비스를 나눠 흉내 낸다. 파이프라인 메모리 측정에
+섞이지 않도록 별도 프로세스에서 띄운다 (start_server).
+
+서비스마다 지연(latency_ms)과 오류율(error_rate)을 줄 수 있다. 오류는 실제 서비스가
+돌려주는 형태를 따른다 — RSS/Supabase 503, NewsAPI 503, Groq 429 + retry-after,
+Slack 429 + Retry-After. /_stats 는 서비스별 호출/오류 수, /_reset 은 카운터 초기화.
+
+Groq 는 프롬프트 머리말(SELECTOR / ANALYST / CONNECTOR / ALBOT / Alchemi)로 에이전트를
+구분하고, 프롬프트 안의 후보 목록을 읽어 그 형식 그대로 JSON 을 돌려준다. 생성 시간은
+모델별 초당 토큰 수로 흉내 내며 stream=true 면 SSE 로 조금씩 보낸다.
+"""
+
+import hashlib
+import itertools
+import json
+import multiprocessing
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+from urllib.parse import parse_qsl, urlsplit
+
+from bench.corpus import Corpus
+
+
+SERVICES = ("rss", "google", "newsapi", "groq", "supabase", "slack")
+
+# Groq 모델별 출력 속도 (tokens/s, 공개 벤치마크 수준)
+MODEL_TPS = {
+    "llama-3.1-8b-instant": 750,
+    "llama-3.3-70b-versatile": 275,
+    "meta-llama/llama-4-scout-17b-16e-instruct": 460,
+}
+DEFAULT_TPS = 400
+PREFIX_BLOCK_CHARS = 512    # 프롬프트 캐시 단위 — 앞부분이 이 단위로 같으면 cached_tokens 로 보고
+STREAM_PIECE_CHARS = 24
+
+
+# ──────────────────────────────────────────────
+# PostgREST 부분 구현
+# ──────────────────────────────────────────────
+
+# supabase_schema.sql 의 DEFAULT 중 파이프라인이 기대는 것
+COLUMN_DEFAULTS = {
+    "articles": {"status": "sent", "briefing_type": "daily"},
+    "news": {"status": "sent", "briefing_type": "daily"},
+}
+
+
+def _md5(value) -> str:
+    return hashlib.md5(str(value or "").encode("utf-8")).hexdigest()
+
+
+# GENERATED ALWAYS AS ... STORED 컬럼
+GENERATED_COLUMNS = {
+    "articles": {"url_hash": lambda row: _md5(row.get("url_key"))},
+    "news": {"url_hash": lambda row: _md5(row.get("url_key"))},
+}
+
+
+def _generate(table: str, row: Dict) -> Dict:
+    for column, fn in GENERATED_COLUMNS.get(table, {}).items():
+        row[column] = fn(row)
+    return row
+
+def _sort_key(value) -> tuple:
+    """order= 정렬 키 — 숫자는 숫자로, 나머지는 문자열로, NULL 은 뒤로"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return (False, value, "")
+    return (value is None, 0, "" if value is None else str(value))
+
+
+def _split_list(value: str) -> List[str]:
+    """in.(a,"b,c") → ['a', 'b,c'] (postgrest-py 는 ,:() 가 든 값을 큰따옴표로 감싼다)"""
+    return [a if a is not None and a != "" else b for a, b in re.findall(r'"((?:[^"\\]|\\.)*)"|([^,]+)', value)]
+
+
+def _matches(row: Dict, column: str, op: str, value: str) -> bool:
+    field = row.get(column)
+    text = "" if field is None else str(field)
+    if op == "eq":
+        return text == value
+    if op == "neq":
+        return text != value
+    if op == "in":
+        return text in value
+    if op == "is":
+        return field is None if value == "null" else str(field).lower() == value
+    if field is None:
+        return False
+    if op in ("gt", "gte", "lt", "lte"):
+        try:
+            left, right = float(field), float(value)
+        except (TypeError, ValueError):
+            left, right = text, value
+        return {"gt": left > right, "gte": left >= right, "lt": left < right, "lte": left <= right}[op]
+    if op in ("like", "ilike"):
+        pattern = re.escape(value).replace(r"\*", ".*").replace("%", ".*")
+        return re.fullmatch(pattern, text, re.I if op == "ilike" else 0) is not None
+    return True
+
+
+class Tables:
+    """메모리 테이블 + PostgREST 질의 (select / 필터 / order / limit / insert / upsert / update)"""
+
+    def __init__(self, rows: Dict[str, List[Dict]]):
+        self.rows = defaultdict(list, {name: [_generate(name, dict(r)) for r in items] for name, items in rows.items()})
+        self._ids = {name: itertools.count(max((r.get("id", 0) for r in items), default=0) + 1) for name, items in rows.items()}
+        self._lock = threading.Lock()
+
+    def _next_id(self, table: str) -> int:
+        if table not in self._ids:
+            self._ids[table] = itertools.count(1)
+        return next(self._ids[table])
+
+    @staticmethod
+    def _filters(params: List[tuple]) -> List[tuple]:
+        filters = []
+        for column, expr in params:
+            if column in ("select", "order", "limit", "offset", "on_conflict", "columns"):
+                continue
+            op, _, value = expr.partition(".")
+            negate = op == "not"
+            if negate:
+                op, _, value = value.partition(".")
+            if op == "in":
+                value = set(_split_list(value.strip("()")))
+            filters.append((column, op, value, negate))
+        return filters
+
+    def _where(self, table: str, params: List[tuple]) -> List[Dict]:
+        filters = self._filters(params)
+        return [
+            row for row in self.rows[table]
+            if all(_matches(row, c, op, v) != negate for c, op, v, negate in filters)
+        ]
+
+    @staticmethod
+    def _project(rows: List[Dict], select: str) -> List[Dict]:
+        if not select or select.strip() == "*":
+            return [dict(r) for r in rows]
+        columns = [c.strip() for c in select.split(",") if c.strip() and "(" not in c]
+        return [{c: r.get(c) for c in columns} for r in rows]
+
+    def select(self, table: str, params: List[tuple]) -> List[Dict]:
+        query = dict(params)
+        with self._lock:
+            rows = self._where(table, params)
+        for spec in reversed((query.get("order") or "").split(",")):
+            if not spec:
+                continue
+            column, _, direction = spec.partition(".")
+            rows.sort(key=lambda r: _sort_key(r.get(column)), reverse=direction.startswith("desc"))
+        offset = int(query.get("offset", 0))
+        if "limit" in query:
+            rows = rows[offset:offset + int(query["limit"])]
+        elif offset:
+            rows = rows[offset:]
+        return self._project(rows, query.get("select", "*"))
+
+    def insert(self, table: str, body, params: List[tuple], merge: bool) -> List[Dict]:
+        query = dict(params)
+        items = body if isinstance(body, list) else [body]
+        conflict = [c for c in (query.get("on_conflict") or "").split(",") if c]
+        now = datetime.now(timezone.utc).isoformat()
+        result = []
+        with self._lock:
+            for item in items:
+                existing = None
+                if conflict:
+                    key = tuple(str(item.get(c)) for c in conflict)
+                    existing = next(
+                        (r for r in self.rows[table] if tuple(str(r.get(c)) for c in conflict) == key), None
+                    )
+                if existing is not None:
+                    if merge:
+                        existing.update(item)
+                        _generate(table, existing)
+                    result.append(dict(existing))
+                    continue
+                row = _generate(table, {"id": self._next_id(table), "created_at": now, **COLUMN_DEFAULTS.get(table, {}), **item})
+                self.rows[table].append(row)
+                result.append(dict(row))
+        return self._project(result, query.get("select", "*"))
+
+    def update(self, table: str, body: Dict, params: List[tuple]) -> List[Dict]:
+        with self._lock:
+            rows = self._where(table, params)
+            for row in rows:
+                row.update(body)
+                _generate(table, row)
+            return [dict(r) for r in rows]
+
+    def rpc(self, name: str, args: Dict):
+        """migrations/ 의 SQL 함수를 같은 결과로 흉내 — 없는 함수는 None"""
+        if name == "weekly_stats":
+            with self._lock:
+                week = sorted(
+                    (r for r in self.rows["articles"] if str(r.get("created_at", "")) >= args.get("since", "")),
+                    key=lambda r: str(r.get("created_at", "")),
+                )
+            starred = [r for r in week if r.get("status") == "starred"]
+            return {
+                "total": len(week),
+                "starred": len(starred),
+                "archived": sum(r.get("status") == "archived" for r in week),
+                "skipped": sum(r.get("status") == "skipped" for r in week),
+                "axis_counts": dict(Counter(r.get("axis_name") or "Unknown" for r in week)),
+                "starred_articles": [
+                    {k: r.get(k) for k in ("title", "url", "axis_name", "new_concept_name")} for r in starred
+                ],
+            }
+        return None
+
+    def delete(self, table: str, params: List[tuple]) -> List[Dict]:
+        with self._lock:
+            rows = self._where(table, params)
+            ids = {id(r) for r in rows}
+            self.rows[table] = [r for r in self.rows[table] if id(r) not in ids]
+            return [dict(r) for r in rows]
+
+
+# ──────────────────────────────────────────────
+# Groq 응답 생성
+# ──────────────────────────────────────────────
+
+_NUMBERED = re.compile(r"^\[(\d+)\] (.+)\nSource: (.+?)(?: \(Tier (\d)\))?\nURL: (\S+)", re.M)
+_ANALYST_ITEM = re.compile(r"^Article (\d+): (.+)\nSource: (.+)\nURL: (\S+)\nAxis: (.*)", re.M)
+_CONNECTOR_ITEM = re.compile(r"^- (.+?) \[(.*?)\]: ", re.M)
+_COUNT = re.compile(r"Select exactly (\d+)")
+
+_KO = "주의력은 고정된 특성이 아니라 환경이 요구하지 않으면 약해지는 실천이며 이 글은 그 근거를 구체적 실험으로 보여준다"
+
+
+def _agent(prompt: str) -> str:
+    for marker, agent in (
+        ("SELECTOR agent", "selector"), ("ANALYST agent", "analyst"),
+        ("CONNECTOR agent", "connector"), ("ALBOT", "weekly"), ("Alchemi", "news"),
+    ):
+        if marker in prompt:
+            return agent
+    return "default"
+
+
+def _korean(rng: random.Random, words: int) -> str:
+    pieces = _KO.split()
+    return " ".join(rng.choice(pieces) for _ in range(words)) + "."
+
+
+def groq_answer(prompt: str) -> str:
+    """에이전트별 JSON 응답 본문"""
+    rng = random.Random(hashlib.sha1(prompt.encode()).digest())
+    agent = _agent(prompt)
+    count = int((_COUNT.search(prompt) or [None, 5])[1])
+
+    if agent in ("news", "selector"):
+        items = _NUMBERED.findall(prompt)
+        picked = sorted(rng.sample(items, min(count, len(items))), key=lambda m: int(m[0]))
+        if agent == "news":
+            return json.dumps({"selected_news": [
+                {
+                    "hashtag": "#" + rng.choice(["AI정책", "인지과학", "명상연구", "교육혁신", "생산성과학"]),
+                    "title": title, "summary_line_1": _korean(rng, 10), "summary_line_2": _korean(rng, 10),
+                    "summary_line_3": _korean(rng, 12), "url": url, "source": source,
+                }
+                for _, title, source, _, url in picked
+            ]}, ensure_ascii=False, indent=2)
+        return json.dumps({"selected": [
+            {
+                "index": int(index), "title": title, "source": source, "url": url, "tier": int(tier or 3),
+                "axis_id": axis, "axis_name": f"Axis {axis}",
+                "selection_reason": "It reframes a familiar habit as a practice that decays without demand.",
+            }
+            for index, title, source, tier, url in picked
+            for axis in [rng.randint(1, 5)]
+        ]}, ensure_ascii=False, indent=2)
+
+    if agent == "analyst":
+        return json.dumps({"analyzed_articles": [
+            {
+                "title": title, "source": source, "url": url, "read_time": f"{rng.randint(6, 25)} min",
+                "axis_id": rng.randint(1, 5), "axis_name": axis_name, "why_new": _korean(rng, 24),
+                "new_concept_name": f"Concept {rng.randint(1, 999)}", "new_concept_desc": _korean(rng, 14),
+                "why_read": _korean(rng, 24),
+            }
+            for _, title, source, url, axis_name in _ANALYST_ITEM.findall(prompt)
+        ]}, ensure_ascii=False, indent=2)
+
+    if agent == "connector":
+        titles = [t for t, _ in _CONNECTOR_ITEM.findall(prompt)]
+        return json.dumps({"connection": f"{' / '.join(titles[:2])} — {_korean(rng, 14)}"}, ensure_ascii=False)
+    if agent == "weekly":
+        return json.dumps({"question": _korean(rng, 16)}, ensure_ascii=False)
+    return json.dumps({"result": _korean(rng, 8)}, ensure_ascii=False)
+
+
+def _estimate_tokens(text: str) -> int:
+    ascii_chars = sum(1 for c in text if c.isascii())
+    return ascii_chars // 4 + (len(text) - ascii_chars)
+
+
+# ──────────────────────────────────────────────
+# HTTP 서버
+# ──────────────────────────────────────────────
+
+class StandIn:
+    """서비스 설정, 데이터, 카운터"""
+
+    def __init__(self, corpus_params: Dict, latency_ms: Dict[str, float], error_rate: Dict[str, float], time_scale: float):
+        self.corpus = Corpus(**corpus_params)
+        self.tables = Tables(self.corpus.seed_rows())
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.time_scale = time_scale
+        self.calls = Counter()
+        self.errors = Counter()
+        self.bytes_out = Counter()
+        self.notifications = []
+        self._feeds: Dict[int, bytes] = {}
+        self._prefixes = set()      # (모델, 프롬프트 앞부분 해시) — Groq 프롬프트 캐시 흉내
+        self._rng = random.Random(0)
+        self._lock = threading.Lock()
+
+    def cached_chars(self, model: str, prompt: str) -> int:
+        """이전 요청과 같은 모델·같은 앞부분(PREFIX_BLOCK_CHARS 단위) 길이, 이번 프롬프트도 기록"""
+        keys = [
+            (model, hashlib.sha1(prompt[:end].encode()).hexdigest())
+            for end in range(PREFIX_BLOCK_CHARS, len(prompt) + 1, PREFIX_BLOCK_CHARS)
+        ]
+        with self._lock:
+            hits = 0
+            for key in keys:
+                if key not in self._prefixes:
+                    break
+                hits += 1
+            self._prefixes.update(keys)
+        return hits * PREFIX_BLOCK_CHARS
+
+    def sleep(self, seconds: float) -> None:
+        if seconds > 0:
+            time.sleep(seconds * self.time_scale)
+
+    def enter(self, service: str) -> bool:
+        """호출 기록 + 지연 — 오류를 주입할 차례면 True"""
+        with self._lock:
+            self.calls[service] += 1
+            fail = self._rng.random() < self.error_rate.get(service, 0.0)
+            if fail:
+                self.errors[service] += 1
+        self.sleep(self.latency_ms.get(service, 0.0) / 1000)
+        return fail
+
+    def feed(self, index: int) -> bytes:
+        with self._lock:
+            if index not in self._feeds:
+                self._feeds[index] = self.corpus.feed(index)
+            return self._feeds[index]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "calls": dict(self.calls), "errors": dict(self.errors), "bytes_out": dict(self.bytes_out),
+                "error_notifications": len(self.notifications),
+                "rows": {name: len(rows) for name, rows in self.tables.rows.items()},
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.calls.clear()
+            self.errors.clear()
+            self.bytes_out.clear()
+            self.notifications.clear()
+
+
+def _handler(state: StandIn):
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status: int, body, content_type: str = "application/json", headers: Dict = None, service: str = None):
+            if not isinstance(body, bytes):
+                body = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+            if service:
+                with state._lock:
+                    state.bytes_out[service] += len(body)
+
+        def _body(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length) if length else b""
+            if not raw:
+                return {}
+            if self.headers.get("Content-Type", "").startswith("application/json"):
+                return json.loads(raw)
+            return dict(parse_qsl(raw.decode("utf-8")))
+
+        def do_GET(self):
+            self._route("GET")
+
+        def do_POST(self):
+            self._route("POST")
+
+        def do_PATCH(self):
+            self._route("PATCH")
+
+        def do_DELETE(self):
+            self._route("DELETE")
+
+        def _route(self, method: str):
+            parts = urlsplit(self.path)
+            path, params = parts.path, parse_qsl(parts.query, keep_blank_values=True)
+            body = self._body()  # GET 에도 본문이 올 수 있다 — 읽어 두지 않으면 keep-alive 연결이 꼬인다
+            if path == "/_stats":
+                return self._send(200, state.stats())
+            if path == "/_reset":
+                state.reset()
+                return self._send(200, {"ok": True})
+            for prefix, handle in (
+                ("/rss/", self._rss), ("/google/", self._google), ("/newsapi/", self._newsapi),
+                ("/groq/", self._groq), ("/supabase/", self._supabase), ("/slack/", self._slack),
+            ):
+                if path.startswith(prefix):
+                    return handle(method, path[len(prefix):], params, body)
+            self._send(404, {"message": f"no stand-in for {path}"})
+
+        # ── 서비스 ──────────────────────────────
+
+        def _rss(self, method, path, params, body):
+            if state.enter("rss"):
+                return self._send(503, b"Service Unavailable", "text/plain")
+            match = re.fullmatch(r"(\d+)\.xml", path)
+            if not match or int(match[1]) >= state.corpus.n_feeds:
+                return self._send(404, b"Not Found", "text/plain")
+            content = state.feed(int(match[1]))
+            etag = '"%s"' % hashlib.md5(content).hexdigest()
+            if self.headers.get("If-None-Match") == etag:
+                return self._send(304, b"", headers={"ETag": etag})
+            self._send(200, content, "application/rss+xml; charset=utf-8", {"ETag": etag}, service="rss")
+
+        def _google(self, method, path, params, body):
+            if state.enter("google"):
+                return self._send(503, b"Service Unavailable", "text/plain")
+            query = dict(params).get("q", "")
+            self._send(200, state.corpus.google_news(query), "application/xml; charset=utf-8", service="google")
+
+        def _newsapi(self, method, path, params, body):
+            if state.enter("newsapi"):
+                return self._send(503, {"status": "error", "code": "unexpectedError", "message": "stand-in error"})
+            query = dict(params)
+            page_size = int(query.get("pageSize", 100))
+            self._send(200, state.corpus.newsapi(query.get("q", ""), page_size), service="newsapi")
+
+        def _groq(self, method, path, params, body):
+            limits = {
+                "x-ratelimit-limit-requests": "14400", "x-ratelimit-remaining-requests": "14000",
+                "x-ratelimit-reset-requests": "6s", "x-ratelimit-limit-tokens": "300000",
+                "x-ratelimit-remaining-tokens": "290000", "x-ratelimit-reset-tokens": "2s",
+            }
+            if state.enter("groq"):
+                return self._send(
+                    429, {"error": {"message": "Rate limit reached", "type": "tokens", "code": "rate_limit_exceeded"}},
+                    headers={**limits, "retry-after": "1"},
+                )
+            prompt = "".join(m.get("content", "") for m in body.get("messages", []))
+            model = body.get("model", "")
+            text = groq_answer(prompt)
+            prompt_tokens, completion_tokens = _estimate_tokens(prompt), _estimate_tokens(text)
+            usage = {
+                "prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+                "prompt_tokens_details": {
+                    "cached_tokens": _estimate_tokens(prompt[:state.cached_chars(model, prompt)]),
+                },
+            }
+            tps = MODEL_TPS.get(model, DEFAULT_TPS)
+            created = int(time.time())
+            completion_id = "chatcmpl-" + hashlib.sha1(f"{prompt}{time.time()}".encode()).hexdigest()[:24]
+
+            if not body.get("stream"):
+                state.sleep(completion_tokens / tps)
+                return self._send(200, {
+                    "id": completion_id, "object": "chat.completion", "created": created, "model": model,
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                    "usage": usage, "x_groq": {"id": completion_id},
+                }, headers=limits, service="groq")
+
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Connection", "close")
+            for name, value in limits.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.close_connection = True
+
+            def event(delta: Dict, finish: str = None, extra: Dict = None) -> None:
+                chunk = {
+                    "id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                    "choices": [{"index": 0, "delta": delta, "finish_reason": finish}], **(extra or {}),
+                }
+                data = f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode("utf-8")
+                self.wfile.write(data)
+                self.wfile.flush()
+                with state._lock:
+                    state.bytes_out["groq"] += len(data)
+
+            event({"role": "assistant", "content": ""})
+            for start in range(0, len(text), STREAM_PIECE_CHARS):
+                piece = text[start:start + STREAM_PIECE_CHARS]
+                state.sleep(_estimate_tokens(piece) / tps)
+                event({"content": piece})
+            event({}, "stop", {"x_groq": {"id": completion_id, "usage": usage}})
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+
+        def _supabase(self, method, path, params, body):
+            if state.enter("supabase"):
+                return self._send(503, {"message": "stand-in error", "code": "503"})
+            rpc = re.fullmatch(r"rest/v1/rpc/(\w+)", path)
+            if rpc:
+                result = state.tables.rpc(rpc[1], body or {})
+                if result is None:
+                    return self._send(404, {"code": "PGRST202", "message": f"Could not find the function public.{rpc[1]}"})
+                return self._send(200, result, service="supabase")
+            match = re.fullmatch(r"rest/v1/(\w+)", path)
+            if not match:
+                return self._send(404, {"message": f"unknown path {path}"})
+            table = match[1]
+            prefer = self.headers.get("Prefer", "")
+            if method == "GET":
+                rows = state.tables.select(table, params)
+            elif method == "POST":
+                rows = state.tables.insert(table, body, params, merge="merge-duplicates" in prefer)
+            elif method == "PATCH":
+                rows = state.tables.update(table, body, params)
+            else:
+                rows = state.tables.delete(table, params)
+            status = 201 if method == "POST" else 200
+            if method != "GET" and "return=representation" not in prefer:
+                rows = []
+            headers = {"Content-Range": f"0-{max(len(rows) - 1, 0)}/{len(rows)}"}
+            self._send(status, rows, headers=headers, service="supabase")
+
+        def _slack(self, method, path, params, body):
+            if state.enter("slack"):
+                return self._send(429, {"ok": False, "error": "ratelimited"}, headers={"Retry-After": "1"})
+            api_method = path.rsplit("/", 1)[-1]
+            body = body or {}
+            if "Alchemy Error" in str(body.get("text", "")):
+                with state._lock:
+                    state.notifications.append(body.get("text"))
+            ts = f"{time.time():.6f}"
+            response = {"ok": True, "channel": "C0BENCH", "ts": body.get("ts") or ts}
+            if api_method == "chat.postMessage":
+                response["message"] = {"text": body.get("text", ""), "ts": ts}
+            self._send(200, response, service="slack")
+
+    return Handler
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # 스트리밍 파서가 필요한 entry 만 읽고 끊는 것은 정상 동작
+        if not isinstance(sys.exc_info()[1], (ConnectionError, TimeoutError)):
+            super().handle_error(request, client_address)
+
+
+def serve(corpus_params: Dict, latency_ms: Dict, error_rate: Dict, time_scale: float, ready) -> None:
+    """stand-in 서버 실행 (별도 프로세스 진입점) — 포트를 ready 큐로 알린다"""
+    state = StandIn(corpus_params, latency_ms, error_rate, time_scale)
+    for index in range(state.corpus.n_feeds):
+        state.feed(index)  # 피드 XML 은 미리 만들어 두어 측정 중 서버 CPU 를 쓰지 않게
+    server = _Server(("127.0.0.1", 0), _handler(state))
+    ready.put(server.server_address[1])
+    server.serve_forever()
+
+
+def start_server(corpus: Corpus, latency_ms: Dict = None, error_rate: Dict = None, time_scale: float = 1.0) -> tuple:
+    """(프로세스, base URL)"""
+    ctx = multiprocessing.get_context("spawn")
+    ready = ctx.Queue()
+    process = ctx.Process(
+        target=serve, args=(corpus.params(), latency_ms or {}, error_rate or {}, time_scale, ready), daemon=True,
+    )
+    process.start()
+    port = ready.get(timeout=600)
+    return process, f"http://127.0.0.1:{port}"
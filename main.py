@@ -14,7 +14,10 @@ def notify_error(job_name: str, error: Exception):
     """에러 발생 시 Slack DM으로 알림"""
     try:
         from slack_sdk import WebClient
-        client = WebClient(token=os.environ["SLACK_BOT_TOKEN"])
+        client = WebClient(
+            token=os.environ["SLACK_BOT_TOKEN"],
+            base_url=os.environ.get("SLACK_API_URL", WebClient.BASE_URL),
+        )
         channel = os.environ.get("SLACK_CHANNEL_DAILY", "1_daily_briefing")
         error_msg = f"```{traceback.format_exc()[-500:]}```"
         client.chat_postMessage(
@@ -29,138 +32,265 @@ def notify_error(job_name: str, error: Exception):
         print(f"Failed to send error notification: {error}")
 
 
+def save_batch(checkpoint, kind: str, items: list, upsert) -> None:
+    """아직 저장 기록이 없는 항목만 한 번에 upsert 하고 항목별 DB id 를 checkpoint 에 기록"""
+    from src.collector.urls import url_key
+
+    saved = checkpoint.progress("save")
+    pending = [item for item in items if f"{kind}:{item.get('url', '')}" not in saved]
+    if not pending:
+        return
+    ids = {row.get("url_key"): row.get("id") for row in upsert(pending)}
+    for item in pending:
+        checkpoint.record("save", f"{kind}:{item.get('url', '')}", ids.get(url_key(item)))
+
+
 def load_config():
-    """설정 파일 로드"""
+    """설정 파일 로드 (ALCHEMY_CONFIG_DIR 로 sources.yml 위치 변경 가능)"""
     base_dir = os.path.dirname(os.path.abspath(__file__))
+    config_dir = os.environ.get("ALCHEMY_CONFIG_DIR") or os.path.join(base_dir, "config")
 
-    with open(os.path.join(base_dir, "config", "sources.yml"), "r") as f:
+    with open(os.path.join(config_dir, "sources.yml"), "r") as f:
         sources_config = yaml.safe_load(f)
 
     return sources_config
 
 
-def run_daily_briefing():
-    """매일 오전 06:30 — Daily Briefing"""
+def run_daily_briefing(stream: bool = None, resume: bool = False):
+    """매일 오전 06:30 — Daily Briefing
+
+    뉴스 브랜치와 아티클 브랜치는 Slack 전송 전까지 서로의 데이터를 쓰지 않으므로
+    Stage 그래프로 동시에 실행한다 (수집, Supabase 조회, 뉴스 LLM ↔ 아티클 에이전트).
+
+    stream=True 면 LLM 응답을 스트리밍으로 받아 뉴스/카드가 완성되는 대로 Slack 에 올린다.
+    stream 을 주지 않으면(스케줄러) ALCHEMY_STREAM_SLACK 환경 변수를 따른다 (기본 0 = 끔).
+    단계 결과는 .alchemy/runs/<날짜>-daily/ 에 저장되며, resume=True 면 실패한 단계부터 이어서 한다.
+    """
     from src.collector.news import collect_all_news
     from src.collector.articles import collect_all_articles
+    from src.collector.urls import exclude_seen
     from src.curator.summarizer import init_model, select_and_summarize_news, select_and_summarize_articles
-    from src.curator.preferences import get_supabase_client, save_article, save_news, get_excluded_topics, get_recent_urls
-    from src.bot.slack import send_daily_briefing
+    from src.curator.llm_cache import cache_stats
+    from src.curator.routing import print_telemetry
+    from src.curator.preferences import (
+        get_supabase_client, save_articles, save_news_items, get_excluded_topics, get_recent_urls, get_weekly_stats,
+    )
+    from src.bot.slack import send_daily_briefing, DailyBriefingStream
+    from src.pipeline import Stage, run_stages
+    from src.checkpoint import Checkpoint
+
+    if stream is None:
+        stream = os.environ.get("ALCHEMY_STREAM_SLACK", "0") not in ("0", "false", "off", "")
 
     try:
         print(f"[{datetime.now()}] Starting daily briefing...")
 
         config = load_config()
+        checkpoint = Checkpoint("daily", resume=resume)
 
         # 1. 수집
-        print("Collecting news...")
-        news_keywords = config.get("news_keywords", [])
-        raw_news = collect_all_news(
-            api_key=os.environ.get("NEWS_API_KEY", ""),
-            keywords=news_keywords,
-        )
-        print(f"  Collected {len(raw_news)} news articles")
-
-        print("Collecting deep read articles...")
-        raw_articles = collect_all_articles()
-        print(f"  Collected {len(raw_articles)} articles")
+        def collect_news():
+            raw_news = collect_all_news(
+                api_key=os.environ.get("NEWS_API_KEY", ""),
+                keywords=config.get("news_keywords", []),
+                request_budget=config.get("news_request_budget"),
+            )
+            print(f"  Collected {len(raw_news)} news articles")
+            return raw_news
+
+        def collect_articles():
+            raw_articles = collect_all_articles()
+            print(f"  Collected {len(raw_articles)} articles")
+            return raw_articles
+
+        def connect_supabase():
+            return get_supabase_client(
+                os.environ["SUPABASE_URL"],
+                os.environ["SUPABASE_KEY"],
+            )
 
         # 1.5. 중복 제거 (최근 7일 추천된 URL 제외)
-        supabase = get_supabase_client(
-            os.environ["SUPABASE_URL"],
-            os.environ["SUPABASE_KEY"],
-        )
-        recent_urls = get_recent_urls(supabase, days=7)
-        if recent_urls:
-            raw_news = [n for n in raw_news if n.get("url") not in recent_urls]
-            raw_articles = [a for a in raw_articles if a.get("url") not in recent_urls]
-            print(f"  After dedup: {len(raw_news)} news, {len(raw_articles)} articles")
+        def dedup_news(raw_news, recent_urls):
+            news = exclude_seen(raw_news, recent_urls)
+            print(f"  After dedup: {len(news)} news")
+            return news
+
+        def dedup_articles(raw_articles, recent_urls):
+            articles = exclude_seen(raw_articles, recent_urls)
+            print(f"  After dedup: {len(articles)} articles")
+            return articles
+
+        def load_excluded(supabase):
+            excluded = get_excluded_topics(supabase)
+            if excluded:
+                print(f"  Excluding topics: {excluded}")
+            return excluded
 
         # 2. AI 선별 + 요약
-        print("Curating with Groq...")
-        model = init_model(os.environ["GROQ_API_KEY"])
-
-        excluded = get_excluded_topics(supabase)
-        if excluded:
-            print(f"  Excluding topics: {excluded}")
-
-        selected_news = select_and_summarize_news(model, raw_news, count=5)
-        print(f"  Selected {len(selected_news)} news")
-
-        # ⭐ 아티클을 Connector 에이전트에 전달 (개인화 강화)
-        from src.curator.preferences import get_weekly_stats
-        stats = get_weekly_stats(supabase)
-        starred = stats.get("starred_articles", [])
-
-        selected_articles = select_and_summarize_articles(
-            model, raw_articles, count=3,
-            excluded_topics=excluded, starred_articles=starred
-        )
-        print(f"  Selected {len(selected_articles)} deep reads")
-
-        # 3. DB 저장
-        print("Saving to database...")
-        for news in selected_news:
-            save_news(supabase, news)
-        for article in selected_articles:
-            save_article(supabase, article, briefing_type="daily")
-
-        # 4. Slack 전송
-        print("Sending to Slack...")
-        send_daily_briefing(selected_news, selected_articles)
-
+        def record_sent(key, ts):
+            checkpoint.record("send", key, ts)
+
+        def open_stream():
+            stream_sender = DailyBriefingStream(on_sent=record_sent)
+            stream_sender.start()
+            return stream_sender
+
+        def curate_news(model, news, slack_stream=None):
+            selected_news = select_and_summarize_news(
+                model, news, count=5, on_item=slack_stream.add_news if slack_stream else None,
+            )
+            if slack_stream:
+                slack_stream.finish_news(selected_news)
+            print(f"  Selected {len(selected_news)} news")
+            return selected_news
+
+        def curate_articles(model, articles, excluded, stats, slack_stream=None):
+            # ⭐ 아티클을 Connector 에이전트에 전달 (개인화 강화)
+            selected_articles = select_and_summarize_articles(
+                model, articles, count=3,
+                excluded_topics=excluded, starred_articles=stats.get("starred_articles", []),
+                on_card=slack_stream.add_article if slack_stream else None,
+            )
+            print(f"  Selected {len(selected_articles)} deep reads")
+            return selected_articles
+
+        # 3. DB 저장 (테이블당 upsert 1회 — 브리핑 키 덕분에 재실행해도 중복 행 없음)
+        def save(supabase, selected_news, selected_articles):
+            print("Saving to database...")
+            save_batch(checkpoint, "news", selected_news, lambda items: save_news_items(
+                supabase, items, briefing_type="daily", briefing_date=checkpoint.date,
+            ))
+            save_batch(checkpoint, "article", selected_articles, lambda items: save_articles(
+                supabase, items, briefing_type="daily", briefing_date=checkpoint.date,
+            ))
+            return checkpoint.progress("save")
+
+        # 4. Slack 전송 (메시지 ts 를 기록해 재실행 시 이미 보낸 메시지는 건너뜀)
+        def send(selected_news, selected_articles, save):
+            print("Sending to Slack...")
+            send_daily_briefing(
+                selected_news, selected_articles, sent=checkpoint.progress("send"), on_sent=record_sent,
+            )
+            return checkpoint.progress("send")
+
+        def finish_stream(slack_stream, selected_news, selected_articles):
+            slack_stream.finish(selected_articles)
+            return checkpoint.progress("send")
+
+        # 스트리밍 전송 중 실패했다면 이어서 할 때는 남은 메시지만 일반 전송으로 보낸다
+        if stream and not resume:
+            curation = [
+                Stage("slack_stream", lambda news, articles: open_stream(), ["news", "articles"]),
+                Stage("selected_news", curate_news, ["model", "news", "slack_stream"], persist=True),
+                Stage("selected_articles", curate_articles, ["model", "articles", "excluded", "stats", "slack_stream"],
+                      persist=True),
+                Stage("save", save, ["supabase", "selected_news", "selected_articles"], persist=True),
+                Stage("send", finish_stream, ["slack_stream", "selected_news", "selected_articles"], persist=True),
+            ]
+        else:
+            curation = [
+                Stage("selected_news", curate_news, ["model", "news"], persist=True),
+                Stage("selected_articles", curate_articles, ["model", "articles", "excluded", "stats"], persist=True),
+                Stage("save", save, ["supabase", "selected_news", "selected_articles"], persist=True),
+                Stage("send", send, ["selected_news", "selected_articles", "save"], persist=True),
+            ]
+
+        run_stages([
+            Stage("raw_news", collect_news, persist=True),
+            Stage("raw_articles", collect_articles, persist=True),
+            Stage("supabase", connect_supabase),
+            Stage("model", lambda: init_model(os.environ["GROQ_API_KEY"])),
+            Stage("recent_urls", lambda supabase: get_recent_urls(supabase, days=7), ["supabase"], persist=True),
+            Stage("excluded", load_excluded, ["supabase"], persist=True),
+            Stage("stats", lambda supabase: get_weekly_stats(supabase), ["supabase"], persist=True),
+            Stage("news", dedup_news, ["raw_news", "recent_urls"], persist=True),
+            Stage("articles", dedup_articles, ["raw_articles", "recent_urls"], persist=True),
+            *curation,
+        ], checkpoint=checkpoint)
+
+        print(f"  LLM cache: {cache_stats()}")
+        print_telemetry()
         print(f"[{datetime.now()}] Daily briefing complete!")
 
     except Exception as e:
         print(f"Daily briefing error: {e}")
+        print("  Resume from the failed stage with: python main.py daily --resume")
         notify_error("Daily Briefing", e)
 
 
-def run_weekend_deep_dive():
-    """토요일 오전 06:30 — Weekend Deep Dive"""
+def run_weekend_deep_dive(resume: bool = False):
+    """토요일 오전 06:30 — Weekend Deep Dive
+
+    아티클 선별(3-에이전트)과 주간 연결고리 생성은 서로 독립이라 동시에 실행한다.
+    resume=True 면 .alchemy/runs/<날짜>-weekend/ 에 저장된 단계부터 이어서 한다.
+    """
     from src.collector.articles import collect_all_articles
+    from src.collector.urls import exclude_seen
     from src.curator.summarizer import init_model
-    from src.curator.preferences import get_supabase_client, save_article, get_excluded_topics, get_weekly_stats, get_recent_urls
+    from src.curator.llm_cache import cache_stats
+    from src.curator.routing import print_telemetry
+    from src.curator.preferences import get_supabase_client, save_articles, get_weekly_stats, get_recent_urls
     from src.reporter.weekly import generate_weekend_articles, generate_weekly_connection
     from src.bot.slack import send_weekend_deep_dive
+    from src.pipeline import Stage, run_stages
+    from src.checkpoint import Checkpoint
 
     try:
         print(f"[{datetime.now()}] Starting weekend deep dive...")
+        checkpoint = Checkpoint("weekend", resume=resume)
 
-        # 1. 수집 (48시간으로 확대)
-        raw_articles = collect_all_articles()
-
-        # 2. AI 선별
-        model = init_model(os.environ["GROQ_API_KEY"])
-        supabase = get_supabase_client(
-            os.environ["SUPABASE_URL"],
-            os.environ["SUPABASE_KEY"],
-        )
+        def connect_supabase():
+            return get_supabase_client(
+                os.environ["SUPABASE_URL"],
+                os.environ["SUPABASE_KEY"],
+            )
 
         # 중복 제거
-        recent_urls = get_recent_urls(supabase, days=7)
-        if recent_urls:
-            raw_articles = [a for a in raw_articles if a.get("url") not in recent_urls]
-            print(f"  After dedup: {len(raw_articles)} articles")
-
-        excluded = get_excluded_topics(supabase)
-        selected_articles = generate_weekend_articles(model, raw_articles, count=3)
-
-        # 3. 주간 연결고리 생성
-        stats = get_weekly_stats(supabase)
-        weekly_connection = generate_weekly_connection(model, stats.get("starred_articles", []))
+        def dedup_articles(raw_articles, recent_urls):
+            articles = exclude_seen(raw_articles, recent_urls)
+            print(f"  After dedup: {len(articles)} articles")
+            return articles
 
         # 4. DB 저장
-        for article in selected_articles:
-            save_article(supabase, article, briefing_type="weekend")
+        def save(supabase, selected_articles):
+            save_batch(checkpoint, "article", selected_articles, lambda items: save_articles(
+                supabase, items, briefing_type="weekend", briefing_date=checkpoint.date,
+            ))
+            return checkpoint.progress("save")
 
         # 5. Slack 전송
-        send_weekend_deep_dive(selected_articles, weekly_connection)
-
+        def send(selected_articles, weekly_connection, save):
+            send_weekend_deep_dive(
+                selected_articles, weekly_connection,
+                sent=checkpoint.progress("send"), on_sent=lambda key, ts: checkpoint.record("send", key, ts),
+            )
+            return checkpoint.progress("send")
+
+        run_stages([
+            # 1. 수집 (48시간으로 확대)
+            Stage("raw_articles", collect_all_articles, persist=True),
+            Stage("supabase", connect_supabase),
+            Stage("model", lambda: init_model(os.environ["GROQ_API_KEY"])),
+            Stage("recent_urls", lambda supabase: get_recent_urls(supabase, days=7), ["supabase"], persist=True),
+            Stage("stats", lambda supabase: get_weekly_stats(supabase), ["supabase"], persist=True),
+            Stage("articles", dedup_articles, ["raw_articles", "recent_urls"], persist=True),
+            # 2. AI 선별
+            Stage("selected_articles", lambda model, articles: generate_weekend_articles(model, articles, count=3),
+                  ["model", "articles"], persist=True),
+            # 3. 주간 연결고리 생성
+            Stage("weekly_connection", lambda model, stats: generate_weekly_connection(model, stats.get("starred_articles", [])),
+                  ["model", "stats"], persist=True),
+            Stage("save", save, ["supabase", "selected_articles"], persist=True),
+            Stage("send", send, ["selected_articles", "weekly_connection", "save"], persist=True),
+        ], checkpoint=checkpoint)
+
+        print(f"  LLM cache: {cache_stats()}")
+        print_telemetry()
         print(f"[{datetime.now()}] Weekend deep dive complete!")
 
     except Exception as e:
         print(f"Weekend deep dive error: {e}")
+        print("  Resume from the failed stage with: python main.py weekend --resume")
         notify_error("Weekend Deep Dive", e)
 
 
@@ -176,6 +306,13 @@ def run_weekly_report():
         notify_error("Weekly Report", e)
 
 
+def run_backfill_url_key():
+    """migrations/004_url_key.sql 이후 한 번 — 이전 행의 url_key 를 정규 URL 로"""
+    from src.curator.preferences import get_supabase_client, backfill_url_keys
+    supabase = get_supabase_client(os.environ["SUPABASE_URL"], os.environ["SUPABASE_KEY"])
+    print(f"url_key backfill: {backfill_url_keys(supabase)} rows updated")
+
+
 def run_server():
     """Flask 서버 + 스케줄러 동시 실행 (Railway 배포용)"""
     import threading
@@ -195,19 +332,26 @@ def run_server():
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        print("Usage: python main.py [daily|weekend|weekly|server]")
+        print("Usage: python main.py [daily|weekend|weekly|server|backfill-url-key] [--no-cache] [--stream] [--resume]")
         sys.exit(1)
 
     command = sys.argv[1]
+    flags = sys.argv[2:]
+
+    if "--no-cache" in flags:
+        from src.curator.llm_cache import set_enabled
+        set_enabled(False)
 
     if command == "daily":
-        run_daily_briefing()
+        run_daily_briefing(stream=True if "--stream" in flags else None, resume="--resume" in flags)
     elif command == "weekend":
-        run_weekend_deep_dive()
+        run_weekend_deep_dive(resume="--resume" in flags)
     elif command == "weekly":
         run_weekly_report()
     elif command == "server":
         run_server()
+    elif command == "backfill-url-key":
+        run_backfill_url_key()
     else:
         print(f"Unknown command: {command}")
         sys.exit(1)
@@ -0,0 +1,32 @@
+-- 001: 브리핑 단위 upsert 키 — (url, briefing_date, briefing_type)
+-- Supabase Dashboard → SQL Editor에서 실행 (여러 번 실행해도 안전)
+--
+-- save_articles / save_news 가 한 번의 upsert 로 실행분 전체를 저장한다.
+-- 같은 날 같은 브리핑을 다시 실행해도 행이 늘지 않는다.
+
+-- 아티클: 브리핑 날짜 (KST 기준 실행일)
+ALTER TABLE articles ADD COLUMN IF NOT EXISTS briefing_date DATE;
+UPDATE articles SET briefing_date = (created_at AT TIME ZONE 'Asia/Seoul')::date WHERE briefing_date IS NULL;
+ALTER TABLE articles ALTER COLUMN briefing_date SET DEFAULT (NOW() AT TIME ZONE 'Asia/Seoul')::date;
+ALTER TABLE articles ALTER COLUMN briefing_date SET NOT NULL;
+UPDATE articles SET briefing_type = 'daily' WHERE briefing_type IS NULL;
+ALTER TABLE articles ALTER COLUMN briefing_type SET NOT NULL;
+
+-- 뉴스: 브리핑 종류 + 날짜
+ALTER TABLE news ADD COLUMN IF NOT EXISTS briefing_type TEXT DEFAULT 'daily';
+ALTER TABLE news ADD COLUMN IF NOT EXISTS briefing_date DATE;
+UPDATE news SET briefing_type = 'daily' WHERE briefing_type IS NULL;
+UPDATE news SET briefing_date = (created_at AT TIME ZONE 'Asia/Seoul')::date WHERE briefing_date IS NULL;
+ALTER TABLE news ALTER COLUMN briefing_type SET NOT NULL;
+ALTER TABLE news ALTER COLUMN briefing_date SET DEFAULT (NOW() AT TIME ZONE 'Asia/Seoul')::date;
+ALTER TABLE news ALTER COLUMN briefing_date SET NOT NULL;
+
+-- 재실행으로 이미 생긴 중복 행 정리 (가장 먼저 저장된 행만 남김)
+DELETE FROM articles a USING articles b
+ WHERE a.url = b.url AND a.briefing_date = b.briefing_date AND a.briefing_type = b.briefing_type AND a.id > b.id;
+DELETE FROM news a USING news b
+ WHERE a.url = b.url AND a.briefing_date = b.briefing_date AND a.briefing_type = b.briefing_type AND a.id > b.id;
+
+-- PostgREST on_conflict 대상 (부분 인덱스가 아니어야 한다)
+CREATE UNIQUE INDEX IF NOT EXISTS uq_articles_briefing ON articles(url, briefing_date, briefing_type);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_news_briefing ON news(url, briefing_date, briefing_type);
@@ -0,0 +1,37 @@
+-- 002: 주간 통계 RPC — 상태/Axis 집계와 ⭐ 목록을 DB 에서 한 번에 계산
+-- Supabase Dashboard → SQL Editor에서 실행 (여러 번 실행해도 안전)
+--
+-- get_weekly_stats 가 supabase.rpc("weekly_stats", {"since": ...}) 로 호출한다.
+-- 긴 본문 컬럼(why_new, why_read ...)은 읽지 않으므로 응답 크기는 건수에만 비례한다.
+
+CREATE OR REPLACE FUNCTION weekly_stats(since TIMESTAMPTZ DEFAULT NOW() - INTERVAL '7 days')
+RETURNS JSON
+LANGUAGE sql
+STABLE
+AS $$
+    WITH week AS (
+        SELECT status, axis_name, title, url, new_concept_name, created_at
+        FROM articles
+        WHERE created_at >= since
+    )
+    SELECT json_build_object(
+        'total',    (SELECT COUNT(*) FROM week),
+        'starred',  (SELECT COUNT(*) FROM week WHERE status = 'starred'),
+        'archived', (SELECT COUNT(*) FROM week WHERE status = 'archived'),
+        'skipped',  (SELECT COUNT(*) FROM week WHERE status = 'skipped'),
+        'axis_counts', COALESCE(
+            (SELECT json_object_agg(axis, n)
+               FROM (SELECT COALESCE(axis_name, 'Unknown') AS axis, COUNT(*) AS n FROM week GROUP BY 1) counts),
+            '{}'::json
+        ),
+        'starred_articles', COALESCE(
+            (SELECT json_agg(json_build_object(
+                        'title', title, 'url', url, 'axis_name', axis_name, 'new_concept_name', new_concept_name
+                    ) ORDER BY created_at)
+               FROM week WHERE status = 'starred'),
+            '[]'::json
+        )
+    );
+$$;
+
+GRANT EXECUTE ON FUNCTION weekly_stats(TIMESTAMPTZ) TO anon, authenticated, service_role;
@@ -0,0 +1,34 @@
+-- 003: 조회 경로 인덱스 + URL 해시 컬럼
+-- Supabase Dashboard → SQL Editor에서 실행 (여러 번 실행해도 안전)
+--
+-- 인덱스마다 쓰는 쿼리를 적어 둔다. python -m bench.pg_plans 가 각 쿼리의 EXPLAIN 으로
+-- 이 인덱스를 (가능하면 Index Only Scan 으로) 타는지 확인한다.
+
+-- URL 해시: 긴 URL 대신 고정 길이 32자 키로 조회 (Slack 리액션 → Notion, 피드백 상태 갱신, 👎 패턴)
+ALTER TABLE articles ADD COLUMN IF NOT EXISTS url_hash TEXT GENERATED ALWAYS AS (md5(url)) STORED;
+ALTER TABLE news ADD COLUMN IF NOT EXISTS url_hash TEXT GENERATED ALWAYS AS (md5(url)) STORED;
+CREATE INDEX IF NOT EXISTS idx_articles_url_hash ON articles(url_hash);
+CREATE INDEX IF NOT EXISTS idx_news_url_hash ON news(url_hash);
+
+-- seen-URL 색인 증분 동기화: WHERE created_at >= 커서 ORDER BY created_at → url 까지 인덱스에서
+CREATE INDEX IF NOT EXISTS idx_news_created_at_url ON news(created_at) INCLUDE (url);
+CREATE INDEX IF NOT EXISTS idx_articles_created_at_url ON articles(created_at) INCLUDE (url);
+
+-- 상태별 최근 아티클 (⭐ 목록, 상태 집계): WHERE status = ? AND created_at >= ?
+CREATE INDEX IF NOT EXISTS idx_articles_status_created_at ON articles(status, created_at);
+
+-- 피드백: URL 로 조회 / 👎 최근 N일 (get_excluded_topics) 은 article_url 까지 인덱스에서
+CREATE INDEX IF NOT EXISTS idx_feedback_article_url ON feedback(article_url);
+CREATE INDEX IF NOT EXISTS idx_feedback_reaction_created_at ON feedback(reaction, created_at) INCLUDE (article_url);
+
+-- 위 인덱스로 대체된 단일 컬럼 인덱스
+-- (url 직접 조회는 001 의 uq_articles_briefing / uq_news_briefing 이 url 을 선두 컬럼으로 가지므로 그것을 탄다)
+DROP INDEX IF EXISTS idx_articles_url;            -- uq_articles_briefing 의 선두 컬럼
+DROP INDEX IF EXISTS idx_articles_status;         -- idx_articles_status_created_at 의 선두 컬럼
+DROP INDEX IF EXISTS idx_articles_created_at;     -- idx_articles_created_at_url
+DROP INDEX IF EXISTS idx_feedback_reaction;       -- idx_feedback_reaction_created_at
+DROP INDEX IF EXISTS idx_feedback_created_at;     -- 날짜만으로 feedback 을 읽는 쿼리 없음 (👎 창은 위 복합 인덱스)
+
+ANALYZE articles;
+ANALYZE news;
+ANALYZE feedback;
@@ -0,0 +1,45 @@
+-- 004: 원문 링크(url)와 비교 키(url_key) 분리
+-- Supabase Dashboard → SQL Editor에서 실행 (여러 번 실행해도 안전)
+--
+-- url 에는 Slack 에 게시한 원문 링크를 그대로 저장하고, 중복 제거·upsert 키·URL 해시 조회는
+-- canonical_url(url) 인 url_key 로 한다.
+--
+-- 이전 행의 url 은 피드 원문 링크(utm_*, 끝 슬래시, http 등이 남은)라 정규 URL 이 아니다.
+-- 여기서는 컬럼을 채우기 위해 url_key = url 로 두고, 실행 후 정규 URL 로 다시 채운다:
+--   python main.py backfill-url-key
+-- (그 전까지도 URL 조회는 원본 해시를 함께 보므로 이전 행을 찾는다)
+
+ALTER TABLE articles ADD COLUMN IF NOT EXISTS url_key TEXT;
+UPDATE articles SET url_key = url WHERE url_key IS NULL;
+ALTER TABLE articles ALTER COLUMN url_key SET NOT NULL;
+
+ALTER TABLE news ADD COLUMN IF NOT EXISTS url_key TEXT;
+UPDATE news SET url_key = url WHERE url_key IS NULL;
+ALTER TABLE news ALTER COLUMN url_key SET NOT NULL;
+
+-- url_hash 를 md5(url) → md5(url_key) 로 (생성식은 바꿀 수 없어 컬럼을 다시 만든다, 인덱스도 함께)
+DO $$
+DECLARE t TEXT;
+BEGIN
+    FOREACH t IN ARRAY ARRAY['articles', 'news'] LOOP
+        IF NOT EXISTS (
+            SELECT 1 FROM information_schema.columns
+             WHERE table_schema = current_schema() AND table_name = t AND column_name = 'url_hash'
+               AND generation_expression LIKE '%url_key%'
+        ) THEN
+            EXECUTE format('ALTER TABLE %I DROP COLUMN IF EXISTS url_hash', t);
+            EXECUTE format('ALTER TABLE %I ADD COLUMN url_hash TEXT GENERATED ALWAYS AS (md5(url_key)) STORED', t);
+        END IF;
+    END LOOP;
+END $$;
+CREATE INDEX IF NOT EXISTS idx_articles_url_hash ON articles(url_hash);
+CREATE INDEX IF NOT EXISTS idx_news_url_hash ON news(url_hash);
+
+-- upsert 키 (PostgREST on_conflict=url_key,briefing_date,briefing_type)
+CREATE UNIQUE INDEX IF NOT EXISTS uq_articles_url_key ON articles(url_key, briefing_date, briefing_type);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_news_url_key ON news(url_key, briefing_date, briefing_type);
+DROP INDEX IF EXISTS uq_articles_briefing;
+DROP INDEX IF EXISTS uq_news_briefing;
+
+ANALYZE articles;
+ANALYZE news;
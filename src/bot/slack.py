@@ -2,6 +2,7 @@
 
 import os
 import re
+import threading
 from slack_bolt import App
 from slack_bolt.adapter.flask import SlackRequestHandler
 from flask import Flask, request
@@ -11,6 +12,7 @@ from src.bot.formatter import (
     format_single_article, format_weekend_header, format_weekly_report,
 )
 from src.curator.preferences import get_supabase_client, save_feedback
+from src.db import find_by_url
 
 
 def _save_to_notion(supabase, url: str, rating: str):
@@ -18,16 +20,16 @@ def _save_to_notion(supabase, url: str, rating: str):
     try:
         from src.vault.notion import add_article_to_vault, add_news_to_vault
 
-        # 아티클 테이블에서 먼저 검색
-        result = supabase.table("articles").select("*").eq("url", url).execute()
-        if result.data:
-            add_article_to_vault(result.data[0], rating)
+        # 아티클 테이블에서 먼저 검색 (같은 메시지의 동시 리액션은 조회 한 번)
+        rows = find_by_url(supabase, "articles", url)
+        if rows:
+            add_article_to_vault(rows[0], rating)
             return
 
         # 뉴스 테이블에서 검색
-        result = supabase.table("news").select("*").eq("url", url).execute()
-        if result.data:
-            add_news_to_vault(result.data[0], rating)
+        rows = find_by_url(supabase, "news", url)
+        if rows:
+            add_news_to_vault(rows[0], rating)
             return
 
         # DB에 없으면 최소 정보로 저장
@@ -36,9 +38,18 @@ def _save_to_notion(supabase, url: str, rating: str):
         print(f"Notion save error: {e}")
 
 
+def _web_client():
+    """전송용 Slack WebClient (SLACK_API_URL 로 API 엔드포인트 변경 가능 — 로컬 벤치마크용)"""
+    from slack_sdk import WebClient
+    return WebClient(
+        token=os.environ["SLACK_BOT_TOKEN"],
+        base_url=os.environ.get("SLACK_API_URL", WebClient.BASE_URL),
+    )
+
+
 def _post(client, channel, text, blocks):
     """공통 메시지 전송 — 링크 프리뷰 비활성화"""
-    client.chat_postMessage(
+    return client.chat_postMessage(
         channel=channel,
         text=text,
         blocks=blocks,
@@ -112,46 +123,165 @@ def create_slack_app():
     return app
 
 
-def send_daily_briefing(news: list, articles: list):
-    """데일리 브리핑 — 모든 콘텐츠 개별 메시지"""
-    from slack_sdk import WebClient
-    client = WebClient(token=os.environ["SLACK_BOT_TOKEN"])
+def _poster(client, channel, sent: dict = None, on_sent=None):
+    """메시지 키 단위로 한 번만 보내는 _post — sent 에 있는 키는 건너뛰고, 보낼 때마다 on_sent(키, ts)"""
+    sent = sent or {}
+
+    def post(key, text, blocks):
+        if key in sent:
+            return None
+        response = _post(client, channel, text, blocks)
+        if on_sent:
+            on_sent(key, response.get("ts") if response else None)
+        return response
+
+    return post
+
+
+def send_daily_briefing(news: list, articles: list, sent: dict = None, on_sent=None):
+    """데일리 브리핑 — 모든 콘텐츠 개별 메시지
+
+    sent: 이미 보낸 메시지 (키 → ts) — 재실행 시 이 메시지들은 다시 보내지 않는다
+    """
+    client = _web_client()
     channel = os.environ.get("SLACK_CHANNEL_DAILY", "1_daily_briefing")
+    post = _poster(client, channel, sent, on_sent)
 
     # 1. 헤더
-    _post(client, channel, "⚗️ ALCHEMY — Daily Briefing", format_daily_header())
+    post("header", "⚗️ ALCHEMY — Daily Briefing", format_daily_header())
 
     # 2. 뉴스 각각 개별 메시지
     for i, n in enumerate(news[:5]):
-        _post(client, channel, f"📡 {n.get('title', '')}", format_single_news(n, i))
+        post(f"news:{i}", f"📡 {n.get('title', '')}", format_single_news(n, i))
 
     # 3. Deep Read 섹션 헤더 (Connector의 관통하는 질문 포함)
     daily_connection = ""
     if articles and articles[0].get("daily_connection"):
         daily_connection = articles[0]["daily_connection"]
-    _post(client, channel, "📖 TODAY'S DEEP READ", format_deep_read_header(daily_connection))
+    post("deep_read", "📖 TODAY'S DEEP READ", format_deep_read_header(daily_connection))
 
     # 4. 아티클 각각 개별 메시지
     for i, article in enumerate(articles[:3]):
-        _post(client, channel, f"📖 {article.get('title', '')}", format_single_article(article, i))
+        post(f"article:{i}", f"📖 {article.get('title', '')}", format_single_article(article, i))
+
+
+class DailyBriefingStream:
+    """데일리 브리핑 스트리밍 전송 — LLM 이 아이템을 완성하는 대로 Slack 에 게시
+
+    뉴스와 아티클 큐레이션이 동시에 돌아도 채널 순서는 send_daily_briefing 과 같다:
+    헤더 → 뉴스 → Deep Read 헤더 → 아티클. 먼저 끝난 카드는 뉴스 섹션이 닫히고
+    앞 순번 카드가 모두 정해질 때까지 버퍼에 둔다. Connector 의 질문은 카드가 다 나온
+    뒤에야 생기므로 Deep Read 헤더를 먼저 올리고 finish() 에서 chat_update 로 채운다.
+    """
+
+    MAX_NEWS = 5
+    MAX_ARTICLES = 3
+
+    def __init__(self, client=None, channel: str = None, on_sent=None):
+        if client is None:
+            client = _web_client()
+        self.client = client
+        self.channel = channel or os.environ.get("SLACK_CHANNEL_DAILY", "1_daily_briefing")
+        self._lock = threading.Lock()
+        self._news_posted = 0
+        self._news_done = False
+        self._header = None       # Deep Read 헤더 (channel id, ts)
+        self._cards = {}          # 선별 순번 → 카드 (실패는 None)
+        self._next_card = 0
+        self._articles_posted = 0
+        self._on_sent = on_sent   # (메시지 키, ts) — send_daily_briefing 과 같은 키로 기록
+
+    def _send(self, key: str, text: str, blocks):
+        response = _post(self.client, self.channel, text, blocks)
+        if self._on_sent:
+            self._on_sent(key, response.get("ts") if response else None)
+        return response
+
+    def start(self):
+        self._send("header", "⚗️ ALCHEMY — Daily Briefing", format_daily_header())
+
+    def add_news(self, item: dict):
+        """뉴스 아이템 하나 완성 → 바로 게시"""
+        with self._lock:
+            if self._news_done or self._news_posted >= self.MAX_NEWS:
+                return
+            self._send(f"news:{self._news_posted}", f"📡 {item.get('title', '')}",
+                       format_single_news(item, self._news_posted))
+            self._news_posted += 1
+
+    def finish_news(self, news: list):
+        """뉴스 선별 종료 — 스트리밍에서 빠진 아이템을 채우고 Deep Read 헤더 게시"""
+        with self._lock:
+            self._close_news(news)
+
+    def _close_news(self, news: list):
+        for item in news[self._news_posted:self.MAX_NEWS]:
+            self._send(f"news:{self._news_posted}", f"📡 {item.get('title', '')}",
+                       format_single_news(item, self._news_posted))
+            self._news_posted += 1
+        self._news_done = True
+        response = self._send("deep_read", "📖 TODAY'S DEEP READ", format_deep_read_header(""))
+        # chat_update 는 채널 이름이 아니라 ID 가 필요하다
+        self._header = (response["channel"], response["ts"]) if response else None
+        self._flush_cards()
+
+    def add_article(self, index: int, card: dict = None):
+        """index 번째 카드 완성 (실패 시 None) → 순서가 되면 게시"""
+        with self._lock:
+            self._cards[index] = card
+            self._flush_cards()
+
+    def _flush_cards(self):
+        if not self._news_done:
+            return
+        while self._next_card in self._cards:
+            card = self._cards.pop(self._next_card)
+            self._next_card += 1
+            if card and self._articles_posted < self.MAX_ARTICLES:
+                self._send(f"article:{self._articles_posted}", f"📖 {card.get('title', '')}",
+                           format_single_article(card, self._articles_posted))
+                self._articles_posted += 1
+
+    def finish(self, articles: list):
+        """아티클 큐레이션 종료 — 남은 카드 게시 후 Deep Read 헤더에 연결 질문 반영"""
+        with self._lock:
+            if not self._news_done:
+                self._close_news([])
+            # 스트리밍 콜백 없이 끝난 경우(캐시 불일치 등)를 위해 순번 공백을 건너뛰고 마저 게시
+            for index in sorted(self._cards):
+                self._next_card = max(self._next_card, index)
+                self._flush_cards()
+            if not self._articles_posted:
+                for article in articles[:self.MAX_ARTICLES]:
+                    self._send(f"article:{self._articles_posted}", f"📖 {article.get('title', '')}",
+                               format_single_article(article, self._articles_posted))
+                    self._articles_posted += 1
+
+            daily_connection = articles[0].get("daily_connection", "") if articles else ""
+            if daily_connection and self._header:
+                self.client.chat_update(
+                    channel=self._header[0],
+                    ts=self._header[1],
+                    text="📖 TODAY'S DEEP READ",
+                    blocks=format_deep_read_header(daily_connection),
+                )
 
 
-def send_weekend_deep_dive(articles: list, weekly_connection: str = ""):
-    """Weekend Deep Dive — 헤더 + 아티클 각각 개별"""
-    from slack_sdk import WebClient
-    client = WebClient(token=os.environ["SLACK_BOT_TOKEN"])
+def send_weekend_deep_dive(articles: list, weekly_connection: str = "", sent: dict = None, on_sent=None):
+    """Weekend Deep Dive — 헤더 + 아티클 각각 개별 (sent/on_sent 는 send_daily_briefing 과 같다)"""
+    client = _web_client()
     channel = os.environ.get("SLACK_CHANNEL_WEEKEND", "2_weekend_read")
+    post = _poster(client, channel, sent, on_sent)
 
-    _post(client, channel, "📚 ALCHEMY — Weekend Deep Dive", format_weekend_header(weekly_connection))
+    post("header", "📚 ALCHEMY — Weekend Deep Dive", format_weekend_header(weekly_connection))
 
     for i, article in enumerate(articles[:3]):
-        _post(client, channel, f"📖 {article.get('title', '')}", format_single_article(article, i))
+        post(f"article:{i}", f"📖 {article.get('title', '')}", format_single_article(article, i))
 
 
 def send_weekly_report(stats: dict):
     """주간 리포트"""
-    from slack_sdk import WebClient
-    client = WebClient(token=os.environ["SLACK_BOT_TOKEN"])
+    client = _web_client()
     channel = os.environ.get("SLACK_CHANNEL_REPORT", "3_report")
 
     _post(client, channel, "📊 ALCHEMY — Weekly Report", format_weekly_report(stats))
@@ -0,0 +1,108 @@
+"""Run Checkpoint — 단계별 결과를 실행 디렉터리에 저장해 실패 지점부터 이어서 실행
+
+.alchemy/runs/<YYYY-MM-DD (KST)>-<job>/<stage>.json 에 Stage 결과를 저장한다. --resume 으로
+다시 실행하면 저장된 단계는 건너뛰고 그 결과를 그대로 쓴다 (src/pipeline.run_stages).
+
+DB 저장이나 Slack 전송처럼 부작용 여러 번으로 이뤄진 단계는 record() 로 항목별 진행
+상황(DB id, 메시지 ts)을 남겨, 중간에 실패해도 재실행 시 끝난 항목은 다시 하지 않는다.
+"""
+
+import os
+import shutil
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from src.state import state_path, load_json, save_json
+
+
+RUNS_DIR = "runs"
+KEEP_DAYS = 7
+KST = timezone(timedelta(hours=9), "KST")   # 서머타임 없음
+
+
+def briefing_date() -> str:
+    """오늘 브리핑 날짜 (KST) — DB briefing_date 기본값과 같은 기준
+
+    스케줄러는 UTC 21:30(= KST 06:30)에 돌므로 서버 시각으로 날짜를 잡으면 전날이 된다.
+    """
+    return datetime.now(KST).strftime("%Y-%m-%d")
+
+
+def _encode(value):
+    """JSON 으로 못 쓰는 set 을 표시해 두고 저장"""
+    if isinstance(value, (set, frozenset)):
+        return {"__set__": sorted(value, key=str)}
+    if isinstance(value, dict):
+        return {k: _encode(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode(v) for v in value]
+    return value
+
+
+def _decode(value):
+    if isinstance(value, dict):
+        if set(value) == {"__set__"}:
+            return set(value["__set__"])
+        return {k: _decode(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_decode(v) for v in value]
+    return value
+
+
+class Checkpoint:
+    """작업 하나(daily/weekend)의 하루치 실행 디렉터리"""
+
+    def __init__(self, job: str, date: str = None, resume: bool = False):
+        self.job = job
+        self.date = date or briefing_date()
+        self.dir = os.path.dirname(state_path(RUNS_DIR, f"{self.date}-{job}", "_"))
+        self._lock = threading.Lock()
+        if not resume:
+            self.clear()
+        _prune_runs()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.dir, f"{name}.json")
+
+    def clear(self) -> None:
+        """새 실행 — 이전 결과 삭제"""
+        for f in os.listdir(self.dir):
+            if f.endswith(".json"):
+                os.remove(os.path.join(self.dir, f))
+
+    def has(self, name: str) -> bool:
+        return os.path.exists(self._path(name))
+
+    def load(self, name: str):
+        entry = load_json(self._path(name), {})
+        return _decode(entry.get("value"))
+
+    def save(self, name: str, value) -> None:
+        save_json(self._path(name), {"saved_at": datetime.now().isoformat(), "value": _encode(value)})
+
+    def progress(self, name: str) -> dict:
+        """단계 안의 항목별 진행 상황 (키 → DB id / 메시지 ts)"""
+        with self._lock:
+            return load_json(self._path(f"{name}.progress"), {})
+
+    def record(self, name: str, key: str, value) -> None:
+        """항목 하나 완료 — 바로 디스크에 남긴다"""
+        with self._lock:
+            path = self._path(f"{name}.progress")
+            progress = load_json(path, {})
+            progress[key] = value
+            save_json(path, progress)
+
+
+def _prune_runs() -> None:
+    """KEEP_DAYS 보다 오래된 실행 디렉터리 삭제"""
+    base = os.path.dirname(state_path(RUNS_DIR, "_"))
+    cutoff = time.time() - KEEP_DAYS * 86400
+    for name in os.listdir(base):
+        path = os.path.join(base, name)
+        try:
+            if os.path.isdir(path) and os.path.getmtime(path) < cutoff:
+                shutil.rmtree(path)
+        except OSError:
+            pass
@@ -1,65 +1,173 @@
 """Deep Read — RSS 기반 아티클 수집 모듈"""
 
-import feedparser
 import yaml
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict
+from typing import List, Dict, Iterator, Optional, Tuple
+
+from src.collector.compress import DigestCache, html_to_text
+from src.collector.cursor import load_cursors, save_cursors, advance_cursor
+from src.collector.fetcher import fetch_feeds, stream_feeds
+from src.collector.urls import canonicalize_items
+
+
+STREAM_MAX_ENTRIES = 30   # 스트리밍 소스 1회 실행당 새 아티클 상한
+STREAM_PATIENCE = 3       # 기간 밖/이미 본 entry 가 연속 이만큼 나오면 스트림 중단
 
 
 def load_sources(config_path: str = None) -> List[Dict]:
-    """소스 설정 파일 로드"""
+    """소스 설정 파일 로드 (ALCHEMY_CONFIG_DIR 로 위치 변경 가능)"""
     if config_path is None:
-        config_path = os.path.join(
-            os.path.dirname(__file__), "..", "..", "config", "sources.yml"
+        config_dir = os.environ.get("ALCHEMY_CONFIG_DIR") or os.path.join(
+            os.path.dirname(__file__), "..", "..", "config"
         )
+        config_path = os.path.join(config_dir, "sources.yml")
     with open(config_path, "r") as f:
         config = yaml.safe_load(f)
     return config.get("deep_read_sources", [])
 
 
-def collect_articles_from_rss(sources: List[Dict], hours: int = 48) -> List[Dict]:
-    """RSS 피드에서 최근 아티클 수집"""
+def _materialize(entry: Dict, source: Dict, cutoff: datetime, digests: DigestCache) -> Optional[Dict]:
+    """entry → 아티클 dict (수집 기간 밖이면 None)"""
+    # 발행일 파싱
+    published = entry.get("published_parsed") or entry.get("updated_parsed")
+    if published:
+        pub_date = datetime(*published[:6])
+        if pub_date < cutoff:
+            return None
+    else:
+        pub_date = datetime.utcnow()
+
+    # 콘텐츠 추출
+    content = entry.get("content") or entry.get("summary", "")
+
+    # HTML 제거 후 핵심 문장 digest 로 압축 (토큰 절약)
+    content = digests.digest(html_to_text(content))
+
+    return {
+        "title": entry.get("title", ""),
+        "url": entry.get("link", ""),
+        "source": source["name"],
+        "tier": source.get("tier", 3),
+        "content_preview": content,
+        "published_at": pub_date.isoformat(),
+        "type": "article",
+    }
+
+
+def _new_items(
+    entries: Iterator[Dict], source: Dict, cutoff: datetime, seen: Dict, digests: DigestCache,
+    max_entries: Optional[int] = None, patience: Optional[int] = None,
+) -> Iterator[Tuple[str, Dict]]:
+    """처음 보는 수집 기간 내 entry 만 (entry id, 아티클) 로 변환
+
+    - max_entries: 새 아티클 개수 상한
+    - patience: 이미 봤거나 기간 밖인 entry 가 연속 N개 나오면 중단
+      (최신순 피드에서 그 뒤는 모두 오래된 글)
+    """
+    emitted = set()
+    misses = 0
+    for entry in entries:
+        entry_id = entry.get("id") or entry.get("link", "")
+        item = None
+        if entry_id not in seen and entry_id not in emitted:
+            item = _materialize(entry, source, cutoff, digests)
+
+        if item is None:
+            misses += 1
+            if patience and misses >= patience:
+                return
+            continue
+
+        misses = 0
+        emitted.add(entry_id)
+        yield entry_id, item
+        if max_entries and len(emitted) >= max_entries:
+            return
+
+
+def collect_articles_from_rss(
+    sources: List[Dict], hours: int = 48,
+    timeout: float = 10.0, deadline: float = 30.0,
+    incremental: bool = True,
+) -> List[Dict]:
+    """RSS 피드에서 최근 아티클 수집 (피드는 동시에 가져오고 결과는 소스 순서 유지)
+
+    incremental: 소스별 커서로 처음 보는 entry 만 가공하고, 이전 실행에서
+    만든 아티클은 수집 기간 안에 있으면 재사용한다.
+    stream: true 인 소스는 다운로드하며 entry 단위로 파싱하고,
+    수집 기간을 지나거나 STREAM_MAX_ENTRIES 에 닿으면 바로 끊는다.
+    """
     articles = []
     cutoff = datetime.utcnow() - timedelta(hours=hours)
+    cutoff_iso = cutoff.isoformat()
+
+    cursors = load_cursors() if incremental else {}
+    by_url = {source["url"]: source for source in sources}
+    digests = DigestCache()
+
+    def stream_transform(url, entries):
+        source = by_url[url]
+        return _new_items(
+            entries, source, cutoff, cursors.get(url, {}).get("seen", {}), digests,
+            max_entries=STREAM_MAX_ENTRIES, patience=STREAM_PATIENCE,
+        )
+
+    # 스트리밍 소스는 워커에서 바로 아티클로 변환, 일반 소스는 entry 목록으로 받는다 (둘은 동시에)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        feeds_future = pool.submit(
+            fetch_feeds,
+            [s["url"] for s in sources if not s.get("stream")],
+            timeout=timeout,
+            deadline=deadline,
+        )
+        streamed = stream_feeds(
+            [s["url"] for s in sources if s.get("stream")],
+            stream_transform,
+            timeout=timeout,
+            deadline=deadline,
+            use_cache=incremental,
+        )
+        feeds = feeds_future.result()
+    new_total = 0
 
     for source in sources:
+        cursor = cursors.get(source["url"], {})
+
         try:
-            feed = feedparser.parse(source["url"])
-
-            for entry in feed.entries[:10]:
-                # 발행일 파싱
-                published = entry.get("published_parsed") or entry.get("updated_parsed")
-                if published:
-                    pub_date = datetime(*published[:6])
-                    if pub_date < cutoff:
-                        continue
-                else:
-                    pub_date = datetime.utcnow()
-
-                # 콘텐츠 추출
-                content = ""
-                if entry.get("content"):
-                    content = entry.content[0].get("value", "")
-                elif entry.get("summary"):
-                    content = entry.summary
-
-                # HTML 태그 간단 제거
-                import re
-                content = re.sub(r"<[^>]+>", "", content)
-                content = content[:2000]  # 토큰 절약
-
-                articles.append({
-                    "title": entry.get("title", ""),
-                    "url": entry.get("link", ""),
-                    "source": source["name"],
-                    "tier": source.get("tier", 3),
-                    "content_preview": content,
-                    "published_at": pub_date.isoformat(),
-                    "type": "article",
-                })
+            if source.get("stream"):
+                results = streamed.get(source["url"], [])
+            else:
+                results = list(_new_items(feeds.get(source["url"], []), source, cutoff, cursor.get("seen", {}), digests))
         except Exception as e:
             print(f"RSS error for {source['name']}: {e}")
+            results = []
+
+        new_items = [item for _, item in results]
+        new_seen = {entry_id: item["published_at"] for entry_id, item in results}
+
+        # 피드를 못 가져와도 커서에 남은 기간 내 아티클은 그대로 쓴다
+        cursor = advance_cursor(cursor, new_items, new_seen, cutoff_iso)
+        cursors[source["url"]] = cursor
+        new_total += len(new_items)
+
+        for item in cursor["items"]:
+            item["source"] = source["name"]
+            item["tier"] = source.get("tier", 3)
+            articles.append(item)
+
+    try:
+        digests.save()
+    except OSError as e:
+        print(f"Digest cache save error: {e}")
+
+    if incremental:
+        print(f"  RSS: {new_total} new entries, {len(articles) - new_total} reused from cursor")
+        try:
+            save_cursors({s["url"]: cursors[s["url"]] for s in sources})
+        except OSError as e:
+            print(f"Feed cursor save error: {e}")
 
     return articles
 
@@ -67,14 +175,14 @@ def collect_articles_from_rss(sources: List[Dict], hours: int = 48) -> List[Dict
 def collect_all_articles(config_path: str = None) -> List[Dict]:
     """전체 아티클 수집 통합"""
     sources = load_sources(config_path)
-    articles = collect_articles_from_rss(sources)
+    articles = canonicalize_items(collect_articles_from_rss(sources))
 
-    # 중복 제거 (URL 기준)
+    # 중복 제거 (정규 URL 키 url_key 기준)
     seen_urls = set()
     unique = []
     for article in articles:
-        if article["url"] not in seen_urls and article["title"]:
-            seen_urls.add(article["url"])
+        if article["url_key"] not in seen_urls and article["title"]:
+            seen_urls.add(article["url_key"])
             unique.append(article)
 
     # Tier 순서로 정렬 (Tier 1 우선)
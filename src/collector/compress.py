@@ -0,0 +1,180 @@
+"""Extractive Compressor — 아티클 본문을 토큰 상한 안의 핵심 문장 digest 로 압축
+
+앞 2000자를 자르면 대개 도입부만 남고 논지가 빠진다. 대신 본문 전체를 문장으로 나눠
+TF-IDF 코사인 유사도 그래프의 TextRank 중심성과 TF-IDF 정보량으로 점수를 매기고, 점수 높은 문장부터 토큰 상한까지
+골라 원래 순서대로 이어 붙인다 (numpy 벡터 연산). 상한의 절반을 넘는 "문장"(문장부호 없는 긴 문단,
+표/목록 덩어리)은 고르지 않지만, 그 때문에 digest 가 비거나 도입부만 남으면 가장 긴 것을 남은
+토큰만큼 잘라 채운다.
+
+같은 본문은 다시 계산하지 않도록 본문 해시 → digest 를 상태 디렉터리에 캐시한다.
+"""
+
+import hashlib
+import html
+import re
+import threading
+from typing import Dict, List
+
+import numpy as np
+
+from src.curator.prompts import count_tokens, truncate_tokens
+from src.state import state_path, load_json, save_json
+
+
+DIGEST_TOKENS = 400       # digest 토큰 상한
+MAX_SENTENCES = 300       # 너무 긴 본문은 앞쪽 문장까지만 그래프에 넣는다
+DAMPING = 0.85
+RANK_WEIGHT = 0.6         # 최종 점수 = RANK_WEIGHT × TextRank + (1 - RANK_WEIGHT) × TF-IDF 정보량
+LEAD_BONUS = 0.15         # 앞 3문장 가산 (도입부 맥락도 약간 선호)
+CACHE_FILE = "digest_cache.json"
+CACHE_MAX = 5000
+CACHE_VERSION = 2         # compress 결과가 바뀌면 올린다 (이전 digest 는 다시 계산)
+
+_TAGS = re.compile(r"<(script|style)\b.*?</\1>|<[^>]+>", re.S | re.I)
+_BLOCK_TAG = re.compile(r"</?(p|br|div|li|h[1-6]|blockquote|section)\b", re.I)
+_SENTENCE_END = re.compile(r"(?<=[.!?。！？])[\"'”’)\]]*\s+|\n{2,}|\n(?=[A-Z가-힣\"“])")
+_WORD = re.compile(r"[a-z0-9]+|[가-힣]+")
+_STOPWORDS = {
+    "the", "a", "an", "and", "or", "of", "in", "on", "to", "for", "with", "is", "are", "as", "by",
+    "that", "this", "it", "was", "be", "at", "from", "but", "not", "have", "has", "we", "they",
+}
+
+
+def html_to_text(content: str) -> str:
+    """HTML 태그/스크립트 제거 + 엔티티 복원 + 공백 정리 (문단 경계는 유지)"""
+    text = _TAGS.sub(lambda m: "\n\n" if _BLOCK_TAG.match(m.group(0)) else " ", content)
+    text = html.unescape(text)
+    text = re.sub(r"[ \t\r\f\v]+", " ", text)
+    return re.sub(r"\s*\n\s*\n\s*", "\n\n", text).strip()
+
+
+def split_sentences(text: str) -> List[str]:
+    """문장 단위 분리"""
+    return [s.strip() for s in _SENTENCE_END.split(text) if s and len(s.strip()) > 1]
+
+
+def _tfidf(sentences: List[str]) -> tuple:
+    """(문장 × 용어 TF-IDF 행렬 (행 L2 정규화), 문장별 정보량)
+
+    정보량은 문장이 가진 고유 용어의 idf 합을 길이 제곱근으로 나눈 값 — 본문에서 드문
+    용어(새 개념, 고유명사)를 많이 담은 문장일수록 높다.
+    """
+    docs = [[w for w in _WORD.findall(s.lower()) if w not in _STOPWORDS] for s in sentences]
+    vocab: Dict[str, int] = {}
+    for doc in docs:
+        for w in doc:
+            vocab.setdefault(w, len(vocab))
+
+    tf = np.zeros((len(docs), max(len(vocab), 1)), dtype=np.float32)
+    for i, doc in enumerate(docs):
+        for w in doc:
+            tf[i, vocab[w]] += 1
+
+    df = (tf > 0).sum(axis=0)
+    idf = np.log((1 + len(docs)) / (1 + df)) + 1
+    weights = np.log1p(tf) * idf
+    norms = np.linalg.norm(weights, axis=1, keepdims=True)
+    lengths = np.array([max(len(d), 1) for d in docs], dtype=np.float32)
+    informativeness = ((tf > 0) * idf).sum(axis=1) / np.sqrt(lengths)
+    return weights / np.maximum(norms, 1e-9), informativeness
+
+
+def _normalize(values: np.ndarray) -> np.ndarray:
+    span = values.max() - values.min()
+    return (values - values.min()) / span if span > 0 else np.ones_like(values)
+
+
+def score_sentences(sentences: List[str], iterations: int = 30) -> np.ndarray:
+    """문장별 점수 (0~1) — TextRank 중심성과 TF-IDF 정보량의 가중합"""
+    n = len(sentences)
+    if n <= 2:
+        return np.ones(n)
+    vectors, informativeness = _tfidf(sentences)
+    similarity = vectors @ vectors.T
+    np.fill_diagonal(similarity, 0)
+
+    out_weight = similarity.sum(axis=1, keepdims=True)
+    # 다른 문장과 겹치는 단어가 없는 문장은 균등하게 퍼뜨린다
+    transition = np.where(out_weight > 0, similarity / np.maximum(out_weight, 1e-9), 1.0 / n)
+
+    scores = np.full(n, 1.0 / n)
+    for _ in range(iterations):
+        updated = (1 - DAMPING) / n + DAMPING * (transition.T @ scores)
+        if np.abs(updated - scores).sum() < 1e-6:
+            scores = updated
+            break
+        scores = updated
+    return RANK_WEIGHT * _normalize(scores) + (1 - RANK_WEIGHT) * _normalize(informativeness)
+
+
+def compress(text: str, max_tokens: int = DIGEST_TOKENS) -> str:
+    """본문 → max_tokens 이내 digest (짧으면 그대로)"""
+    if count_tokens(text) <= max_tokens:
+        return text
+
+    sentences = split_sentences(text)[:MAX_SENTENCES]
+    if not sentences:
+        return truncate_tokens(text, max_tokens)
+    scores = score_sentences(sentences)
+    scores[: min(3, len(scores))] += LEAD_BONUS
+
+    lengths = [count_tokens(s) for s in sentences]
+    chosen, used, skipped = [], 0, []
+    for i in np.argsort(-scores, kind="stable"):
+        if lengths[i] > max_tokens // 2:
+            skipped.append(i)  # 표/목록이 한 덩어리로 붙었거나 문장부호 없는 긴 문단
+            continue
+        if used + lengths[i] + 1 > max_tokens:
+            continue
+        chosen.append(i)
+        used += lengths[i] + 1
+    parts = {i: sentences[i] for i in chosen}
+
+    # 긴 덩어리만 빠져 digest 가 상한의 절반도 못 채웠으면 가장 긴 덩어리의 앞부분으로 채운다
+    if skipped and used < max_tokens // 2:
+        longest = max(skipped, key=lambda i: lengths[i])
+        parts[longest] = truncate_tokens(sentences[longest], max_tokens - used - 1)
+    return " ".join(parts[i] for i in sorted(parts))
+
+
+class DigestCache:
+    """본문 해시 → digest 캐시 (스레드 안전, 오래 안 쓴 항목부터 CACHE_MAX 로 제한)"""
+
+    def __init__(self, path: str = None, max_entries: int = CACHE_MAX):
+        self.path = path or state_path(CACHE_FILE)
+        self.max_entries = max_entries
+        self._entries = None
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(text: str, max_tokens: int) -> str:
+        return hashlib.sha1(f"{CACHE_VERSION}\0{max_tokens}\0{text}".encode("utf-8")).hexdigest()
+
+    def _load(self) -> Dict[str, str]:
+        if self._entries is None:
+            self._entries = load_json(self.path, {})
+        return self._entries
+
+    def digest(self, text: str, max_tokens: int = DIGEST_TOKENS) -> str:
+        key = self.key(text, max_tokens)
+        with self._lock:
+            entries = self._load()
+            if key in entries:
+                entries[key] = entries.pop(key)  # LRU: 최근 사용으로 이동
+                return entries[key]
+
+        result = compress(text, max_tokens)
+        with self._lock:
+            entries[key] = result
+            while len(entries) > self.max_entries:
+                del entries[next(iter(entries))]
+            self._dirty = True
+        return result
+
+    def save(self) -> None:
+        with self._lock:
+            if self._entries is None or not self._dirty:
+                return
+            save_json(self.path, self._entries)
+            self._dirty = False
@@ -0,0 +1,43 @@
+"""Feed Cursor — 소스별 증분 수집 커서
+
+소스마다 지금까지 본 entry(id → 발행 시각)와 이미 만들어 둔 아티클 dict 를 저장한다.
+다음 실행에서는 처음 보는 entry 만 HTML 제거 / dict 생성을 거치고, 이전에 만든
+아티클은 수집 기간 안에 있는 한 그대로 재사용한다. 실행당 작업량이 피드 크기가 아니라 새 글 수에 비례한다.
+"""
+
+from typing import Dict, List
+
+from src.state import state_path, load_json, save_json
+
+
+CURSOR_FILE = "feed_cursors.json"
+
+
+def load_cursors() -> Dict[str, Dict]:
+    """소스 URL → 커서"""
+    return load_json(state_path(CURSOR_FILE), default={}) or {}
+
+
+def save_cursors(cursors: Dict[str, Dict]) -> None:
+    save_json(state_path(CURSOR_FILE), cursors)
+
+
+def advance_cursor(cursor: Dict, new_items: List[Dict], new_seen: Dict[str, str], cutoff: str) -> Dict:
+    """새로 본 entry 를 반영한 커서 반환 (cutoff 이전 기록은 정리)
+
+    - new_items: 이번 실행에서 새로 만든 아티클 (피드 순서)
+    - new_seen: 이번 실행에서 새로 본 entry id → 발행 시각(ISO)
+    - cutoff: 수집 기간 시작 시각(ISO) — 이보다 오래된 기록은 다시 볼 일이 없다
+    """
+    seen = {eid: ts for eid, ts in cursor.get("seen", {}).items() if ts >= cutoff}
+    seen.update({eid: ts for eid, ts in new_seen.items() if ts >= cutoff})
+
+    items = new_items + [
+        item for item in cursor.get("items", [])
+        if item.get("published_at", "") >= cutoff
+    ]
+
+    return {
+        "seen": seen,
+        "items": items,
+    }
@@ -0,0 +1,109 @@
+"""Near-Duplicate Dedup — 제목/설명 MinHash 기반 유사 기사 묶기
+
+같은 기사가 NewsAPI 원문 URL, Google News 리다이렉트 URL, 신디케이션 사이트로
+여러 번 들어오는 것을 URL 비교만으로는 잡을 수 없다. 정규화한 제목, 제목+설명
+각각의 단어 shingle 로 MinHash 서명을 만들고, LSH 밴딩으로 후보 쌍만 비교해
+선형 시간에 클러스터를 찾는다. 클러스터마다 대표 하나만 남긴다.
+"""
+
+import re
+import zlib
+import numpy as np
+from typing import List, Dict, Tuple
+
+
+NUM_PERM = 64           # MinHash 서명 길이
+BANDS = 16              # LSH 밴드 수 (밴드당 4행 → 유사도 약 0.5 부터 후보)
+THRESHOLD = 0.5         # 추정 Jaccard 이 이 이상이면 같은 기사
+
+# multiply-shift 해시 계수 (a 는 홀수) — 고정 시드로 실행 간 서명이 같도록
+_rng = np.random.default_rng(20240601)
+_A = _rng.integers(0, np.iinfo(np.uint64).max, size=NUM_PERM, dtype=np.uint64) | np.uint64(1)
+_B = _rng.integers(0, np.iinfo(np.uint64).max, size=NUM_PERM, dtype=np.uint64)
+_SHIFT = np.uint64(32)
+
+_TAG = re.compile(r"<[^>]+>")
+_WORD = re.compile(r"[a-z0-9]+")
+_STOPWORDS = {
+    "a", "an", "the", "and", "or", "of", "to", "in", "on", "for", "with", "at",
+    "by", "from", "is", "are", "was", "as", "it", "its", "that", "this", "be",
+}
+
+
+def _tokens(item: Dict) -> Tuple[List[str], List[str]]:
+    """(제목 토큰, 제목+설명 토큰) — Google News 제목의 ' - 매체명' 꼬리 제거"""
+    title = item.get("title", "") or ""
+    source = item.get("source", "") or ""
+    if source and title.endswith(f" - {source}"):
+        title = title[: -len(source) - 3]
+    description = _TAG.sub(" ", item.get("description", "") or "")
+
+    def words(text):
+        return [w for w in _WORD.findall(text.lower()) if w not in _STOPWORDS]
+
+    return words(title), words(f"{title} {description}")
+
+
+def _signature(tokens: List[str]) -> np.ndarray:
+    """단어 1-gram + 2-gram shingle 의 MinHash 서명"""
+    shingles = set(tokens) | {" ".join(tokens[i:i + 2]) for i in range(len(tokens) - 1)}
+    hashes = np.array([zlib.crc32(s.encode()) for s in shingles], dtype=np.uint64)
+    # (a·x + b) mod 2^64 의 상위 32비트 — uint64 오버플로(wraparound)가 곧 mod 연산
+    permuted = (_A[:, None] * hashes[None, :] + _B[:, None]) >> _SHIFT
+    return permuted.min(axis=1)
+
+
+def _rank(item: Dict) -> tuple:
+    """대표 선정 기준 — 원문 URL(리다이렉트 아님) > 긴 설명"""
+    is_redirect = "news.google.com" in (item.get("url", "") or "")
+    return (is_redirect, -len(item.get("description", "") or ""))
+
+
+def collapse_near_duplicates(items: List[Dict], threshold: float = THRESHOLD) -> List[Dict]:
+    """유사 기사 클러스터를 대표 하나로 축약 (입력 순서 유지)
+
+    대표 아이템에는 같은 클러스터의 다른 URL 을 duplicate_urls 로 붙인다.
+    """
+    if len(items) < 2:
+        return list(items)
+
+    rows = NUM_PERM // BANDS
+    parent = list(range(len(items)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    # 제목 서명과 제목+설명 서명 각각 LSH — 둘 중 하나라도 충분히 비슷하면 같은 기사
+    signatures = []
+    buckets: Dict[tuple, List[int]] = {}
+    for i, item in enumerate(items):
+        sigs = [_signature(tokens) if tokens else None for tokens in _tokens(item)]
+        signatures.append(sigs)
+        for field, sig in enumerate(sigs):
+            if sig is None:
+                continue
+            for band in range(BANDS):
+                key = (field, band, sig[band * rows:(band + 1) * rows].tobytes())
+                bucket = buckets.setdefault(key, [])
+                for j in bucket:
+                    if find(i) != find(j) and np.mean(sig == signatures[j][field]) >= threshold:
+                        parent[find(i)] = find(j)
+                bucket.append(i)
+
+    clusters: Dict[int, List[int]] = {}
+    for i in range(len(items)):
+        clusters.setdefault(find(i), []).append(i)
+
+    result = []
+    for members in sorted(clusters.values(), key=lambda m: m[0]):
+        best = min(members, key=lambda i: (_rank(items[i]), i))
+        representative = dict(items[best])
+        others = [items[i].get("url", "") for i in members if i != best]
+        if others:
+            representative["duplicate_urls"] = others
+        result.append(representative)
+
+    return result
@@ -0,0 +1,265 @@
+"""Feed Fetcher — RSS 피드 동시 수집 엔진
+
+네트워크 다운로드는 스레드 풀에서 병렬로, 파싱은 다운로드가 끝난 피드부터
+메인 스레드에서 처리한다. 전체 소요 시간은 피드 수의 합이 아니라
+가장 느린 피드(또는 전체 데드라인)에 수렴한다.
+
+피드별 ETag/Last-Modified 와 마지막 파싱 결과를 로컬에 저장해 두고
+조건부 GET 을 보낸다. 304 Not Modified 면 저장된 entry 를 그대로 쓴다.
+
+대용량 피드는 stream_feeds 로 다운로드와 동시에 entry 단위로 파싱하고,
+소비자가 멈추면 그 자리에서 연결을 끊는다.
+"""
+
+import threading
+import time
+import xml.etree.ElementTree as ET
+import feedparser
+import httpx
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime, timedelta
+from typing import Any, Callable, List, Dict, Iterator, Optional, Tuple
+
+from src.collector.stream_parser import iter_feed_entries
+from src.state import state_path, load_json, save_json
+
+
+USER_AGENT = "Mozilla/5.0 (compatible; Alchemy/1.0; +https://github.com/albertlee1224-arch/alchemy)"
+
+CACHE_FILE = "feed_cache.json"
+CACHE_EXPIRE_DAYS = 14      # 이 기간 동안 요청되지 않은 피드는 캐시에서 제거
+MAX_CONTENT_CHARS = 20000   # entry 본문 저장 상한
+
+
+def _slim_entry(entry) -> Dict:
+    """feedparser entry → 저장 가능한 최소 필드 dict"""
+    content = ""
+    if entry.get("content"):
+        content = entry.content[0].get("value", "")
+
+    published = entry.get("published_parsed")
+    updated = entry.get("updated_parsed")
+
+    return {
+        "id": entry.get("id") or entry.get("link", ""),
+        "title": entry.get("title", ""),
+        "link": entry.get("link", ""),
+        "summary": entry.get("summary", "")[:MAX_CONTENT_CHARS],
+        "content": content[:MAX_CONTENT_CHARS],
+        "published": entry.get("published", ""),
+        "published_parsed": list(published) if published else None,
+        "updated_parsed": list(updated) if updated else None,
+        "source": {"title": entry.get("source", {}).get("title", "")},
+    }
+
+
+def parse_feed(content: bytes) -> List[Dict]:
+    """피드 원문 → entry 목록"""
+    return [_slim_entry(e) for e in feedparser.parse(content).entries]
+
+
+def _conditional_headers(validators: Dict) -> Dict:
+    headers = {}
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
+
+def _validators(response: httpx.Response) -> Dict:
+    return {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+    }
+
+
+def _download(
+    client: httpx.Client, url: str, timeout: float, validators: Dict
+) -> Tuple[Optional[bytes], Dict]:
+    """피드 원문 다운로드 (소스별 타임아웃, 조건부 GET)
+
+    변경이 없으면(304) 본문 대신 None 을 반환한다.
+    """
+    response = client.get(url, timeout=timeout, headers=_conditional_headers(validators))
+    if response.status_code == 304:
+        return None, validators
+    response.raise_for_status()
+    return response.content, _validators(response)
+
+
+def _stream(
+    client: httpx.Client, url: str, timeout: float, validators: Dict,
+    transform: Callable[[str, Iterator[Dict]], Iterator[Any]],
+) -> Tuple[Optional[List[Any]], Dict]:
+    """피드를 스트리밍 파싱하며 transform 결과 수집 (조건부 GET)
+
+    transform 이 entry 소비를 멈추면 남은 본문은 받지 않고 연결을 닫는다.
+    XML 이 깨진 피드는 전체를 다시 받아 feedparser 로 처리한다.
+    """
+    with client.stream("GET", url, timeout=timeout, headers=_conditional_headers(validators)) as response:
+        if response.status_code == 304:
+            return None, validators
+        response.raise_for_status()
+        try:
+            return list(transform(url, iter_feed_entries(response.iter_bytes()))), _validators(response)
+        except ET.ParseError as e:
+            print(f"Stream parse failed for {url} ({e}), falling back to feedparser")
+
+    content, new_validators = _download(client, url, timeout, {})
+    return list(transform(url, iter(parse_feed(content)))), new_validators
+
+
+_cache_lock = threading.Lock()
+
+
+def _load_cache() -> Dict:
+    return load_json(state_path(CACHE_FILE), default={}) or {}
+
+
+def _save_cache(updates: Dict) -> None:
+    """갱신된 피드만 최신 캐시 파일에 병합 저장 (동시 수집 간 덮어쓰기 방지)"""
+    expire = (datetime.utcnow() - timedelta(days=CACHE_EXPIRE_DAYS)).isoformat()
+    with _cache_lock:
+        cache = _load_cache()
+        cache.update(updates)
+        cache = {url: c for url, c in cache.items() if c.get("requested_at", "") >= expire}
+        save_json(state_path(CACHE_FILE), cache)
+
+
+def _run_until_deadline(
+    urls: List[str], work: Callable[[httpx.Client, str], Any], deadline: float, max_workers: int
+) -> Iterator[Tuple[str, Any, Optional[Exception]]]:
+    """URL별 작업을 스레드 풀에서 실행하고 끝나는 순서대로 (url, 결과, 에러) yield
+
+    deadline(초)을 넘기면 남은 작업은 버린다.
+    """
+    started = time.monotonic()
+    client = httpx.Client(
+        headers={"User-Agent": USER_AGENT},
+        follow_redirects=True,
+    )
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(urls)))
+    pending = {}
+    try:
+        pending = {executor.submit(work, client, url): url for url in dict.fromkeys(urls)}
+
+        while pending:
+            remaining = deadline - (time.monotonic() - started)
+            if remaining <= 0:
+                break
+            done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                url = pending.pop(future)
+                try:
+                    yield url, future.result(), None
+                except Exception as e:
+                    yield url, None, e
+
+        for future, url in pending.items():
+            future.cancel()
+            print(f"Feed fetch skipped (deadline {deadline}s): {url}")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        if not pending:
+            client.close()
+
+
+def fetch_feeds(
+    urls: List[str],
+    timeout: float = 10.0,
+    deadline: float = 30.0,
+    max_workers: int = 8,
+    use_cache: bool = True,
+) -> Dict[str, List[Dict]]:
+    """여러 피드를 동시에 가져와 URL별 entry 목록 반환
+
+    - timeout: 소스별 네트워크 타임아웃 (초)
+    - deadline: 전체 수집 데드라인 (초) — 넘기면 남은 피드는 건너뜀
+    - use_cache: ETag/Last-Modified 조건부 GET + 파싱 결과 재사용
+    실패하거나 데드라인을 넘긴 피드는 결과에 포함되지 않는다.
+    """
+    results: Dict[str, List[Dict]] = {}
+    if not urls:
+        return results
+
+    cache = _load_cache() if use_cache else {}
+    updates = {}
+    now = datetime.utcnow().isoformat()
+    not_modified = 0
+
+    def work(client, url):
+        cached = cache.get(url, {})
+        # 저장된 entry 가 있을 때만 validator 를 보낸다 (304 를 받아도 쓸 게 있어야 함)
+        return _download(client, url, timeout, cached if "entries" in cached else {})
+
+    for url, result, error in _run_until_deadline(urls, work, deadline, max_workers):
+        try:
+            if error:
+                raise error
+            content, validators = result
+            if content is None:
+                not_modified += 1
+                entries = cache[url]["entries"]
+            else:
+                entries = parse_feed(content)
+            results[url] = entries
+            if use_cache:
+                updates[url] = {**validators, "entries": entries, "requested_at": now}
+        except Exception as e:
+            print(f"Feed fetch error for {url}: {e}")
+
+    if use_cache:
+        if not_modified:
+            print(f"  Feed cache: {not_modified}/{len(results)} feeds not modified")
+        try:
+            _save_cache(updates)
+        except OSError as e:
+            print(f"Feed cache save error: {e}")
+
+    return results
+
+
+def stream_feeds(
+    urls: List[str],
+    transform: Callable[[str, Iterator[Dict]], Iterator[Any]],
+    timeout: float = 10.0,
+    deadline: float = 30.0,
+    max_workers: int = 8,
+    use_cache: bool = True,
+) -> Dict[str, List[Any]]:
+    """여러 피드를 동시에 스트리밍 파싱해 URL별 transform 결과 목록 반환
+
+    transform(url, entries) 는 entry 를 하나씩 받아 필요한 결과만 yield 하고,
+    더 볼 필요가 없으면 멈춘다 (예: 수집 기간을 지난 entry, 개수 상한).
+    entry 본문은 캐시하지 않으므로, use_cache 로 304 를 받은 피드는 빈 목록이 된다.
+    이전 결과를 호출자가 따로 보관하고 있을 때만 use_cache 를 켠다.
+    """
+    results: Dict[str, List[Any]] = {}
+    if not urls:
+        return results
+
+    cache = _load_cache() if use_cache else {}
+    updates = {}
+    now = datetime.utcnow().isoformat()
+
+    def work(client, url):
+        cached = cache.get(url, {})
+        return _stream(client, url, timeout, cached if cached.get("streamed") else {}, transform)
+
+    for url, result, error in _run_until_deadline(urls, work, deadline, max_workers):
+        if error:
+            print(f"Feed stream error for {url}: {error}")
+            continue
+        items, validators = result
+        results[url] = items or []
+        if use_cache:
+            updates[url] = {**validators, "streamed": True, "requested_at": now}
+
+    if use_cache:
+        try:
+            _save_cache(updates)
+        except OSError as e:
+            print(f"Feed cache save error: {e}")
+
+    return results
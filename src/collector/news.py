@@ -1,47 +1,51 @@
 """Global Pulse — 뉴스 수집 모듈"""
 
-import httpx
-import feedparser
 import os
 from datetime import datetime, timedelta
-from typing import List, Dict
+from typing import List, Dict, Optional
+from urllib.parse import quote_plus
 
+from src.collector.dedup import collapse_near_duplicates
+from src.collector.fetcher import fetch_feeds
+from src.collector.newsapi import NewsAPIClient
+from src.collector.urls import canonicalize_items
+from src.collector.planner import (
+    plan_queries, build_query, tag_keywords,
+    NEWSAPI_MAX_QUERY_CHARS, GOOGLE_MAX_QUERY_CHARS,
+)
 
-def collect_news_from_api(api_key: str, keywords: List[str], max_results: int = 50) -> List[Dict]:
-    """NewsAPI에서 키워드 기반 뉴스 수집"""
+
+GOOGLE_NEWS_RSS_URL = os.environ.get("GOOGLE_NEWS_RSS_URL", "https://news.google.com/rss/search")
+
+
+def collect_news_from_api(
+    api_key: str, keywords: List[str], max_results: int = 50, request_budget: Optional[int] = None
+) -> List[Dict]:
+    """NewsAPI에서 키워드 기반 뉴스 수집 (키워드를 OR 쿼리로 묶어 병렬 요청)"""
     articles = []
-    base_url = "https://newsapi.org/v2/everything"
 
     yesterday = (datetime.utcnow() - timedelta(days=1)).strftime("%Y-%m-%d")
 
-    for keyword in keywords:
-        try:
-            response = httpx.get(
-                base_url,
-                params={
-                    "q": keyword,
-                    "from": yesterday,
-                    "sortBy": "relevancy",
-                    "language": "en",
-                    "pageSize": 10,
-                    "apiKey": api_key,
-                },
-                timeout=15,
-            )
-            if response.status_code == 200:
-                data = response.json()
-                for article in data.get("articles", []):
-                    articles.append({
-                        "title": article.get("title", ""),
-                        "description": article.get("description", ""),
-                        "url": article.get("url", ""),
-                        "source": article.get("source", {}).get("name", ""),
-                        "published_at": article.get("publishedAt", ""),
-                        "keyword": keyword,
-                        "type": "news",
-                    })
-        except Exception as e:
-            print(f"NewsAPI error for '{keyword}': {e}")
+    groups = plan_queries(keywords, NEWSAPI_MAX_QUERY_CHARS, budget=request_budget)
+    queries = [build_query(group) for group in groups]
+
+    with NewsAPIClient(api_key) as client:
+        # 묶은 키워드 수만큼 결과를 더 받는다 (키워드당 10개, 최대 100)
+        page_size = min(100, 10 * max((len(g) for g in groups), default=1))
+        results = client.search_many(queries, from_date=yesterday, page_size=page_size)
+        print(f"  NewsAPI: {len(keywords)} keywords in {len(queries)} queries "
+              f"(quota used today: {client.quota_used()}/{client.daily_limit})")
+
+    for group, query in zip(groups, queries):
+        for article in results.get(query, []):
+            articles.append(tag_keywords({
+                "title": article.get("title", ""),
+                "description": article.get("description", ""),
+                "url": article.get("url", ""),
+                "source": article.get("source", {}).get("name", ""),
+                "published_at": article.get("publishedAt", ""),
+                "type": "news",
+            }, group))
 
     # 중복 제거 (URL 기준)
     seen_urls = set()
@@ -54,28 +58,35 @@ def collect_news_from_api(api_key: str, keywords: List[str], max_results: int =
     return unique_articles[:max_results]
 
 
-def collect_news_from_google_rss(keywords: List[str], max_results: int = 30) -> List[Dict]:
-    """Google News RSS에서 키워드 기반 뉴스 수집 (무료 백업)"""
+def collect_news_from_google_rss(
+    keywords: List[str], max_results: int = 30, request_budget: Optional[int] = None
+) -> List[Dict]:
+    """Google News RSS에서 키워드 기반 뉴스 수집 (무료 백업, 키워드를 OR 쿼리로 묶음)"""
     articles = []
 
-    for keyword in keywords:
-        try:
-            query = keyword.replace(" ", "+")
-            feed_url = f"https://news.google.com/rss/search?q={query}&hl=en-US&gl=US&ceid=US:en"
-            feed = feedparser.parse(feed_url)
+    groups = plan_queries(keywords, GOOGLE_MAX_QUERY_CHARS, budget=request_budget, and_op=" ")
+    feed_urls = [
+        f"{GOOGLE_NEWS_RSS_URL}?q={quote_plus(build_query(group, and_op=' '))}&hl=en-US&gl=US&ceid=US:en"
+        for group in groups
+    ]
+    feeds = fetch_feeds(feed_urls)
 
-            for entry in feed.entries[:5]:
-                articles.append({
+    for group, feed_url in zip(groups, feed_urls):
+        if feed_url not in feeds:
+            continue
+        try:
+            # 키워드당 5개씩
+            for entry in feeds[feed_url][:5 * len(group)]:
+                articles.append(tag_keywords({
                     "title": entry.get("title", ""),
                     "description": entry.get("summary", ""),
                     "url": entry.get("link", ""),
-                    "source": entry.get("source", {}).get("title", "Google News"),
+                    "source": entry.get("source", {}).get("title") or "Google News",
                     "published_at": entry.get("published", ""),
-                    "keyword": keyword,
                     "type": "news",
-                })
+                }, group))
         except Exception as e:
-            print(f"Google RSS error for '{keyword}': {e}")
+            print(f"Google RSS error for {group}: {e}")
 
     # 중복 제거
     seen_urls = set()
@@ -88,23 +99,32 @@ def collect_news_from_google_rss(keywords: List[str], max_results: int = 30) ->
     return unique_articles[:max_results]
 
 
-def collect_all_news(api_key: str, keywords: List[str]) -> List[Dict]:
-    """모든 소스에서 뉴스 수집 통합"""
+def collect_all_news(api_key: str, keywords: List[str], request_budget: Optional[int] = None) -> List[Dict]:
+    """모든 소스에서 뉴스 수집 통합
+
+    request_budget: 소스(NewsAPI / Google News)별 1회 실행당 최대 요청 수
+    """
     all_news = []
 
     # NewsAPI
     if api_key:
-        all_news.extend(collect_news_from_api(api_key, keywords))
+        all_news.extend(collect_news_from_api(api_key, keywords, request_budget=request_budget))
 
     # Google News RSS (무료 백업)
-    all_news.extend(collect_news_from_google_rss(keywords))
+    all_news.extend(collect_news_from_google_rss(keywords, request_budget=request_budget))
 
-    # 중복 제거
+    # 리다이렉트 해석 + 정규 URL 키(url_key, 추적 파라미터 제거) 기준 중복 제거
+    canonicalize_items(all_news)
     seen_urls = set()
     unique = []
     for article in all_news:
-        if article["url"] not in seen_urls:
-            seen_urls.add(article["url"])
+        if article["url_key"] not in seen_urls:
+            seen_urls.add(article["url_key"])
             unique.append(article)
 
-    return unique
+    # 유사 기사 제거 (리다이렉트 URL / 신디케이션으로 URL 만 다른 같은 기사)
+    collapsed = collapse_near_duplicates(unique)
+    if len(collapsed) < len(unique):
+        print(f"  Near-duplicate news collapsed: {len(unique)} → {len(collapsed)}")
+
+    return collapsed
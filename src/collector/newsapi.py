@@ -0,0 +1,150 @@
+"""NewsAPI 클라이언트 — 커넥션 풀 공유 + 병렬 요청 + 쿼터 관리
+
+- 하나의 httpx.Client 를 공유해 키워드마다 TLS 핸드셰이크를 반복하지 않는다
+- 키워드 요청은 제한된 동시성으로 병렬 실행
+- 토큰 버킷으로 순간 요청률을, 로컬 카운터로 일일 쿼터(Developer 플랜 100회/일)를 관리
+- 429/5xx 는 jitter 를 섞은 지수 backoff 로 재시도
+"""
+
+import os
+import threading
+import time
+import httpx
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import List, Dict, Optional
+
+from src.ratelimit import TokenBucket, backoff_delay, parse_retry_after
+from src.state import state_path, load_json, save_json
+
+
+NEWSAPI_URL = os.environ.get("NEWSAPI_URL", "https://newsapi.org/v2/everything")
+QUOTA_FILE = "newsapi_quota.json"
+
+
+class NewsAPIClient:
+    """NewsAPI /v2/everything 전용 클라이언트"""
+
+    def __init__(
+        self,
+        api_key: str,
+        max_concurrency: int = 4,
+        requests_per_second: float = 2.0,
+        daily_limit: int = None,
+        max_retries: int = 3,
+        timeout: float = 15.0,
+    ):
+        self.api_key = api_key
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.daily_limit = daily_limit or int(os.environ.get("NEWS_API_DAILY_LIMIT", 100))
+        self._bucket = TokenBucket(rate=requests_per_second, capacity=max_concurrency)
+        self._http = httpx.Client(
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency),
+        )
+        self._quota_lock = threading.Lock()
+        self._exhausted = False
+
+    # ── 일일 쿼터 ──────────────────────────────
+
+    def _reserve_quota(self) -> bool:
+        """오늘 쿼터에서 1회 차감 — 남은 쿼터가 없으면 False"""
+        with self._quota_lock:
+            if self._exhausted:
+                return False
+            path = state_path(QUOTA_FILE)
+            today = datetime.utcnow().strftime("%Y-%m-%d")
+            quota = load_json(path, default={}) or {}
+            used = quota.get("used", 0) if quota.get("date") == today else 0
+            if used >= self.daily_limit:
+                self._exhausted = True
+                print(f"NewsAPI daily quota reached ({used}/{self.daily_limit})")
+                return False
+            save_json(path, {"date": today, "used": used + 1})
+            return True
+
+    def quota_used(self) -> int:
+        """오늘 사용한 요청 수"""
+        quota = load_json(state_path(QUOTA_FILE), default={}) or {}
+        return quota.get("used", 0) if quota.get("date") == datetime.utcnow().strftime("%Y-%m-%d") else 0
+
+    # ── 요청 ──────────────────────────────────
+
+    def search(self, query: str, from_date: str, page_size: int = 10) -> Optional[List[Dict]]:
+        """단일 쿼리 검색 — 실패하면 None"""
+        params = {
+            "q": query,
+            "from": from_date,
+            "sortBy": "relevancy",
+            "language": "en",
+            "pageSize": page_size,
+            "apiKey": self.api_key,
+        }
+
+        for attempt in range(self.max_retries + 1):
+            if not self._reserve_quota():
+                return None
+            self._bucket.acquire()
+
+            try:
+                response = self._http.get(NEWSAPI_URL, params=params)
+            except httpx.TransportError as e:
+                if attempt == self.max_retries:
+                    print(f"NewsAPI error for '{query}': {e}")
+                    return None
+                time.sleep(backoff_delay(attempt))
+                continue
+
+            if response.status_code == 200:
+                try:
+                    return response.json().get("articles", [])
+                except ValueError as e:
+                    # 잘리거나 깨진 본문 — 이 쿼리만 건너뛰고 나머지 수집은 계속
+                    print(f"NewsAPI error for '{query}': malformed response ({e})")
+                    return None
+
+            if response.status_code == 429:
+                # rateLimited = 일일 쿼터 소진 → 재시도해도 소용없음
+                if _error_code(response) == "rateLimited":
+                    with self._quota_lock:
+                        self._exhausted = True
+                    print("NewsAPI quota exhausted (429 rateLimited)")
+                    return None
+                delay = parse_retry_after(response.headers.get("Retry-After")) or backoff_delay(attempt)
+            elif response.status_code >= 500:
+                delay = backoff_delay(attempt)
+            else:
+                print(f"NewsAPI error for '{query}': HTTP {response.status_code} {_error_code(response)}")
+                return None
+
+            if attempt < self.max_retries:
+                time.sleep(delay)
+
+        print(f"NewsAPI error for '{query}': gave up after {self.max_retries + 1} attempts")
+        return None
+
+    def search_many(self, queries: List[str], from_date: str, page_size: int = 10) -> Dict[str, List[Dict]]:
+        """여러 쿼리 병렬 검색 — 쿼리 순서대로 결과 반환 (실패한 쿼리는 제외)"""
+        if not queries:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(queries))) as executor:
+            futures = [executor.submit(self.search, q, from_date, page_size) for q in queries]
+            results = [f.result() for f in futures]
+        return {q: r for q, r in zip(queries, results) if r is not None}
+
+    def close(self):
+        self._http.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _error_code(response: httpx.Response) -> str:
+    try:
+        return response.json().get("code", "")
+    except ValueError:
+        return ""
@@ -0,0 +1,75 @@
+"""Query Planner — 뉴스 키워드를 OR 쿼리로 묶어 요청 수 절약
+
+키워드마다 요청을 보내는 대신, API 쿼리 길이 한도 안에서 여러 키워드를
+`(a AND b) OR (c AND d)` 형태로 묶는다. 결과는 제목/설명에 등장한 키워드로
+다시 매핑해 `keyword` 필드를 유지한다.
+"""
+
+import re
+from typing import List, Dict, Optional
+
+
+NEWSAPI_MAX_QUERY_CHARS = 500   # NewsAPI q 파라미터 최대 길이
+GOOGLE_MAX_QUERY_CHARS = 250    # Google News 검색 쿼리 (URL 길이 여유)
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def _clause(keyword: str, and_op: str) -> str:
+    words = keyword.split()
+    if len(words) == 1:
+        return words[0]
+    return "(" + and_op.join(words) + ")"
+
+
+def build_query(keywords: List[str], and_op: str = " AND ") -> str:
+    """키워드 묶음 → OR 쿼리 문자열 (키워드 내부 단어는 AND)"""
+    return " OR ".join(_clause(k, and_op) for k in keywords)
+
+
+def plan_queries(
+    keywords: List[str],
+    max_chars: int,
+    budget: Optional[int] = None,
+    and_op: str = " AND ",
+) -> List[List[str]]:
+    """키워드를 쿼리 길이 한도 안에서 최소 개수의 묶음으로 분할
+
+    - 키워드 순서(우선순위)를 유지하며 앞에서부터 채운다
+    - budget 이 있으면 그 수만큼의 묶음만 반환하고 남은 키워드는 버린다
+    """
+    groups: List[List[str]] = []
+    for keyword in dict.fromkeys(k.strip() for k in keywords if k.strip()):
+        if groups and len(build_query(groups[-1] + [keyword], and_op)) <= max_chars:
+            groups[-1].append(keyword)
+        else:
+            groups.append([keyword])
+
+    if budget is not None and len(groups) > budget:
+        dropped = [k for g in groups[budget:] for k in g]
+        print(f"  Query budget {budget} reached — dropped keywords: {dropped}")
+        groups = groups[:budget]
+
+    return groups
+
+
+def match_keywords(text: str, keywords: List[str]) -> List[str]:
+    """결과 텍스트에 등장한 키워드 목록 (키워드의 모든 단어가 포함된 경우)
+
+    정확히 일치하는 키워드가 없으면 단어가 가장 많이 겹치는 키워드 하나를 반환한다.
+    """
+    words = set(_WORD.findall(text.lower()))
+    matched = [k for k in keywords if set(_WORD.findall(k.lower())) <= words]
+    if matched or not keywords:
+        return matched
+
+    best = max(keywords, key=lambda k: len(set(_WORD.findall(k.lower())) & words))
+    return [best]
+
+
+def tag_keywords(item: Dict, group: List[str]) -> Dict:
+    """결과 아이템에 keyword / keywords 필드 설정"""
+    matched = match_keywords(f"{item.get('title', '')} {item.get('description', '')}", group)
+    item["keyword"] = matched[0]
+    item["keywords"] = matched
+    return item
@@ -0,0 +1,117 @@
+"""Streaming Feed Parser — 대용량 피드를 entry 단위로 증분 파싱
+
+feedparser 는 문서 전체를 메모리에 올린 뒤 파싱한다. 전문(content:encoded)을
+싣는 WordPress 계열 피드는 수 MB 가 되므로, XMLPullParser 로 다운로드 청크를
+바로 먹이고 <item>/<entry> 가 닫힐 때마다 하나씩 내보낸 뒤 트리에서 제거한다.
+메모리에는 항상 entry 하나 분량만 남는다.
+
+출력 entry 형식은 fetcher._slim_entry 와 같다.
+"""
+
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterable, Iterator, Optional
+
+
+_ENTRY_TAGS = {"item", "entry"}
+_CONTAINER_TAGS = {"channel", "feed", "RDF"}
+
+
+def _local(tag: str) -> str:
+    """'{namespace}name' → 'name'"""
+    return tag.rsplit("}", 1)[-1]
+
+
+def _parse_date(value: str) -> Optional[list]:
+    """RFC 822(RSS) / ISO 8601(Atom) 날짜 → UTC struct_time 리스트"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        dt = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        try:
+            dt = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return list(dt.utctimetuple())
+
+
+def _text(elem: ET.Element) -> str:
+    """요소 텍스트 (Atom xhtml 콘텐츠처럼 자식 요소가 있으면 전체 텍스트)"""
+    if len(elem):
+        return "".join(elem.itertext()).strip()
+    return (elem.text or "").strip()
+
+
+def _entry_from_element(elem: ET.Element) -> Dict:
+    fields: Dict[str, str] = {}
+    link = ""
+    source = ""
+
+    for child in elem:
+        name = _local(child.tag)
+        if name == "link":
+            # Atom: <link rel="alternate" href="..."/>, RSS: <link>url</link>
+            href = child.get("href")
+            if href and child.get("rel", "alternate") == "alternate":
+                link = link or href
+            elif not href:
+                link = link or _text(child)
+        elif name == "source":
+            source = child.get("title", "") or _text(child)
+        elif name not in fields:
+            fields[name] = _text(child)
+
+    published = fields.get("pubDate") or fields.get("published") or fields.get("date", "")
+    updated = fields.get("updated", "")
+    summary = fields.get("description") or fields.get("summary", "")
+    content = fields.get("encoded") or fields.get("content", "")
+
+    return {
+        "id": fields.get("guid") or fields.get("id") or link,
+        "title": fields.get("title", ""),
+        "link": link,
+        "summary": summary,
+        "content": content,
+        "published": published,
+        "published_parsed": _parse_date(published),
+        "updated_parsed": _parse_date(updated),
+        "source": {"title": source},
+    }
+
+
+def iter_feed_entries(chunks: Iterable[bytes]) -> Iterator[Dict]:
+    """바이트 청크 스트림 → entry 를 하나씩 yield
+
+    소비자가 중간에 멈추면(break) 남은 청크는 읽지 않는다.
+    XML 이 깨져 있으면 xml.etree.ElementTree.ParseError 를 그대로 올린다.
+    """
+    parser = ET.XMLPullParser(events=("start", "end"))
+    container = None
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        for event, elem in parser.read_events():
+            name = _local(elem.tag)
+            if event == "start":
+                if name in _CONTAINER_TAGS:
+                    container = elem
+                continue
+            if name not in _ENTRY_TAGS:
+                continue
+
+            yield _entry_from_element(elem)
+
+            # 다 쓴 entry 는 트리에서 떼어내 메모리를 평탄하게 유지
+            elem.clear()
+            if container is not None:
+                try:
+                    container.remove(elem)
+                except ValueError:
+                    pass
+
+    parser.close()
@@ -0,0 +1,161 @@
+"""URL 정규화 — 모든 단계(중복 제거, 최근 추천 비교, 피드백, Notion 조회)의 URL 비교 키
+
+아이템의 url 은 (리다이렉트만 푼) 원문 링크 그대로 두고 Slack 게시·DB 저장에 쓴다.
+비교와 DB 키는 정규 URL 인 url_key 로 한다.
+
+- canonical_url: https 통일, 호스트 소문자, 추적 파라미터(utm_* 등)/fragment 제거,
+  쿼리 정렬, 끝 슬래시 제거
+- resolve_redirects: Google News / 단축 URL 같은 리다이렉트 래퍼를 HEAD 요청으로
+  원문 URL 로 풀고, 결과를 크기 제한 LRU 캐시로 로컬에 저장
+"""
+
+import hashlib
+import threading
+import httpx
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from src.state import state_path, load_json, save_json
+
+
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "igshid",
+    "ref", "ref_src", "_hsenc", "_hsmi", "cmpid", "smid", "ocid", "sr_share",
+}
+
+# 리다이렉트 래퍼로 알려진 호스트만 네트워크로 해석한다
+REDIRECT_HOSTS = {
+    "news.google.com", "feedproxy.google.com", "feeds.feedburner.com",
+    "t.co", "bit.ly", "buff.ly", "ow.ly", "trib.al", "lnkd.in", "dlvr.it",
+}
+
+REDIRECT_CACHE_FILE = "redirects.json"
+REDIRECT_CACHE_SIZE = 5000
+
+
+def canonical_url(url: str) -> str:
+    """비교/저장용 정규 URL"""
+    if not url:
+        return ""
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return url.strip()
+    if parts.scheme not in ("http", "https") or not parts.netloc:
+        return url.strip()
+
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS
+    )
+    path = parts.path.rstrip("/")
+
+    return urlunsplit(("https", host, path, urlencode(query), ""))
+
+
+def url_variants(url: str) -> List[str]:
+    """DB 조회용 후보 — 정규 URL + 원본 (정규화 이전에 저장된 행 호환)"""
+    return list(dict.fromkeys(u for u in (canonical_url(url), url) if u))
+
+
+def url_hashes(url: str) -> List[str]:
+    """url_variants 의 md5 — DB 의 url_hash 컬럼(md5(url_key)) 조회용"""
+    return [hashlib.md5(u.encode("utf-8")).hexdigest() for u in url_variants(url)]
+
+
+def _needs_resolve(url: str) -> bool:
+    try:
+        return (urlsplit(url).hostname or "").lower() in REDIRECT_HOSTS
+    except ValueError:
+        return False
+
+
+_cache_lock = threading.Lock()
+
+
+def resolve_redirects(urls: Iterable[str], timeout: float = 5.0, max_workers: int = 8) -> Dict[str, str]:
+    """리다이렉트 래퍼 URL → 최종 URL (래퍼가 아닌 URL 은 그대로)
+
+    HEAD 요청을 동시에 보내고, 해석 결과는 로컬 LRU 캐시에 저장한다.
+    실패한 URL 은 원본을 그대로 돌려주고 캐시하지 않는다.
+    """
+    urls = list(dict.fromkeys(u for u in urls if u))
+    resolved = {url: url for url in urls}
+
+    with _cache_lock:
+        cache = OrderedDict(load_json(state_path(REDIRECT_CACHE_FILE), default={}) or {})
+
+    todo = []
+    for url in urls:
+        if not _needs_resolve(url):
+            continue
+        if url in cache:
+            resolved[url] = cache[url]
+            cache.move_to_end(url)
+        else:
+            todo.append(url)
+
+    if todo:
+        def head(client, url):
+            try:
+                return str(client.head(url).url)
+            except httpx.HTTPError:
+                return None
+
+        with httpx.Client(follow_redirects=True, timeout=timeout) as client:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(todo))) as executor:
+                finals = list(executor.map(lambda u: head(client, u), todo))
+
+        for url, final in zip(todo, finals):
+            if final:
+                resolved[url] = final
+                cache[url] = final
+        print(f"  Resolved {sum(1 for f in finals if f)}/{len(todo)} redirect URLs")
+
+    with _cache_lock:
+        latest = OrderedDict(load_json(state_path(REDIRECT_CACHE_FILE), default={}) or {})
+        latest.update(cache)
+        while len(latest) > REDIRECT_CACHE_SIZE:
+            latest.popitem(last=False)
+        try:
+            save_json(state_path(REDIRECT_CACHE_FILE), latest)
+        except OSError as e:
+            print(f"Redirect cache save error: {e}")
+
+    return resolved
+
+
+def url_key(item: Dict) -> str:
+    """아이템의 비교 키 — canonicalize_items 가 붙인 url_key (없으면 url 을 정규화)"""
+    return item.get("url_key") or canonical_url(item.get("url", ""))
+
+
+def canonicalize_items(items: List[Dict], resolve: bool = True) -> List[Dict]:
+    """url(및 duplicate_urls)의 리다이렉트 래퍼만 최종 URL 로 풀고, 정규 URL 을 url_key 에 붙임 — 정규화는 url_key 에만"""
+    resolved = {}
+    if resolve:
+        urls = [item.get("url", "") for item in items]
+        urls += [u for item in items for u in item.get("duplicate_urls", [])]
+        resolved = resolve_redirects(urls)
+
+    for item in items:
+        item["url"] = resolved.get(item.get("url", ""), item.get("url", ""))
+        item["url_key"] = canonical_url(item["url"])
+        if item.get("duplicate_urls"):
+            item["duplicate_urls"] = [resolved.get(u, u) for u in item["duplicate_urls"]]
+    return items
+
+
+def exclude_seen(items: List[Dict], seen_urls: set) -> List[Dict]:
+    """이미 추천된 URL(대표 또는 유사 기사 URL 중 하나라도)을 가진 아이템 제외 — seen_urls 는 정규 URL"""
+    return [
+        item for item in items
+        if url_key(item) not in seen_urls
+        and not any(canonical_url(u) in seen_urls for u in item.get("duplicate_urls", []))
+    ]
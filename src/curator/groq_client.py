@@ -0,0 +1,193 @@
+"""Groq Client — rate limit 인지형 호출 래퍼
+
+- Groq 응답 헤더(x-ratelimit-remaining-requests/tokens, x-ratelimit-reset-*)를 추적해
+  남은 한도가 바닥나면 리셋 시각까지 미리 기다린다
+- 429 / 5xx / 연결 오류는 jitter 를 섞은 지수 backoff 로 재시도 (429 는 retry-after 우선)
+- 모든 에이전트와 주간 리포트가 같은 세마포어를 써서 동시 호출 수를 제한한다
+  (스트리밍 호출은 스트림을 다 읽거나 닫을 때까지 슬롯을 잡고 있다)
+
+GROQ_MAX_IN_FLIGHT (기본 3), GROQ_MAX_RETRIES (기본 4)
+"""
+
+import os
+import re
+import threading
+import time
+import groq
+import httpx
+from typing import Optional
+
+from src.ratelimit import backoff_delay, parse_retry_after
+
+
+_DURATION = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+
+def parse_reset(value: Optional[str]) -> float:
+    """Groq 리셋 시간 문자열('2m59.56s', '7.66s', '120ms') → 초"""
+    if not value:
+        return 0.0
+    return sum(float(n) * _UNITS[unit] for n, unit in _DURATION.findall(value))
+
+
+class GroqGovernor:
+    """프로세스 공용 Groq 호출 관리자 (동시성 제한 + 한도 추적 + 재시도)"""
+
+    def __init__(self, max_in_flight: int = None, max_retries: int = None):
+        self.max_in_flight = max_in_flight or int(os.environ.get("GROQ_MAX_IN_FLIGHT", 3))
+        self.max_retries = max_retries if max_retries is not None else int(os.environ.get("GROQ_MAX_RETRIES", 4))
+        self._slots = threading.BoundedSemaphore(self.max_in_flight)
+        self._lock = threading.Lock()
+        self.remaining_requests: Optional[int] = None
+        self.remaining_tokens: Optional[int] = None
+        self._requests_reset_at = 0.0
+        self._tokens_reset_at = 0.0
+        self.retries = 0
+
+    def _update_limits(self, headers) -> None:
+        if headers is None:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if headers.get("x-ratelimit-remaining-requests") is not None:
+                self.remaining_requests = int(float(headers["x-ratelimit-remaining-requests"]))
+                self._requests_reset_at = now + parse_reset(headers.get("x-ratelimit-reset-requests"))
+            if headers.get("x-ratelimit-remaining-tokens") is not None:
+                self.remaining_tokens = int(float(headers["x-ratelimit-remaining-tokens"]))
+                self._tokens_reset_at = now + parse_reset(headers.get("x-ratelimit-reset-tokens"))
+
+    def _wait_for_budget(self, estimated_tokens: int) -> None:
+        """남은 요청/토큰 한도가 부족하면 리셋 시각까지 대기"""
+        with self._lock:
+            now = time.monotonic()
+            wait = 0.0
+            if self.remaining_requests is not None and self.remaining_requests <= 0:
+                wait = max(wait, self._requests_reset_at - now)
+            if self.remaining_tokens is not None and self.remaining_tokens < estimated_tokens:
+                wait = max(wait, self._tokens_reset_at - now)
+            # 기다리는 동안 다른 스레드가 같은 한도를 중복 소진하지 않도록 미리 차감
+            if self.remaining_requests is not None:
+                self.remaining_requests -= 1
+            if self.remaining_tokens is not None:
+                self.remaining_tokens -= estimated_tokens
+        if wait > 0:
+            print(f"  [Groq] Rate limit budget low — waiting {wait:.1f}s")
+            time.sleep(wait)
+
+    def create(self, client, estimated_tokens: int = 0, **kwargs):
+        """chat.completions.create — 한도 대기, 동시성 제한, 재시도 포함
+
+        stream=True 면 HeldStream 을 돌려준다. 첫 청크까지 받은 뒤 넘기므로 연결 직후의 오류는
+        스트림이 아닌 호출과 똑같이 재시도한다. 청크를 넘긴 뒤의 오류는 출력이 중복되지 않도록
+        재시도하지 않고 읽는 쪽으로 올린다.
+        """
+        stream = kwargs.get("stream", False)
+        for attempt in range(self.max_retries + 1):
+            self._wait_for_budget(estimated_tokens)
+
+            delay = None
+            held = False
+            self._slots.acquire()
+            try:
+                raw = client.chat.completions.with_raw_response.create(**kwargs)
+                self._update_limits(raw.headers)
+                response = raw.parse()
+                if not stream:
+                    return response
+                chunks = iter(response)
+                first = next(chunks, None)
+                held = True
+                return HeldStream(response, first, chunks, self._slots.release)
+            except groq.RateLimitError as e:
+                self._update_limits(e.response.headers)
+                delay = parse_retry_after(e.response.headers.get("retry-after")) or backoff_delay(attempt)
+                error = e
+            except groq.APIStatusError as e:
+                if e.status_code < 500:
+                    raise
+                delay = backoff_delay(attempt)
+                error = e
+            except groq.APIConnectionError as e:
+                delay = backoff_delay(attempt)
+                error = e
+            except (groq.APIError, httpx.TransportError) as e:
+                # 스트림 첫 청크 전에 온 오류 이벤트 / 끊긴 연결
+                if not stream:
+                    raise
+                delay = backoff_delay(attempt)
+                error = e
+            finally:
+                if not held:
+                    self._slots.release()
+
+            if attempt == self.max_retries:
+                raise error
+            with self._lock:
+                self.retries += 1
+            print(f"  [Groq] {type(error).__name__} — retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+            time.sleep(delay)
+
+
+class HeldStream:
+    """governor 슬롯을 잡고 있는 스트림 — 끝까지 읽거나, 오류가 나거나, close() 하면 슬롯을 돌려준다
+
+    with 문으로 쓰면 중간에 빠져나와도 바로 반납된다.
+    """
+
+    def __init__(self, stream, first, chunks, release):
+        self._stream = stream
+        self._first = first
+        self._chunks = chunks
+        self._release = release
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._release is None:
+            raise StopIteration
+        try:
+            if self._first is not None:
+                chunk, self._first = self._first, None
+                return chunk
+            return next(self._chunks)
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self):
+        release, self._release = self._release, None
+        if release is not None:
+            try:
+                self._stream.close()
+            finally:
+                release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __del__(self):
+        self.close()
+
+
+_governor = GroqGovernor()
+
+
+def get_governor() -> GroqGovernor:
+    return _governor
+
+
+def chat_completion(client, prompt: str, **kwargs):
+    """Groq chat completion (프로세스 공용 governor 경유)"""
+    # 대략적인 토큰 추정 (영문 ~4자/토큰, 한글 ~1자/토큰 사이) + 출력 상한
+    estimated = len(prompt) // 3 + kwargs.get("max_tokens", 0)
+    return _governor.create(
+        client,
+        estimated_tokens=estimated,
+        messages=[{"role": "user", "content": prompt}],
+        **kwargs,
+    )
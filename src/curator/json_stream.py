@@ -0,0 +1,70 @@
+"""Incremental JSON — 스트리밍 LLM 출력에서 배열 원소를 닫히는 즉시 꺼내기
+
+`{"selected_news": [ {...}, {...} ]}` 처럼 특정 키 아래 객체 배열을 내는 응답에서,
+청크를 받을 때마다 완성된 객체만 dict 로 돌려준다. 문자열 안의 괄호/이스케이프를
+추적하므로 한국어 요약 속 중괄호도 안전하다.
+"""
+
+import json
+import re
+from typing import Dict, List
+
+
+class ArrayItemStream:
+    """키 하나의 객체 배열을 증분 파싱"""
+
+    def __init__(self, key: str):
+        self._key_pattern = re.compile(r'"%s"\s*:\s*\[' % re.escape(key))
+        self._buffer = ""
+        self._pos = None          # 다음에 검사할 위치 (배열 시작 전이면 None)
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._item_start = None
+        self.done = False
+
+    def feed(self, chunk: str) -> List[Dict]:
+        """청크 추가 → 이번에 완성된 객체 목록"""
+        if self.done:
+            return []
+        self._buffer += chunk
+
+        if self._pos is None:
+            match = self._key_pattern.search(self._buffer)
+            if not match:
+                return []
+            self._pos = match.end()
+
+        items = []
+        buf = self._buffer
+        i = self._pos
+        while i < len(buf):
+            ch = buf[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                if self._depth == 0 and ch == "{":
+                    self._item_start = i
+                self._depth += 1
+            elif ch in "}]":
+                if self._depth == 0 and ch == "]":
+                    self.done = True
+                    break
+                self._depth -= 1
+                if self._depth == 0 and ch == "}" and self._item_start is not None:
+                    try:
+                        items.append(json.loads(buf[self._item_start:i + 1]))
+                    except ValueError:
+                        pass
+                    self._item_start = None
+            i += 1
+
+        self._pos = i
+        return items
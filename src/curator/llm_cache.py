@@ -0,0 +1,106 @@
+"""LLM 응답 캐시 — _call_groq 결과를 디스크에 저장해 재실행 시 재사용
+
+키는 (model, prompt, temperature, max_tokens) 해시. 항목마다 파일 하나로 저장하고,
+TTL 이 지난 항목은 무시하며, 개수 상한을 넘으면 가장 오래 안 쓴 항목부터 지운다(LRU).
+
+- ALCHEMY_LLM_CACHE=0 또는 set_enabled(False) 로 우회
+- ALCHEMY_LLM_CACHE_TTL_HOURS (기본 24), ALCHEMY_LLM_CACHE_MAX (기본 500)
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Optional
+
+from src.state import state_path, load_json, save_json
+
+
+CACHE_DIR = "llm_cache"
+
+
+class LLMCache:
+    """디스크 기반 TTL + LRU 캐시 (스레드 안전)"""
+
+    def __init__(self, ttl_hours: float = None, max_entries: int = None):
+        self.ttl = 3600 * (ttl_hours if ttl_hours is not None else float(os.environ.get("ALCHEMY_LLM_CACHE_TTL_HOURS", 24)))
+        self.max_entries = max_entries or int(os.environ.get("ALCHEMY_LLM_CACHE_MAX", 500))
+        self.enabled = os.environ.get("ALCHEMY_LLM_CACHE", "1") not in ("0", "false", "off")
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(model: str, prompt: str, temperature: float, max_tokens: int) -> str:
+        payload = json.dumps([model, prompt, temperature, max_tokens], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return state_path(CACHE_DIR, f"{key}.json")
+
+    def get(self, key: str) -> Optional[str]:
+        """캐시된 응답 — 없거나 만료됐으면 None"""
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        entry = load_json(path)
+        if entry and time.time() - entry.get("created_at", 0) < self.ttl:
+            try:
+                os.utime(path)  # LRU: 마지막 사용 시각 갱신
+            except OSError:
+                pass
+            with self._lock:
+                self.hits += 1
+            return entry.get("response")
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, response: str, model: str = "") -> None:
+        if not self.enabled:
+            return
+        try:
+            save_json(self._path(key), {"created_at": time.time(), "model": model, "response": response})
+            self._evict()
+        except OSError as e:
+            print(f"LLM cache write error: {e}")
+
+    def _evict(self) -> None:
+        """상한 초과분을 mtime(마지막 사용) 오래된 순으로 삭제"""
+        directory = os.path.dirname(self._path("x"))
+        with self._lock:
+            files = [os.path.join(directory, f) for f in os.listdir(directory) if f.endswith(".json")]
+            if len(files) <= self.max_entries:
+                return
+            files.sort(key=lambda f: os.path.getmtime(f))
+            for f in files[: len(files) - self.max_entries]:
+                try:
+                    os.remove(f)
+                except OSError:
+                    pass
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 2) if total else 0.0,
+        }
+
+
+_cache = LLMCache()
+
+
+def get_cache() -> LLMCache:
+    """프로세스 공용 캐시"""
+    return _cache
+
+
+def set_enabled(enabled: bool) -> None:
+    """캐시 사용 여부 전환 (예: main.py --no-cache)"""
+    _cache.enabled = enabled
+
+
+def cache_stats() -> dict:
+    return _cache.stats()
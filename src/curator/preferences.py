@@ -1,20 +1,32 @@
 """사용자 취향 관리 모듈 — 👎 피드백 기반 + 중복 방지"""
 
-from supabase import create_client
+from collections import Counter
 from datetime import datetime, timedelta
 from typing import List, Optional
 
+from src.checkpoint import briefing_date as kst_date
+from src.collector.urls import canonical_url, url_hashes, url_key
+from src.curator.seen_index import SeenIndex
+from src.db import get_client
+
+
+EXCLUSION_WINDOW_DAYS = 90      # 👎 패턴은 최근 90일 피드백만 본다
+EXCLUSION_MAX_FEEDBACK = 500    # 창 안에서도 최근 500개까지만
+IN_QUERY_CHUNK = 100            # in_ 필터 한 번에 넣는 URL 해시 수 (요청 URL 길이 제한)
+UPSERT_KEY = "url_key,briefing_date,briefing_type"
+STARRED_FIELDS = ("title", "url", "axis_name", "new_concept_name")   # ⭐ 목록에 쓰는 컬럼만
+
 
 def get_supabase_client(url: str, key: str):
-    """Supabase 클라이언트 생성"""
-    return create_client(url, key)
+    """Supabase 클라이언트 — 프로세스 안에서 공유 (src.db)"""
+    return get_client(url, key)
 
 
-def save_article(client, article: dict, briefing_type: str = "daily"):
-    """추천된 아티클을 DB에 저장"""
-    data = {
+def _article_row(article: dict, briefing_type: str, briefing_date: str) -> dict:
+    return {
         "title": article.get("title", ""),
         "url": article.get("url", ""),
+        "url_key": url_key(article),
         "source": article.get("source", ""),
         "axis_id": article.get("axis_id"),
         "axis_name": article.get("axis_name", ""),
@@ -24,32 +36,66 @@ def save_article(client, article: dict, briefing_type: str = "daily"):
         "why_read": article.get("why_read", ""),
         "read_time": article.get("read_time", ""),
         "briefing_type": briefing_type,
-        "status": "sent",
+        "briefing_date": briefing_date,
     }
-    result = client.table("articles").insert(data).execute()
-    return result.data[0] if result.data else None
 
 
-def save_news(client, news: dict):
-    """뉴스 아이템을 DB에 저장"""
-    data = {
+def _news_row(news: dict, briefing_type: str, briefing_date: str) -> dict:
+    return {
         "title": news.get("title", ""),
         "url": news.get("url", ""),
+        "url_key": url_key(news),
         "source": news.get("source", ""),
         "hashtag": news.get("hashtag", ""),
         "summary_line_1": news.get("summary_line_1", ""),
         "summary_line_2": news.get("summary_line_2", ""),
         "summary_line_3": news.get("summary_line_3", ""),
-        "status": "sent",
+        "briefing_type": briefing_type,
+        "briefing_date": briefing_date,
     }
-    result = client.table("news").insert(data).execute()
-    return result.data[0] if result.data else None
+
+
+def _upsert_rows(client, table: str, rows: List[dict]) -> List[dict]:
+    """브리핑 키 (url_key, briefing_date, briefing_type) 로 한 번에 upsert — 저장된 행(id 포함) 반환
+
+    status 는 보내지 않으므로 새 행은 기본값 'sent', 이미 있는 행은 피드백으로 바뀐 상태를 유지한다.
+    같은 키가 한 요청에 두 번 들어가면 Postgres 가 거부하므로 마지막 것만 남긴다.
+    """
+    unique = {(r["url_key"], r["briefing_date"], r["briefing_type"]): r for r in rows if r["url_key"]}
+    if not unique:
+        return []
+    result = client.table(table).upsert(list(unique.values()), on_conflict=UPSERT_KEY).execute()
+    return result.data or []
+
+
+def save_articles(client, articles: List[dict], briefing_type: str = "daily", briefing_date: str = None) -> List[dict]:
+    """추천된 아티클들을 DB에 저장 (재실행해도 중복 행 없음)"""
+    briefing_date = briefing_date or kst_date()
+    return _upsert_rows(client, "articles", [_article_row(a, briefing_type, briefing_date) for a in articles])
+
+
+def save_news_items(client, news_items: List[dict], briefing_type: str = "daily", briefing_date: str = None) -> List[dict]:
+    """뉴스 아이템들을 DB에 저장 (재실행해도 중복 행 없음)"""
+    briefing_date = briefing_date or kst_date()
+    return _upsert_rows(client, "news", [_news_row(n, briefing_type, briefing_date) for n in news_items])
+
+
+def save_article(client, article: dict, briefing_type: str = "daily"):
+    """추천된 아티클을 DB에 저장"""
+    rows = save_articles(client, [article], briefing_type)
+    return rows[0] if rows else None
+
+
+def save_news(client, news: dict):
+    """뉴스 아이템을 DB에 저장"""
+    rows = save_news_items(client, [news])
+    return rows[0] if rows else None
 
 
 def save_feedback(client, article_url: str, reaction: str, memo: str = ""):
     """이모지 피드백 저장"""
     data = {
-        "article_url": article_url,
+        "article_url": canonical_url(article_url),
         "reaction": reaction,
         "memo": memo,
     }
@@ -57,52 +103,92 @@ def save_feedback(client, article_url: str, reaction: str, memo: str = ""):
     status_map = {"star": "starred", "bookmark": "archived", "thumbsdown": "skipped"}
     new_status = status_map.get(reaction, "sent")
 
-    client.table("articles").update({"status": new_status}).eq("url", article_url).execute()
+    client.table("articles").update({"status": new_status}).in_("url_hash", url_hashes(article_url)).execute()
     client.table("feedback").insert(data).execute()
 
 
-def get_recent_urls(client, days: int = 7) -> set:
-    """최근 N일 내 추천된 아티클/뉴스 URL 목록 (중복 방지용)"""
-    cutoff = (datetime.utcnow() - timedelta(days=days)).isoformat()
-
-    recent_urls = set()
+def backfill_url_keys(client, tables=("articles", "news"), page_size: int = 1000) -> int:
+    """url_key 를 canonical_url(url) 로 채움 — migrations/004_url_key.sql 다음에 한 번 실행
+
+    004 는 이전 행의 url_key 를 url(원문 링크) 그대로 채우므로, 정규 URL 과 다른 행만 id 로 고친다.
+    같은 날짜·타입에 정규 URL 이 같은 행이 이미 있으면(유니크 키 충돌) 그 행은 건너뛴다 —
+    url_hashes 가 원본 해시도 조회하므로 건너뛴 행도 계속 찾힌다. 고친 행 수를 돌려준다.
+    """
+    updated = 0
+    for table in tables:
+        last_id = 0
+        while True:
+            page = (
+                client.table(table).select("id, url, url_key")
+                .gt("id", last_id).order("id").limit(page_size).execute()
+            ).data or []
+            for row in page:
+                key = canonical_url(row.get("url", ""))
+                if not key or key == row.get("url_key"):
+                    continue
+                try:
+                    client.table(table).update({"url_key": key}).eq("id", row["id"]).execute()
+                    updated += 1
+                except Exception as e:
+                    print(f"  {table} #{row['id']}: url_key 그대로 둠 ({e})")
+            if len(page) < page_size:
+                break
+            last_id = page[-1]["id"]
+        print(f"  {table}: url_key backfill done")
+    return updated
 
-    articles = client.table("articles").select("url").gte("created_at", cutoff).execute()
-    for a in (articles.data or []):
-        if a.get("url"):
-            recent_urls.add(a["url"])
 
-    news = client.table("news").select("url").gte("created_at", cutoff).execute()
-    for n in (news.data or []):
-        if n.get("url"):
-            recent_urls.add(n["url"])
+def get_recent_urls(client, days: int = 7) -> set:
+    """최근 N일 내 추천된 아티클/뉴스 정규 URL 목록 (중복 방지용)
 
-    return recent_urls
+    로컬 seen-URL 색인을 지난 실행 이후 추가된 행만큼 동기화한 뒤 색인에서 읽는다.
+    """
+    index = SeenIndex()
+    if days > index.retention_days:
+        index.retention_days = days
+    index.sync(client)
+    return index.recent(days)
 
 
-def get_excluded_topics(client) -> List[str]:
-    """👎 피드백에서 제외할 토픽 패턴 추출"""
-    result = client.table("feedback").select("*").eq("reaction", "thumbsdown").execute()
+def get_excluded_topics(client, days: int = EXCLUSION_WINDOW_DAYS) -> List[str]:
+    """👎 피드백에서 제외할 토픽 패턴 추출
 
-    if not result.data:
+    최근 days 일의 👎 (최대 EXCLUSION_MAX_FEEDBACK 개)만 보고, 해당 아티클은 URL 해시 묶음
+    in_ 조회(url_hash 인덱스)로 한 번에 가져온다 — 피드백 이력이 쌓여도 쿼리 수는 일정하다.
+    """
+    cutoff = (datetime.utcnow() - timedelta(days=days)).isoformat()
+    result = (
+        client.table("feedback").select("article_url")
+        .eq("reaction", "thumbsdown").gte("created_at", cutoff)
+        .order("created_at", desc=True).limit(EXCLUSION_MAX_FEEDBACK)
+        .execute()
+    )
+    # 예전 피드백은 원문 링크를 그대로 저장했으므로 원본과 정규 URL 해시를 모두 조회한다
+    feedback_urls = [fb["article_url"] for fb in (result.data or []) if fb.get("article_url")]
+    if not feedback_urls:
         return []
 
     # 👎 받은 아티클의 axis, source 패턴 분석
-    skipped_axes = {}
-    skipped_sources = {}
-
-    for fb in result.data:
-        url = fb.get("article_url", "")
-        # 해당 아티클 정보 조회
-        article = client.table("articles").select("*").eq("url", url).execute()
-        if article.data:
-            a = article.data[0]
-            axis = a.get("axis_name", "")
-            source = a.get("source", "")
-            if axis:
-                skipped_axes[axis] = skipped_axes.get(axis, 0) + 1
-            if source:
-                skipped_sources[source] = skipped_sources.get(source, 0) + 1
+    hashes = list(dict.fromkeys(h for url in feedback_urls for h in url_hashes(url)))
+    articles = {}
+    for i in range(0, len(hashes), IN_QUERY_CHUNK):
+        rows = (
+            client.table("articles").select("url, axis_name, source")
+            .in_("url_hash", hashes[i:i + IN_QUERY_CHUNK]).execute()
+        )
+        for a in (rows.data or []):
+            articles.setdefault(canonical_url(a.get("url", "")), a)
+
+    skipped_axes = Counter()
+    skipped_sources = Counter()
+    for url in feedback_urls:
+        a = articles.get(canonical_url(url))
+        if not a:
+            continue
+        if a.get("axis_name"):
+            skipped_axes[a["axis_name"]] += 1
+        if a.get("source"):
+            skipped_sources[a["source"]] += 1
 
     # 3회 이상 👎 받은 토픽/소스 제외
     excluded = []
@@ -116,35 +202,37 @@ def get_excluded_topics(client) -> List[str]:
     return excluded
 
 
-def get_weekly_stats(client) -> dict:
-    """주간 통계"""
-    from datetime import datetime, timedelta
-    week_ago = (datetime.utcnow() - timedelta(days=7)).isoformat()
-
-    # 이번 주 추천된 아티클
-    articles = client.table("articles").select("*").gte("created_at", week_ago).execute()
-
-    # 이번 주 피드백
-    feedback = client.table("feedback").select("*").gte("created_at", week_ago).execute()
-
-    total = len(articles.data) if articles.data else 0
-    starred = len([a for a in (articles.data or []) if a.get("status") == "starred"])
-    archived = len([a for a in (articles.data or []) if a.get("status") == "archived"])
-    skipped = len([a for a in (articles.data or []) if a.get("status") == "skipped"])
-
-    # Axis별 통계
-    axis_counts = {}
-    for a in (articles.data or []):
-        axis = a.get("axis_name", "Unknown")
-        axis_counts[axis] = axis_counts.get(axis, 0) + 1
-
-    starred_articles = [a for a in (articles.data or []) if a.get("status") == "starred"]
-
+def _stats_from_rows(rows: List[dict]) -> dict:
+    """아티클 행(status, axis_name, ...) → 주간 통계 (RPC 가 없을 때)"""
+    status_counts = Counter(a.get("status") for a in rows)
+    axis_counts = Counter(a.get("axis_name") or "Unknown" for a in rows)
     return {
-        "total": total,
-        "starred": starred,
-        "archived": archived,
-        "skipped": skipped,
-        "axis_counts": axis_counts,
-        "starred_articles": starred_articles,
+        "total": len(rows),
+        "starred": status_counts["starred"],
+        "archived": status_counts["archived"],
+        "skipped": status_counts["skipped"],
+        "axis_counts": dict(axis_counts),
+        "starred_articles": [
+            {field: a.get(field) for field in STARRED_FIELDS} for a in rows if a.get("status") == "starred"
+        ],
     }
+
+
+def get_weekly_stats(client, days: int = 7) -> dict:
+    """주간 통계 — 집계는 DB 의 weekly_stats RPC 가 한다 (migrations/002_weekly_stats.sql)
+
+    RPC 가 아직 없으면 필요한 컬럼만 받아 여기서 센다.
+    """
+    since = (datetime.utcnow() - timedelta(days=days)).isoformat()
+    try:
+        stats = client.rpc("weekly_stats", {"since": since}).execute().data
+        if isinstance(stats, dict):
+            return stats
+    except Exception as e:
+        print(f"  weekly_stats RPC unavailable ({e}) — counting locally")
+
+    articles = (
+        client.table("articles").select(", ".join(("status",) + STARRED_FIELDS))
+        .gte("created_at", since).order("created_at").execute()
+    )
+    return _stats_from_rows(articles.data or [])
@@ -0,0 +1,122 @@
+"""Prompt Builder — 로컬 토큰 계산으로 에이전트별 예산 안에 프롬프트 조립
+
+- 고정 문자 자르기([:300], [:500] ...) 대신 토큰 수로 후보 목록을 예산(config/models.yml
+  의 prompt_budget)에 맞춘다. 후보가 적으면 후보당 미리보기를 더 길게 준다.
+- 페르소나/Axes 정적 prefix 를 항상 맨 앞에 같은 문자열로 두어 provider prompt caching 이
+  같은 prefix 를 재사용할 수 있게 한다.
+
+토크나이저는 tiktoken(cl100k_base)이 있으면 쓰고, 설치/다운로드가 안 되면 정규식 기반
+추정(영문 단어 ~4자/토큰, 한글 음절 1토큰, 기호 1토큰)으로 대신한다.
+"""
+
+import re
+import threading
+from typing import Callable, Dict, List
+
+_PIECE = re.compile(r"[A-Za-z]+|\d{1,3}|[가-힣]|\s+|[^\sA-Za-z\d가-힣]")
+
+_encoding = None
+_encoding_loaded = False
+_encoding_lock = threading.Lock()
+
+
+def _get_encoding():
+    global _encoding, _encoding_loaded
+    with _encoding_lock:
+        if not _encoding_loaded:
+            _encoding_loaded = True
+            try:
+                import tiktoken
+                _encoding = tiktoken.get_encoding("cl100k_base")
+            except Exception:
+                _encoding = None
+    return _encoding
+
+
+def _piece_tokens(piece: str) -> int:
+    if piece.isspace():
+        return 0 if len(piece) == 1 else 1
+    if piece.isascii() and piece.isalpha():
+        return max(1, (len(piece) + 3) // 4)
+    return 1
+
+
+def count_tokens(text: str) -> int:
+    """텍스트 토큰 수"""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return sum(_piece_tokens(p) for p in _PIECE.findall(text))
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """max_tokens 토큰 이내로 자르기"""
+    if not text or max_tokens <= 0:
+        return ""
+    encoding = _get_encoding()
+    if encoding is not None:
+        tokens = encoding.encode(text, disallowed_special=())
+        return text if len(tokens) <= max_tokens else encoding.decode(tokens[:max_tokens])
+
+    used = 0
+    for match in _PIECE.finditer(text):
+        piece = match.group()
+        tokens = _piece_tokens(piece)
+        if used + tokens > max_tokens:
+            # 한 덩어리가 남은 몫보다 긴 영문 단어(공백 없는 긴 문자열)면 글자 수로 자른다
+            keep = (max_tokens - used) * 4 if piece.isascii() and piece.isalpha() else 0
+            return (text[:match.start()] + piece[:keep]).rstrip()
+        used += tokens
+    return text
+
+
+def fit_items(
+    items: List[Dict], render: Callable[[int, Dict, int], str], budget: int,
+    max_item_tokens: int, sep: str = "\n\n",
+) -> List[str]:
+    """후보를 순서대로 예산 안에 넣기
+
+    render(i, item, preview_tokens) 는 미리보기를 preview_tokens 토큰으로 잘라 한 항목을 만든다.
+    남은 예산을 남은 후보 수로 나눈 몫(최대 max_item_tokens)을 항목당 몫으로 쓴다.
+    몫이 모자라면 미리보기 없이 제목/URL 만 넣고, 그마저 남은 예산을 넘으면 멈춘다.
+    """
+    blocks = []
+    remaining = budget
+    sep_tokens = count_tokens(sep)
+    for i, item in enumerate(items):
+        share = min(max_item_tokens, remaining // (len(items) - i)) - sep_tokens
+        header = count_tokens(render(i, item, 0))
+        block = render(i, item, max(0, share - header))
+        cost = count_tokens(block) + sep_tokens
+        if cost > remaining:
+            break
+        remaining -= cost
+        blocks.append(block)
+    return blocks
+
+
+class PromptBuilder:
+    """정적 prefix + 에이전트 지시문 + 예산에 맞춘 후보 목록"""
+
+    def __init__(self, prefix: str, budget: int):
+        self.prefix = prefix
+        self.prefix_tokens = count_tokens(prefix)
+        self.budget = budget
+
+    def build(
+        self, agent: str, head: str, tail: str = "", items: List[Dict] = None,
+        render: Callable[[int, Dict, int], str] = None, max_item_tokens: int = 400, sep: str = "\n\n",
+    ) -> tuple:
+        """(프롬프트, 포함된 후보 수) — head 와 tail 사이에 후보 목록이 들어간다"""
+        fixed = self.prefix + head + tail
+        fixed_tokens = count_tokens(fixed)
+        blocks = []
+        if items:
+            blocks = fit_items(items, render, self.budget - fixed_tokens, max_item_tokens, sep)
+        prompt = self.prefix + head + sep.join(blocks) + tail
+        total = count_tokens(prompt)
+        note = f", {len(blocks)}/{len(items)} items" if items else ""
+        print(f"  [{agent}] prompt ≈{total}/{self.budget} tokens (shared prefix {self.prefix_tokens}{note})")
+        return prompt, len(blocks)
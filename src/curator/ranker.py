@@ -0,0 +1,128 @@
+"""Pre-Ranker — Selector 에이전트 앞단의 로컬 후보 선별
+
+수집한 아티클 전체를 axes.yml 키워드에 대해 BM25 로 점수화(NumPy 행렬 연산)하고,
+Tier 가중치와 👎 제외 토픽 페널티를 반영한 뒤, Axis 다양성을 고려해
+상위 K 개만 LLM 에 보낸다. 수백 개를 모아도 밀리초 단위로 끝난다.
+"""
+
+import re
+import numpy as np
+from typing import List, Dict
+
+
+SHORTLIST_SIZE = 15
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+TIER_BONUS = {1: 0.3, 2: 0.15, 3: 0.0}
+EXCLUDED_AXIS_PENALTY = 0.3     # 제외 Axis 로 분류된 아티클 점수 배율
+EXCLUDED_SOURCE_PENALTY = 0.1   # 제외 Source 아티클 점수 배율
+DIVERSITY_DECAY = 0.7           # 같은 Axis 를 이미 뽑았을 때마다 곱하는 배율
+
+_WORD = re.compile(r"[a-z0-9]+")
+_STOPWORDS = {"the", "a", "an", "and", "or", "of", "in", "on", "to", "for", "with", "is", "are", "as", "by"}
+
+
+def _tokens(text: str) -> List[str]:
+    """소문자 단어 (불용어 제외) + 간단한 복수형 정규화"""
+    return [w[:-1] if len(w) > 3 and w.endswith("s") and not w.endswith("ss") else w
+            for w in _WORD.findall(text.lower()) if w not in _STOPWORDS]
+
+
+def _bm25(docs: List[List[str]], vocab: Dict[str, int]) -> np.ndarray:
+    """문서 × 용어 BM25 가중치 행렬"""
+    tf = np.zeros((len(docs), len(vocab)), dtype=np.float32)
+    for i, doc in enumerate(docs):
+        for token in doc:
+            j = vocab.get(token)
+            if j is not None:
+                tf[i, j] += 1
+
+    lengths = np.array([max(len(d), 1) for d in docs], dtype=np.float32)
+    df = (tf > 0).sum(axis=0)
+    idf = np.log(1 + (len(docs) - df + 0.5) / (df + 0.5))
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths / lengths.mean())
+    return idf * tf * (BM25_K1 + 1) / (tf + norm[:, None])
+
+
+def _matches(name: str, target: str) -> bool:
+    name, target = name.lower().strip(), target.lower().strip()
+    return bool(name) and bool(target) and (name in target or target in name)
+
+
+def score_candidates(
+    articles: List[Dict], axes: List[Dict], excluded_topics: List[str] = None
+) -> tuple:
+    """아티클별 (점수 배열, 최적 Axis 인덱스 배열)"""
+    axis_terms = [
+        set(_tokens(" ".join(axis.get("keywords", []) + [axis.get("name", "")])))
+        for axis in axes
+    ]
+    vocab = {t: j for j, t in enumerate(sorted(set().union(*axis_terms)))}
+
+    docs = [_tokens(f"{a.get('title', '')} {a.get('title', '')} {a.get('content_preview', '')}") for a in articles]
+    weights = _bm25(docs, vocab)
+
+    # 문서 × Axis 점수 = 해당 Axis 용어들의 BM25 합
+    membership = np.zeros((len(vocab), len(axes)), dtype=np.float32)
+    for k, terms in enumerate(axis_terms):
+        for t in terms:
+            membership[vocab[t], k] = 1
+    axis_scores = weights @ membership
+
+    best_axis = axis_scores.argmax(axis=1)
+    relevance = axis_scores.max(axis=1)
+    if relevance.max() > 0:
+        relevance = relevance / relevance.max()
+
+    tiers = np.array([TIER_BONUS.get(a.get("tier", 3), 0.0) for a in articles], dtype=np.float32)
+    scores = relevance + tiers
+
+    # 👎 제외 토픽 페널티
+    for topic in excluded_topics or []:
+        kind, _, name = topic.partition(":")
+        name = name.strip()
+        if kind.strip() == "Axis":
+            hit = [k for k, axis in enumerate(axes) if _matches(name, axis.get("name", ""))]
+            if hit:
+                scores[np.isin(best_axis, hit)] *= EXCLUDED_AXIS_PENALTY
+        elif kind.strip() == "Source":
+            mask = np.array([_matches(name, a.get("source", "")) for a in articles])
+            scores[mask] *= EXCLUDED_SOURCE_PENALTY
+
+    return scores, best_axis
+
+
+def shortlist_candidates(
+    articles: List[Dict], axes: List[Dict], k: int = SHORTLIST_SIZE, excluded_topics: List[str] = None
+) -> List[Dict]:
+    """점수 상위 K 개를 Axis 다양성을 고려해 선별 (선별 순서대로 반환)"""
+    if not articles or not axes:
+        return list(articles[:k])
+
+    scores, best_axis = score_candidates(articles, axes, excluded_topics)
+    k = min(k, len(articles))
+
+    # 그리디 선택: 이미 뽑힌 Axis 는 DIVERSITY_DECAY 만큼 불리하게
+    picked = []
+    axis_counts = np.zeros(len(axes))
+    available = np.ones(len(articles), dtype=bool)
+    for _ in range(k):
+        adjusted = np.where(available, scores * DIVERSITY_DECAY ** axis_counts[best_axis], -np.inf)
+        i = int(adjusted.argmax())
+        picked.append(i)
+        available[i] = False
+        axis_counts[best_axis[i]] += 1
+
+    return _annotate(articles, scores, best_axis, axes, picked)
+
+
+def _annotate(articles, scores, best_axis, axes, order) -> List[Dict]:
+    result = []
+    for i in order:
+        article = dict(articles[i])
+        article["prefilter_score"] = round(float(scores[i]), 3)
+        article["prefilter_axis"] = axes[int(best_axis[i])].get("name", "")
+        result.append(article)
+    return result
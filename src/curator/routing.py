@@ -0,0 +1,141 @@
+"""Model Routing — 에이전트별 Groq 모델 선택 + 호출 텔레메트리
+
+config/models.yml 에서 에이전트(selector, analyst, connector, news, weekly)마다
+모델, fallback 모델, temperature, max_tokens, prompt_budget(입력 토큰 예산)을 읽는다.
+호출마다 지연 시간, prompt/completion 토큰(provider 캐시 적중분 포함), 성공 여부를
+(에이전트, 모델) 단위로 누적한다.
+"""
+
+import os
+import threading
+import yaml
+from typing import Dict, List
+
+
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "config", "models.yml")
+
+DEFAULT_ROUTE = {
+    "model": "llama-3.3-70b-versatile",
+    "temperature": 0.3,
+    "max_tokens": 4000,
+    "prompt_budget": 6000,
+    "fallbacks": [],
+}
+
+
+class Route:
+    """에이전트 하나의 모델 라우팅"""
+
+    def __init__(self, agent: str, model: str, temperature: float, max_tokens: int,
+                 prompt_budget: int, fallbacks: List[str]):
+        self.agent = agent
+        self.model = model
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        self.prompt_budget = prompt_budget
+        self.fallbacks = fallbacks
+
+    @property
+    def models(self) -> List[str]:
+        """시도 순서 (중복 제거)"""
+        return list(dict.fromkeys([self.model] + self.fallbacks))
+
+
+def load_routes(config_path: str = None) -> Dict[str, Route]:
+    """models.yml → {에이전트: Route} (파일이 없으면 빈 dict — 모두 기본값)"""
+    try:
+        with open(config_path or CONFIG_PATH, "r") as f:
+            config = yaml.safe_load(f) or {}
+    except FileNotFoundError:
+        return {}
+
+    defaults = {**DEFAULT_ROUTE, **(config.get("defaults") or {})}
+    specs = {**(config.get("agents") or {}), "default": {}}
+    routes = {}
+    for agent, spec in specs.items():
+        merged = {**defaults, **(spec or {})}
+        routes[agent] = Route(
+            agent,
+            merged["model"],
+            float(merged["temperature"]),
+            int(merged["max_tokens"]),
+            int(merged["prompt_budget"]),
+            list(merged.get("fallbacks") or []),
+        )
+    return routes
+
+
+_routes = None
+_routes_lock = threading.Lock()
+
+
+def get_route(agent: str) -> Route:
+    """에이전트 라우팅 (설정에 없으면 default)"""
+    global _routes
+    with _routes_lock:
+        if _routes is None:
+            _routes = load_routes()
+    return _routes.get(agent) or _routes.get("default") or Route(agent, **DEFAULT_ROUTE)
+
+
+class Telemetry:
+    """(에이전트, 모델)별 호출 수, 실패율, 지연 시간, 토큰 누적 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[tuple, Dict] = {}
+
+    def record(self, agent: str, model: str, latency: float, prompt_tokens: int = 0,
+               completion_tokens: int = 0, cached_tokens: int = 0, ok: bool = True) -> None:
+        with self._lock:
+            s = self._stats.setdefault((agent, model), {
+                "calls": 0, "failures": 0, "latency": 0.0,
+                "prompt_tokens": 0, "completion_tokens": 0, "cached_tokens": 0,
+            })
+            s["calls"] += 1
+            s["latency"] += latency
+            s["prompt_tokens"] += prompt_tokens or 0
+            s["completion_tokens"] += completion_tokens or 0
+            s["cached_tokens"] += cached_tokens or 0
+            if not ok:
+                s["failures"] += 1
+
+    def summary(self) -> List[Dict]:
+        with self._lock:
+            rows = []
+            for (agent, model), s in sorted(self._stats.items()):
+                rows.append({
+                    "agent": agent,
+                    "model": model,
+                    "calls": s["calls"],
+                    "failure_rate": round(s["failures"] / s["calls"], 2),
+                    "avg_latency": round(s["latency"] / s["calls"], 2),
+                    "prompt_tokens": s["prompt_tokens"],
+                    "completion_tokens": s["completion_tokens"],
+                    "cached_tokens": s["cached_tokens"],
+                })
+            return rows
+
+
+_telemetry = Telemetry()
+
+
+def get_telemetry() -> Telemetry:
+    return _telemetry
+
+
+def print_telemetry() -> None:
+    """실행 끝에 에이전트별 LLM 호출 통계 출력"""
+    rows = _telemetry.summary()
+    if not rows:
+        return
+    print("  LLM calls:")
+    for r in rows:
+        print(
+            f"    {r['agent']:<10} {r['model']:<42} calls={r['calls']} fail={r['failure_rate']:.0%} "
+            f"avg={r['avg_latency']:.2f}s tokens={r['prompt_tokens']}+{r['completion_tokens']}"
+        )
+    prompt = sum(r["prompt_tokens"] for r in rows)
+    cached = sum(r["cached_tokens"] for r in rows)
+    completion = sum(r["completion_tokens"] for r in rows)
+    print(f"    prompt tokens this run: {prompt} (provider cache hit {cached}), completion: {completion}")
@@ -0,0 +1,112 @@
+"""Seen-URL Index — 이미 추천한 URL 의 로컬 SQLite 색인 (Supabase 에서 증분 동기화)
+
+매 실행마다 최근 7일치 articles/news URL 전체를 받아오는 대신, 테이블별 created_at
+커서 이후에 생긴 행만 받아 .alchemy/seen_urls.sqlite 에 쌓는다. 실행당 네트워크 비용은
+지난 실행 이후 추가된 행 수에 비례한다.
+
+- 처음(또는 커서가 보존 기간보다 오래됐을 때)은 보존 기간 전체를 받는다
+- 보존 기간(SEEN_RETENTION_DAYS, 기본 14일)이 지난 URL 은 동기화할 때 지운다
+- URL 은 canonical_url 로 정규화해 저장하고, url 이 PRIMARY KEY 라 조회는 색인 한 번
+
+ALCHEMY_SEEN_RETENTION_DAYS 로 보존 기간을 바꿀 수 있다.
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import datetime, timedelta
+from typing import Iterable
+
+from src.collector.urls import canonical_url
+from src.state import state_path
+
+
+INDEX_FILE = "seen_urls.sqlite"
+SYNC_TABLES = ("articles", "news")
+SYNC_PAGE = 1000            # PostgREST 기본 max-rows 와 같은 페이지 크기
+SEEN_RETENTION_DAYS = 14
+
+_lock = threading.Lock()
+
+
+def _iso(dt: datetime) -> str:
+    return dt.strftime("%Y-%m-%dT%H:%M:%S")
+
+
+class SeenIndex:
+    """URL → 마지막으로 추천된 시각"""
+
+    def __init__(self, path: str = None, retention_days: int = None):
+        self.path = path or state_path(INDEX_FILE)
+        self.retention_days = retention_days or int(
+            os.environ.get("ALCHEMY_SEEN_RETENTION_DAYS", SEEN_RETENTION_DAYS)
+        )
+        with closing(self._connect()) as db, db:
+            db.execute("CREATE TABLE IF NOT EXISTS seen (url TEXT PRIMARY KEY, seen_at TEXT NOT NULL)")
+            db.execute("CREATE INDEX IF NOT EXISTS seen_at_idx ON seen (seen_at)")
+            db.execute("CREATE TABLE IF NOT EXISTS cursors (name TEXT PRIMARY KEY, created_at TEXT NOT NULL)")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def _upsert(self, rows: Iterable[tuple]) -> None:
+        """(url, 시각) 기록 — 이미 있으면 더 최근 시각 유지"""
+        rows = [(canonical_url(url), seen_at[:19]) for url, seen_at in rows if url]
+        with _lock, closing(self._connect()) as db, db:
+            db.executemany(
+                "INSERT INTO seen (url, seen_at) VALUES (?, ?) "
+                "ON CONFLICT(url) DO UPDATE SET seen_at = MAX(seen_at, excluded.seen_at)",
+                rows,
+            )
+
+    def add(self, urls: Iterable[str], seen_at: str = None) -> None:
+        """URL 기록 (기본 시각은 지금)"""
+        seen_at = seen_at or _iso(datetime.utcnow())
+        self._upsert((url, seen_at) for url in urls)
+
+    def __contains__(self, url: str) -> bool:
+        with closing(self._connect()) as db:
+            return db.execute("SELECT 1 FROM seen WHERE url = ?", (canonical_url(url),)).fetchone() is not None
+
+    def recent(self, days: int) -> set:
+        """최근 days 일 안에 추천된 정규 URL"""
+        cutoff = _iso(datetime.utcnow() - timedelta(days=days))
+        with closing(self._connect()) as db:
+            return {url for (url,) in db.execute("SELECT url FROM seen WHERE seen_at >= ?", (cutoff,))}
+
+    def sync(self, client, tables: Iterable[str] = SYNC_TABLES) -> int:
+        """테이블별 created_at 커서 이후 행만 받아 반영, 보존 기간 지난 URL 정리 — 받은 행 수"""
+        floor = _iso(datetime.utcnow() - timedelta(days=self.retention_days))
+        with closing(self._connect()) as db:
+            cursors = dict(db.execute("SELECT name, created_at FROM cursors"))
+
+        fetched = 0
+        for table in tables:
+            cursor = max(cursors.get(table, ""), floor)
+            latest = cursor
+            offset = 0
+            while True:
+                # 같은 시각의 행이 페이지 경계에 걸쳐도 빠지지 않도록 gte + offset 페이지네이션
+                page = (
+                    client.table(table).select("url, created_at").gte("created_at", cursor)
+                    .order("created_at").range(offset, offset + SYNC_PAGE - 1).execute()
+                ).data or []
+                self._upsert((row.get("url"), row.get("created_at") or cursor) for row in page)
+                latest = max([latest] + [row.get("created_at") or "" for row in page])
+                fetched += len(page)
+                if len(page) < SYNC_PAGE:
+                    break
+                offset += SYNC_PAGE
+
+            with _lock, closing(self._connect()) as db, db:
+                db.execute(
+                    "INSERT INTO cursors (name, created_at) VALUES (?, ?) "
+                    "ON CONFLICT(name) DO UPDATE SET created_at = excluded.created_at",
+                    (table, latest),
+                )
+
+        with _lock, closing(self._connect()) as db, db:
+            expired = db.execute("DELETE FROM seen WHERE seen_at < ?", (floor,)).rowcount
+        print(f"  Seen-URL index: +{fetched} rows synced, {expired} expired")
+        return fetched
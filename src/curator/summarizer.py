@@ -1,15 +1,29 @@
 """Groq 기반 3-에이전트 큐레이션 시스템
 
-Agent 1: Selector — 25개 중 최적 아티클 선별
-Agent 2: Analyst — 선별된 아티클의 3-Point Card 작성
+Agent 1: Selector — 로컬 BM25 사전 선별(Pre-ranker)로 추린 후보 중 최적 아티클 선별
+Agent 2: Analyst — 선별된 아티클의 3-Point Card 작성 (아티클별 병렬 호출)
 Agent 3: Connector — 아티클 간 연결고리 발견
 """
 
 import json
+import re
+import time
 import yaml
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from groq import Groq
-from typing import List, Dict
+from typing import Callable, List, Dict, Optional
+
+from src.curator.groq_client import chat_completion
+from src.curator.json_stream import ArrayItemStream
+from src.curator.llm_cache import get_cache
+from src.curator.prompts import PromptBuilder, truncate_tokens
+from src.curator.ranker import shortlist_candidates, SHORTLIST_SIZE
+from src.curator.routing import get_route, get_telemetry
+
+
+ANALYST_CONCURRENCY = 3   # 병렬 Analyst 호출 동시 실행 수
 
 
 ALBERT_CONTEXT = """
@@ -82,43 +96,165 @@ def load_axes(config_path: str = None) -> List[Dict]:
 
 
 def init_model(api_key: str):
-    """Groq 클라이언트 초기화"""
-    return Groq(api_key=api_key)
-
-
-def _call_groq(client, prompt: str) -> str:
-    """Groq API 호출 공통 함수"""
-    response = client.chat.completions.create(
-        model="llama-3.3-70b-versatile",
-        messages=[{"role": "user", "content": prompt}],
-        temperature=0.3,
-        max_tokens=4000,
-        response_format={"type": "json_object"},
+    """Groq 클라이언트 초기화 (재시도는 groq_client.GroqGovernor 가 담당)"""
+    return Groq(api_key=api_key, max_retries=0)
+
+
+@lru_cache(maxsize=1)
+def static_prefix() -> str:
+    """모든 프롬프트 맨 앞의 정적 prefix (페르소나 + 5 Axes)
+
+    provider prompt caching 이 적중하도록 호출마다 바이트 단위로 같은 문자열이어야 한다.
+    에이전트 역할이나 후보 목록처럼 바뀌는 내용은 반드시 이 뒤에 둔다.
+    """
+    axes_text = "\n".join([f"- Axis {a['id']}: {a['name']} — {a['description']}" for a in load_axes()])
+    return f"{ALBERT_CONTEXT.strip()}\n\n## THE 5 AXES\n{axes_text}\n\n"
+
+
+def prompt_builder(agent: str) -> PromptBuilder:
+    """에이전트 예산(config/models.yml prompt_budget)을 쓰는 프롬프트 빌더"""
+    return PromptBuilder(static_prefix(), get_route(agent).prompt_budget)
+
+
+def _usage(usage) -> tuple:
+    """(prompt, completion, provider 캐시에서 읽은 prompt) 토큰 수"""
+    if usage is None:
+        return 0, 0, 0
+    details = getattr(usage, "prompt_tokens_details", None)
+    return (
+        getattr(usage, "prompt_tokens", 0) or 0,
+        getattr(usage, "completion_tokens", 0) or 0,
+        getattr(details, "cached_tokens", 0) or 0,
     )
-    return response.choices[0].message.content.strip()
+
+
+def _cache_response(key: str, text: str, model: str) -> None:
+    try:
+        json.loads(text)  # 깨진 응답은 캐시하지 않는다
+        get_cache().put(key, text, model=model)
+    except ValueError:
+        pass
+
+
+def _call_groq(client, prompt: str, agent: str = "default", use_cache: bool = True) -> str:
+    """Groq API 호출 공통 함수 (디스크 캐시 경유 — use_cache=False 로 우회)
+
+    모델은 config/models.yml 의 agent 라우팅을 따르고, 실패하면 fallback 모델로 넘어간다.
+    """
+    route = get_route(agent)
+    cache = get_cache()
+    error = None
+    for model in route.models:
+        key = cache.make_key(model, prompt, route.temperature, route.max_tokens)
+        if use_cache:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+
+        started = time.monotonic()
+        try:
+            response = chat_completion(
+                client, prompt,
+                model=model,
+                temperature=route.temperature,
+                max_tokens=route.max_tokens,
+                response_format={"type": "json_object"},
+            )
+        except Exception as e:
+            get_telemetry().record(agent, model, time.monotonic() - started, ok=False)
+            print(f"  [{agent}] {model} failed: {e}")
+            error = e
+            continue
+
+        get_telemetry().record(agent, model, time.monotonic() - started, *_usage(response.usage))
+        text = response.choices[0].message.content.strip()
+        if use_cache:
+            _cache_response(key, text, model)
+        return text
+    raise error
+
+
+def _call_groq_stream(
+    client, prompt: str, array_key: str, on_item: Callable[[Dict], None],
+    agent: str = "default", use_cache: bool = True,
+) -> str:
+    """Groq 스트리밍 호출 — array_key 배열의 객체가 닫힐 때마다 on_item 호출, 전체 텍스트 반환
+
+    Groq JSON mode 는 스트리밍을 지원하지 않으므로 response_format 없이 받고,
+    코드 펜스(```json)가 붙어 오면 벗겨낸다. 캐시 키는 _call_groq 와 같다.
+    이미 아이템을 내보낸 뒤의 실패는 중복 전송을 막기 위해 fallback 없이 그대로 올린다.
+    """
+    route = get_route(agent)
+    cache = get_cache()
+    error = None
+    for model in route.models:
+        key = cache.make_key(model, prompt, route.temperature, route.max_tokens)
+        parser = ArrayItemStream(array_key)
+
+        cached = cache.get(key) if use_cache else None
+        if cached is not None:
+            for item in parser.feed(cached):
+                on_item(item)
+            return cached
+
+        started = time.monotonic()
+        emitted = 0
+        usage = None
+        try:
+            parts = []
+            # 스트림을 다 읽을 때까지 governor 슬롯을 잡고 있으므로 with 로 확실히 반납
+            with chat_completion(
+                client, prompt,
+                model=model,
+                temperature=route.temperature,
+                max_tokens=route.max_tokens,
+                stream=True,
+            ) as stream:
+                for chunk in stream:
+                    x_groq = getattr(chunk, "x_groq", None)
+                    if x_groq is not None and getattr(x_groq, "usage", None) is not None:
+                        usage = x_groq.usage
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if not delta:
+                        continue
+                    parts.append(delta)
+                    for item in parser.feed(delta):
+                        emitted += 1
+                        on_item(item)
+            text = re.sub(r"^```(?:json)?\s*|\s*```$", "", "".join(parts).strip())
+            json.loads(text)
+        except Exception as e:
+            get_telemetry().record(agent, model, time.monotonic() - started, *_usage(usage), ok=False)
+            print(f"  [{agent}] {model} stream failed: {e}")
+            if emitted:
+                raise
+            error = e
+            continue
+
+        get_telemetry().record(agent, model, time.monotonic() - started, *_usage(usage))
+        if use_cache:
+            _cache_response(key, text, model)
+        return text
+    raise error
 
 
 # ──────────────────────────────────────────────
 # 뉴스: 기존 단일 에이전트 (뉴스는 가벼우므로 1회로 충분)
 # ──────────────────────────────────────────────
 
-def select_and_summarize_news(client, news_articles: List[Dict], count: int = 5) -> List[Dict]:
-    """뉴스 중 가장 관련성 높은 것을 선별하고 3줄 요약"""
-
-    axes_info = load_axes()
-    axes_text = "\n".join([f"- Axis {a['id']}: {a['name']} — {a['description']}" for a in axes_info])
-
-    news_list = "\n\n".join([
-        f"[{i+1}] {n['title']}\nSource: {n['source']}\nURL: {n['url']}\nDescription: {n['description'][:300]}"
-        for i, n in enumerate(news_articles[:30])
-    ])
+def select_and_summarize_news(
+    client, news_articles: List[Dict], count: int = 5, on_item: Callable[[Dict], None] = None
+) -> List[Dict]:
+    """뉴스 중 가장 관련성 높은 것을 선별하고 3줄 요약
 
-    prompt = f"""You are Alchemi, Albert's personal news curator. You deeply understand Albert and curate news specifically for him.
+    on_item 을 주면 스트리밍으로 받아 뉴스 아이템이 완성될 때마다 호출한다.
+    """
 
-{ALBERT_CONTEXT}
+    def render(i: int, n: Dict, preview_tokens: int) -> str:
+        description = truncate_tokens(n.get("description") or "", preview_tokens)
+        return f"[{i+1}] {n['title']}\nSource: {n['source']}\nURL: {n['url']}\nDescription: {description}"
 
-The 5 Axes of interest:
-{axes_text}
+    head = f"""You are Alchemi, Albert's personal news curator. You deeply understand Albert (see above) and curate news specifically for him.
 
 TASK: Select the {count} most relevant news for Albert. Be highly selective — only news that intersects with Albert's specific interests above.
 
@@ -136,7 +272,8 @@ IMPORTANT:
 - 뻔하거나 generic한 요약은 하지 말 것. 밀도 높고 구체적으로.
 
 NEWS ARTICLES:
-{news_list}
+"""
+    tail = f"""
 
 Respond in JSON format:
 {{
@@ -155,8 +292,15 @@ Respond in JSON format:
 
 Select exactly {count} articles. All summaries MUST be in Korean. Be specific, not generic."""
 
+    prompt, _ = prompt_builder("news").build(
+        "news", head, tail, news_articles[:30], render, max_item_tokens=150,
+    )
+
     try:
-        text = _call_groq(client, prompt)
+        if on_item:
+            text = _call_groq_stream(client, prompt, "selected_news", on_item, agent="news")
+        else:
+            text = _call_groq(client, prompt, agent="news")
         result = json.loads(text)
         return result.get("selected_news", [])
     except Exception as e:
@@ -172,23 +316,20 @@ def _agent_selector(client, articles: List[Dict], count: int, excluded_topics: L
     """Agent 1: Selector — 아티클 선별 전문"""
 
     axes_info = load_axes()
-    axes_text = "\n".join([f"- Axis {a['id']}: {a['name']} — {a['description']}" for a in axes_info])
 
     exclusion_note = ""
     if excluded_topics:
         exclusion_note = f"\n\nEXCLUDED TOPICS (user marked as not interested): {', '.join(excluded_topics)}"
 
-    articles_list = "\n\n".join([
-        f"[{i+1}] {a['title']}\nSource: {a['source']} (Tier {a.get('tier', 3)})\nURL: {a['url']}\nPreview: {a.get('content_preview', '')[:500]}"
-        for i, a in enumerate(articles[:25])
-    ])
-
-    prompt = f"""You are the SELECTOR agent — your ONLY job is to pick the best articles for Albert. Do NOT summarize, do NOT analyze. Just select.
+    # 로컬 BM25 사전 선별 — 전체 후보 중 상위 SHORTLIST_SIZE 개만 LLM 에 전달
+    shortlist = shortlist_candidates(articles, axes_info, SHORTLIST_SIZE, excluded_topics)
+    print(f"  [Pre-ranker] {len(articles)} candidates → {len(shortlist)} shortlisted")
 
-{ALBERT_CONTEXT}
+    def render(i: int, a: Dict, preview_tokens: int) -> str:
+        preview = truncate_tokens(a.get("content_preview", ""), preview_tokens)
+        return f"[{i+1}] {a['title']}\nSource: {a['source']} (Tier {a.get('tier', 3)})\nURL: {a['url']}\nPreview: {preview}"
 
-The 5 Axes:
-{axes_text}
+    head = f"""You are the SELECTOR agent — your ONLY job is to pick the best articles for Albert. Do NOT summarize, do NOT analyze. Just select.
 
 Selection Criteria (in priority order):
 1. Paradigm-shifting: Does it introduce a NEW concept, framework, or challenge an existing mental model?
@@ -199,7 +340,8 @@ Selection Criteria (in priority order):
 {exclusion_note}
 
 ARTICLES:
-{articles_list}
+"""
+    tail = f"""
 
 Select exactly {count} articles. For each, explain in 1 sentence WHY you chose it (what makes it stand out).
 
@@ -214,33 +356,49 @@ Respond in JSON:
       "tier": 1,
       "axis_id": 1,
       "axis_name": "Cognition & AI",
-      "selection_reason": "Why this article stands out (1 sentence, English)",
-      "content_preview": "paste the preview here for the next agent"
+      "selection_reason": "Why this article stands out (1 sentence, English)"
     }}
   ]
 }}"""
 
-    text = _call_groq(client, prompt)
+    prompt, included = prompt_builder("selector").build(
+        "selector", head, tail, shortlist, render, max_item_tokens=250,
+    )
+    text = _call_groq(client, prompt, agent="selector")
     result = json.loads(text)
-    return result.get("selected", [])
+    selected = result.get("selected", [])
 
+    # 다음 에이전트에는 LLM 이 옮겨 적은 미리보기 대신 원본 본문 미리보기를 넘긴다
+    for item in selected:
+        index = item.get("index")
+        if isinstance(index, int) and 1 <= index <= included:
+            item["content_preview"] = shortlist[index - 1].get("content_preview", "")
+    return selected
 
-def _agent_analyst(client, selected_articles: List[Dict]) -> List[Dict]:
-    """Agent 2: Analyst — 3-Point Card 작성 전문"""
 
-    articles_detail = "\n\n---\n\n".join([
-        f"Article {i+1}: {a['title']}\nSource: {a['source']}\nURL: {a['url']}\nAxis: {a.get('axis_name', '')}\nSelection reason: {a.get('selection_reason', '')}\nPreview: {a.get('content_preview', '')[:800]}"
-        for i, a in enumerate(selected_articles)
-    ])
+def _agent_analyst(
+    client, selected_articles: List[Dict], use_cache: bool = True,
+    on_card: Callable[[int, Optional[Dict]], None] = None,
+) -> List[Dict]:
+    """Agent 2: Analyst — 3-Point Card 작성 전문
 
-    prompt = f"""You are the ANALYST agent — your job is to create deep, specific 3-Point Cards. The articles have already been selected for you. Focus ALL your energy on quality analysis.
+    on_card 를 주면 스트리밍으로 받아 카드가 완성될 때마다 (순번, 카드)로 호출한다.
+    """
 
-{ALBERT_CONTEXT}
+    def render(i: int, a: Dict, preview_tokens: int) -> str:
+        preview = truncate_tokens(a.get("content_preview", ""), preview_tokens)
+        return (
+            f"Article {i+1}: {a['title']}\nSource: {a['source']}\nURL: {a['url']}\nAxis: {a.get('axis_name', '')}\n"
+            f"Selection reason: {a.get('selection_reason', '')}\nPreview: {preview}"
+        )
+
+    head = f"""You are the ANALYST agent — your job is to create deep, specific 3-Point Cards. The articles have already been selected for you. Focus ALL your energy on quality analysis.
 
 {ARTICLE_EXAMPLE}
 
 SELECTED ARTICLES:
-{articles_detail}
+"""
+    tail = f"""
 
 For EACH article, create a 3-Point Card:
 
@@ -277,18 +435,61 @@ Respond in JSON:
 
 All Korean must be dense, specific, zero filler words."""
 
-    text = _call_groq(client, prompt)
+    prompt, _ = prompt_builder("analyst").build(
+        "analyst", head, tail, selected_articles, render, max_item_tokens=1500, sep="\n\n---\n\n",
+    )
+
+    if on_card:
+        counter = iter(range(len(selected_articles)))
+        text = _call_groq_stream(
+            client, prompt, "analyzed_articles",
+            lambda card: on_card(next(counter, len(selected_articles)), card),
+            agent="analyst", use_cache=use_cache,
+        )
+    else:
+        text = _call_groq(client, prompt, agent="analyst", use_cache=use_cache)
     result = json.loads(text)
     return result.get("analyzed_articles", [])
 
 
+def _agent_analyst_parallel(
+    client, selected_articles: List[Dict], max_workers: int = ANALYST_CONCURRENCY, retries: int = 1,
+    on_card: Callable[[int, Optional[Dict]], None] = None,
+) -> List[Dict]:
+    """Agent 2: Analyst — 아티클마다 별도 호출을 병렬로 실행
+
+    카드 하나가 실패(JSON 오류 등)하면 그 카드만 재시도하고, 그래도 실패하면 버린다.
+    결과는 Selector 선별 순서를 유지한다. on_card 는 카드가 끝나는 대로
+    (선별 순번, 카드 또는 실패 시 None)으로 호출된다.
+    """
+
+    def analyze(index: int, article: Dict) -> Optional[Dict]:
+        card = None
+        for attempt in range(retries + 1):
+            try:
+                # 재시도는 캐시를 건너뛰어 같은 응답을 다시 받지 않도록
+                cards = _agent_analyst(client, [article], use_cache=(attempt == 0))
+                if cards:
+                    card = cards[0]
+                    break
+            except Exception as e:
+                print(f"  [Agent 2] Card failed for '{article.get('title', '')[:40]}' (attempt {attempt + 1}): {e}")
+        if on_card:
+            on_card(index, card)
+        return card
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(selected_articles)))) as executor:
+        cards = list(executor.map(analyze, range(len(selected_articles)), selected_articles))
+
+    return [card for card in cards if card]
+
+
 def _agent_connector(client, analyzed_articles: List[Dict], starred_articles: List[Dict] = None) -> str:
     """Agent 3: Connector — 아티클 간 연결고리 발견"""
 
-    articles_summary = "\n".join([
-        f"- {a['title']} [{a.get('axis_name', '')}]: {a.get('new_concept_name', '')} — {a.get('new_concept_desc', '')}"
-        for a in analyzed_articles
-    ])
+    def render(i: int, a: Dict, preview_tokens: int) -> str:
+        desc = truncate_tokens(a.get("new_concept_desc", ""), preview_tokens)
+        return f"- {a['title']} [{a.get('axis_name', '')}]: {a.get('new_concept_name', '')} — {desc}"
 
     starred_context = ""
     if starred_articles:
@@ -298,12 +499,11 @@ def _agent_connector(client, analyzed_articles: List[Dict], starred_articles: Li
         ])
         starred_context = f"\n\nAlbert가 최근 ⭐ 인상적으로 표시한 아티클:\n{starred_summary}"
 
-    prompt = f"""You are the CONNECTOR agent — your job is to find the hidden thread that connects today's articles, and optionally connect them to Albert's recent interests.
-
-{ALBERT_CONTEXT}
+    head = """You are the CONNECTOR agent — your job is to find the hidden thread that connects today's articles, and optionally connect them to Albert's recent interests.
 
 Today's selected articles:
-{articles_summary}
+"""
+    tail = f"""
 {starred_context}
 
 TASK: Write ONE connecting question or insight in Korean that ties these articles together.
@@ -320,16 +520,25 @@ Respond in JSON:
   "connection": "오늘의 아티클을 관통하는 질문 또는 인사이트 (1-2문장, 한국어)"
 }}"""
 
-    text = _call_groq(client, prompt)
+    prompt, _ = prompt_builder("connector").build(
+        "connector", head, tail, analyzed_articles, render, max_item_tokens=200, sep="\n",
+    )
+    text = _call_groq(client, prompt, agent="connector")
     result = json.loads(text)
     return result.get("connection", "")
 
 
 def select_and_summarize_articles(
     client, articles: List[Dict], count: int = 3,
-    excluded_topics: List[str] = None, starred_articles: List[Dict] = None
+    excluded_topics: List[str] = None, starred_articles: List[Dict] = None,
+    analyst_mode: str = "parallel", on_card: Callable[[int, Optional[Dict]], None] = None,
 ) -> List[Dict]:
-    """3-에이전트 파이프라인으로 아티클 큐레이션"""
+    """3-에이전트 파이프라인으로 아티클 큐레이션
+
+    analyst_mode: "parallel" — 아티클별 Analyst 호출을 병렬로 (부분 실패 허용)
+                  "batch"    — 모든 아티클을 한 번의 Analyst 호출로
+    on_card: 3-Point Card 가 완성될 때마다 (선별 순번, 카드)로 호출 (Slack 스트리밍 전송용)
+    """
 
     print("  [Agent 1: Selector] Picking best articles...")
     selected = _agent_selector(client, articles, count, excluded_topics)
@@ -339,7 +548,10 @@ def select_and_summarize_articles(
         return []
 
     print("  [Agent 2: Analyst] Creating 3-Point Cards...")
-    analyzed = _agent_analyst(client, selected)
+    if analyst_mode == "batch":
+        analyzed = _agent_analyst(client, selected, on_card=on_card)
+    else:
+        analyzed = _agent_analyst_parallel(client, selected, on_card=on_card)
     print(f"  [Agent 2] Analyzed {len(analyzed)} articles")
 
     print("  [Agent 3: Connector] Finding connections...")
@@ -0,0 +1,87 @@
+"""Data Access — 프로세스당 Supabase 클라이언트 하나 + 동일 조회 합치기
+
+서버 모드에서는 Flask 요청 스레드(Slack 이벤트)와 스케줄러 스레드가 같은 클라이언트를 쓴다.
+클라이언트는 (url, key) 별로 한 번만 만들고, 그 안의 PostgREST httpx 풀(keep-alive, HTTP/2)을
+모든 스레드가 공유하므로 실행·이벤트마다 TLS 핸드셰이크를 다시 하지 않는다.
+
+- httpx.Client 는 스레드 안전하다. supabase-py 는 PostgREST 클라이언트를 처음 쓸 때 만들기 때문에
+  두 스레드가 동시에 처음 쓰면 풀이 둘 생길 수 있어, 생성할 때 락 안에서 미리 만들어 둔다
+- 같은 조회가 동시에 들어오면(같은 메시지에 리액션 두 개) 요청은 한 번만 보내고 결과를 나눠 받는다
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable, List
+
+from supabase import create_client
+
+from src.collector.urls import url_hashes
+
+
+_lock = threading.Lock()
+_clients: Dict[tuple, Any] = {}
+
+
+def get_client(url: str, key: str):
+    """(url, key) 별 공유 Supabase 클라이언트 — 처음 호출할 때만 생성"""
+    with _lock:
+        client = _clients.get((url, key))
+        if client is None:
+            client = create_client(url, key)
+            client.postgrest  # 풀을 지금 만들어 스레드 간 경쟁 없이 하나만 생기게
+            _clients[(url, key)] = client
+        return client
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """같은 키의 동시 호출을 하나로 합침 — 먼저 온 호출만 실행하고 나머지는 그 결과(또는 예외)를 받는다
+
+    결과를 캐시하지는 않는다: 진행 중인 호출이 끝나면 다음 호출은 다시 실행된다.
+    나눠 받은 결과는 같은 객체이므로 호출한 쪽에서 고치지 않는다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+
+_reads = SingleFlight()
+
+
+def find_by_url(client, table: str, url: str, columns: str = "*") -> List[dict]:
+    """url(정규화 변형 포함) 로 행 조회 — 같은 조회가 동시에 들어오면 요청은 한 번"""
+    hashes = url_hashes(url)
+    return _reads.do(
+        (id(client), table, columns, tuple(hashes)),
+        lambda: client.table(table).select(columns).in_("url_hash", hashes).execute().data or [],
+    )
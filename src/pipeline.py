@@ -0,0 +1,149 @@
+"""Stage Graph — 의존 관계가 없는 단계를 동시에 실행하는 작은 파이프라인 실행기
+
+각 Stage 는 이름, 함수, 의존 단계 이름 목록을 가진다. 함수는 의존 단계의 결과를
+같은 이름의 키워드 인자로 받는다. 의존 단계가 모두 끝난 Stage 부터 스레드 풀에서
+실행되므로 전체 소요 시간은 임계 경로(critical path)와 같아진다.
+
+persist=True 인 Stage 는 checkpoint 가 주어지면 결과를 저장하고, 이어서 실행할 때는
+저장된 결과를 그대로 쓴다. 복원된 단계에만 필요한 단계(예: 이미 선별이 끝났다면 수집)는
+다시 실행하지 않는다.
+"""
+
+import inspect
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Callable, Dict, List
+
+
+_listeners: List[Callable[[str, str], None]] = []
+
+
+def add_listener(fn: Callable[[str, str], None]) -> None:
+    """단계 시작/종료 때 fn(단계 이름, "start" | "end") 호출 — 벤치마크 계측용"""
+    _listeners.append(fn)
+
+
+def remove_listener(fn: Callable[[str, str], None]) -> None:
+    if fn in _listeners:
+        _listeners.remove(fn)
+
+
+class Stage:
+    """파이프라인 단계"""
+
+    def __init__(self, name: str, fn: Callable[..., Any], deps: List[str] = None, persist: bool = False):
+        self.name = name
+        self.fn = fn
+        self.deps = deps or []
+        self.persist = persist
+
+
+def _critical_path(stages: Dict[str, Stage], timings: Dict[str, tuple]) -> List[str]:
+    """가장 늦게 끝난 단계에서 시작해, 가장 늦게 끝난 의존 단계를 따라 거슬러 올라간 경로"""
+    if not timings:
+        return []
+    path = [max(timings, key=lambda n: timings[n][1])]
+    while True:
+        deps = [d for d in stages[path[-1]].deps if d in timings]  # 복원된 단계는 타이밍이 없다
+        if not deps:
+            break
+        path.append(max(deps, key=lambda n: timings[n][1]))
+    return list(reversed(path))
+
+
+def print_timings(stages: Dict[str, Stage], timings: Dict[str, tuple], total: float) -> None:
+    """단계별 시작/종료 시각과 소요 시간, 임계 경로 출력"""
+    print("  Stage timings:")
+    for name, (start, end) in sorted(timings.items(), key=lambda kv: kv[1][0]):
+        print(f"    {name:<20} {start:6.2f}s → {end:6.2f}s  ({end - start:.2f}s)")
+    print(f"    critical path: {' → '.join(_critical_path(stages, timings))}")
+    print(f"    total: {total:.2f}s")
+
+
+def _needed(by_name: Dict[str, Stage], restored: Dict[str, Any]) -> set:
+    """실행해야 할 단계 — 복원되지 않은 최종 단계와, 실행할 단계가 의존하는 미복원 단계"""
+    dependents = {name: [] for name in by_name}
+    for stage in by_name.values():
+        for dep in stage.deps:
+            dependents[dep].append(stage.name)
+
+    needed = {name for name in by_name if name not in restored and not dependents[name]}
+    pending = list(needed)
+    while pending:
+        for dep in by_name[pending.pop()].deps:
+            if dep not in restored and dep not in needed:
+                needed.add(dep)
+                pending.append(dep)
+    return needed
+
+
+def run_stages(stages: List[Stage], max_workers: int = None, checkpoint=None) -> Dict[str, Any]:
+    """Stage 그래프 실행 후 단계별 결과 반환
+
+    한 단계라도 실패하면 남은 단계는 시작하지 않고 그 예외를 그대로 올린다.
+    의존 이름과 함수 인자가 맞지 않는 단계가 있으면 실행 전에 TypeError.
+    checkpoint (src.checkpoint.Checkpoint) 를 주면 persist 단계 결과를 저장/복원한다.
+    max_workers 기본값은 ALCHEMY_STAGE_WORKERS (없으면 6) — 1 이면 단계를 하나씩 실행한다.
+    """
+    max_workers = max_workers or int(os.environ.get("ALCHEMY_STAGE_WORKERS", 6))
+    by_name = {stage.name: stage for stage in stages}
+    for stage in stages:
+        missing = [d for d in stage.deps if d not in by_name]
+        if missing:
+            raise ValueError(f"Stage '{stage.name}' depends on unknown stages: {missing}")
+        # 의존 결과는 키워드 인자로 넘어가므로, 인자 이름이 안 맞는 단계는 아무것도 실행하기 전에 거른다
+        try:
+            inspect.signature(stage.fn).bind(**{dep: None for dep in stage.deps})
+        except TypeError as e:
+            raise TypeError(f"Stage '{stage.name}' cannot take its deps {stage.deps} as keyword arguments: {e}")
+
+    results: Dict[str, Any] = {}
+    if checkpoint is not None:
+        for stage in stages:
+            if stage.persist and checkpoint.has(stage.name):
+                results[stage.name] = checkpoint.load(stage.name)
+        if results:
+            print(f"  Resumed from checkpoint: {', '.join(results)}")
+    needed = _needed(by_name, results)
+
+    timings: Dict[str, tuple] = {}
+    started = time.monotonic()
+
+    def run(stage: Stage):
+        start = time.monotonic() - started
+        for listener in _listeners:
+            listener(stage.name, "start")
+        try:
+            value = stage.fn(**{dep: results[dep] for dep in stage.deps})
+            if checkpoint is not None and stage.persist:
+                checkpoint.save(stage.name, value)
+            return value
+        finally:
+            timings[stage.name] = (start, time.monotonic() - started)
+            for listener in _listeners:
+                listener(stage.name, "end")
+
+    remaining = {name: stage for name, stage in by_name.items() if name in needed}
+    running = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            while remaining or running:
+                for name, stage in list(remaining.items()):
+                    if all(dep in results for dep in stage.deps):
+                        running[executor.submit(run, stage)] = name
+                        del remaining[name]
+
+                if not running:
+                    raise RuntimeError(f"Stage graph has a cycle: {sorted(remaining)}")
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    results[name] = future.result()
+        finally:
+            for future in running:
+                future.cancel()
+            print_timings(by_name, timings, time.monotonic() - started)
+
+    return results
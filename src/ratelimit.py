@@ -0,0 +1,48 @@
+"""Rate Limit — 토큰 버킷 리미터와 재시도 backoff 공통 유틸"""
+
+import random
+import threading
+import time
+
+
+class TokenBucket:
+    """스레드 안전 토큰 버킷
+
+    rate: 초당 보충 토큰 수, capacity: 순간 최대 허용량(버스트)
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1.0):
+        """토큰이 생길 때까지 대기 후 차감"""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 30.0) -> float:
+    """지수 backoff + full jitter (attempt 는 0부터)"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def parse_retry_after(value) -> float:
+    """Retry-After 헤더(초) 파싱 — 없거나 형식이 다르면 0"""
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return 0.0
@@ -5,7 +5,7 @@ import os
 from typing import List, Dict
 
 from src.curator.preferences import get_supabase_client, get_weekly_stats
-from src.curator.summarizer import ALBERT_CONTEXT, _call_groq
+from src.curator.summarizer import _call_groq, prompt_builder
 
 
 def generate_weekly_connection(client, starred_articles: List[Dict]) -> str:
@@ -13,17 +13,11 @@ def generate_weekly_connection(client, starred_articles: List[Dict]) -> str:
     if not starred_articles:
         return "이번 주는 어떤 생각이 알벗의 마음을 움직였나요?"
 
-    articles_text = "\n".join([
-        f"- {a.get('title', '')} (Axis: {a.get('axis_name', '')})"
-        for a in starred_articles
-    ])
-
-    prompt = f"""You are ALBOT, Albert's intellectual companion.
-
-{ALBERT_CONTEXT}
+    head = """You are ALBOT, Albert's intellectual companion.
 
 This week, Albert starred these articles as impressive:
-{articles_text}
+"""
+    tail = """
 
 Generate ONE powerful question in Korean that connects these articles into a single thread of inquiry.
 The question should:
@@ -32,10 +26,16 @@ The question should:
 - Be suitable as "이번 주를 관통하는 질문"
 
 Respond in JSON format:
-{{"question": "질문 내용"}}"""
+{"question": "질문 내용"}"""
+
+    prompt, _ = prompt_builder("weekly").build(
+        "weekly", head, tail, starred_articles,
+        lambda i, a, _: f"- {a.get('title', '')} (Axis: {a.get('axis_name', '')})",
+        max_item_tokens=80, sep="\n",
+    )
 
     try:
-        text = _call_groq(client, prompt)
+        text = _call_groq(client, prompt, agent="weekly")
         result = json.loads(text)
         return result.get("question", "이번 주 읽은 글들은 알벗에게 어떤 새로운 질문을 던졌는가?")
     except Exception as e:
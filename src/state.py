@@ -0,0 +1,40 @@
+"""로컬 상태 저장소 — 실행 간 유지되는 캐시/커서 파일 관리
+
+기본 위치는 프로젝트 루트의 .alchemy/ 이며 ALCHEMY_STATE_DIR 로 바꿀 수 있다.
+"""
+
+import json
+import os
+import tempfile
+
+
+def state_path(*parts: str) -> str:
+    """상태 파일 경로 (상위 디렉토리는 자동 생성)"""
+    base = os.environ.get("ALCHEMY_STATE_DIR") or os.path.join(
+        os.path.dirname(__file__), "..", ".alchemy"
+    )
+    path = os.path.join(base, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+
+def load_json(path: str, default=None):
+    """JSON 상태 파일 로드 — 없거나 깨졌으면 default"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def save_json(path: str, data) -> None:
+    """JSON 상태 파일 저장 (임시 파일 → rename 으로 원자적 교체)"""
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, default=str)
+        os.replace(tmp, path)
+    except Exception:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
@@ -1,11 +1,13 @@
 -- Alchemy Supabase Schema
 -- Supabase Dashboard → SQL Editor에서 실행
+-- 기존 DB 는 migrations/ 의 파일을 번호 순서대로 실행
 
 -- 아티클 테이블
 CREATE TABLE articles (
     id BIGSERIAL PRIMARY KEY,
     title TEXT NOT NULL,
-    url TEXT NOT NULL,
+    url TEXT NOT NULL,                   -- 원문 링크 (Slack 에 게시한 그대로)
+    url_key TEXT NOT NULL,               -- 비교/중복 키: canonical_url(url)
     source TEXT,
     axis_id INTEGER,
     axis_name TEXT,
@@ -14,8 +16,10 @@ CREATE TABLE articles (
     new_concept_desc TEXT,
     why_read TEXT,
     read_time TEXT,
-    briefing_type TEXT DEFAULT 'daily',  -- daily, weekend
+    briefing_type TEXT NOT NULL DEFAULT 'daily',  -- daily, weekend
+    briefing_date DATE NOT NULL DEFAULT (NOW() AT TIME ZONE 'Asia/Seoul')::date,
     status TEXT DEFAULT 'sent',          -- sent, starred, archived, skipped
+    url_hash TEXT GENERATED ALWAYS AS (md5(url_key)) STORED,
     created_at TIMESTAMPTZ DEFAULT NOW()
 );
 
@@ -24,12 +28,16 @@ CREATE TABLE news (
     id BIGSERIAL PRIMARY KEY,
     title TEXT NOT NULL,
     url TEXT NOT NULL,
+    url_key TEXT NOT NULL,
     source TEXT,
     hashtag TEXT,
     summary_line_1 TEXT,
     summary_line_2 TEXT,
     summary_line_3 TEXT,
+    briefing_type TEXT NOT NULL DEFAULT 'daily',
+    briefing_date DATE NOT NULL DEFAULT (NOW() AT TIME ZONE 'Asia/Seoul')::date,
     status TEXT DEFAULT 'sent',
+    url_hash TEXT GENERATED ALWAYS AS (md5(url_key)) STORED,
     created_at TIMESTAMPTZ DEFAULT NOW()
 );
 
@@ -42,9 +50,46 @@ CREATE TABLE feedback (
     created_at TIMESTAMPTZ DEFAULT NOW()
 );
 
--- 인덱스
-CREATE INDEX idx_articles_status ON articles(status);
-CREATE INDEX idx_articles_created_at ON articles(created_at);
-CREATE INDEX idx_articles_url ON articles(url);
-CREATE INDEX idx_feedback_reaction ON feedback(reaction);
-CREATE INDEX idx_feedback_created_at ON feedback(created_at);
+-- 인덱스 (쿼리별 설명은 migrations/003_lookup_indexes.sql, 004_url_key.sql)
+CREATE INDEX idx_articles_url_hash ON articles(url_hash);
+CREATE INDEX idx_articles_created_at_url ON articles(created_at) INCLUDE (url);
+CREATE INDEX idx_articles_status_created_at ON articles(status, created_at);
+CREATE INDEX idx_news_url_hash ON news(url_hash);
+CREATE INDEX idx_news_created_at_url ON news(created_at) INCLUDE (url);
+CREATE INDEX idx_feedback_article_url ON feedback(article_url);
+CREATE INDEX idx_feedback_reaction_created_at ON feedback(reaction, created_at) INCLUDE (article_url);
+CREATE UNIQUE INDEX uq_articles_url_key ON articles(url_key, briefing_date, briefing_type);
+CREATE UNIQUE INDEX uq_news_url_key ON news(url_key, briefing_date, briefing_type);
+
+-- 주간 통계 RPC (migrations/002_weekly_stats.sql 과 같은 정의)
+CREATE OR REPLACE FUNCTION weekly_stats(since TIMESTAMPTZ DEFAULT NOW() - INTERVAL '7 days')
+RETURNS JSON
+LANGUAGE sql
+STABLE
+AS $$
+    WITH week AS (
+        SELECT status, axis_name, title, url, new_concept_name, created_at
+        FROM articles
+        WHERE created_at >= since
+    )
+    SELECT json_build_object(
+        'total',    (SELECT COUNT(*) FROM week),
+        'starred',  (SELECT COUNT(*) FROM week WHERE status = 'starred'),
+        'archived', (SELECT COUNT(*) FROM week WHERE status = 'archived'),
+        'skipped',  (SELECT COUNT(*) FROM week WHERE status = 'skipped'),
+        'axis_counts', COALESCE(
+            (SELECT json_object_agg(axis, n)
+               FROM (SELECT COALESCE(axis_name, 'Unknown') AS axis, COUNT(*) AS n FROM week GROUP BY 1) counts),
+            '{}'::json
+        ),
+        'starred_articles', COALESCE(
+            (SELECT json_agg(json_build_object(
+                        'title', title, 'url', url, 'axis_name', axis_name, 'new_concept_name', new_concept_name
+                    ) ORDER BY created_at)
+               FROM week WHERE status = 'starred'),
+            '[]'::json
+        )
+    );
+$$;
+
+GRANT EXECUTE ON FUNCTION weekly_stats(TIMESTAMPTZ) TO anon, authenticated, service_role;